@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline do parsing de partidas do draft5.
+
+Reproduz as páginas salvas (page_source.html, page_debug.html) e listagens
+sintéticas com centenas de partidas pelas etapas de extração do scraper,
+sem rede e sem Chrome. Reporta tempo e pico de memória por etapa e falha
+(código de saída 1) quando um limite configurado é excedido.
+
+Execute com: python -m benchmarks.scraper_bench
+"""
+
+import argparse
+import json
+import logging
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from bot.services.draft5_parser import (  # noqa: E402
+    DRAFT5_TIMEZONE, content_fingerprint, extract_listing, extract_next_data, listing_content
+)
+from bot.services.matches_scraper import MatchesScraper  # noqa: E402
+
+RECORDED_PAGES = ('page_source.html', 'page_debug.html')
+DEFAULT_THRESHOLDS = Path(__file__).parent / 'thresholds.json'
+DEFAULT_SYNTHETIC_SIZES = (100, 500)
+MATCHES_PER_DAY = 3
+
+WEEKDAYS = ['segunda-feira', 'terça-feira', 'quarta-feira', 'quinta-feira',
+            'sexta-feira', 'sábado', 'domingo']
+MONTHS = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho', 'julho',
+          'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+
+DATE_RE = re.compile(r'<p class="MatchList__MatchListDate[^"]*">.*?</p>', re.S)
+CARD_RE = re.compile(r'<a href="/partida/[^"]*" class="MatchCardSimple__MatchContainer.*?</a>', re.S)
+NEXT_DATA_RE = re.compile(r'(<script id="__NEXT_DATA__"[^>]*>)(.*?)(</script>)', re.S)
+
+
+def _br_date_text(day):
+    return f"📅 {WEEKDAYS[day.weekday()]}, {day.day} de {MONTHS[day.month - 1]} de {day.year}"
+
+
+def synthetic_page(match_count, template_path=ROOT / 'page_source.html'):
+    """Gera uma listagem com ``match_count`` partidas a partir de uma página salva.
+
+    A marcação de cada data/partida e o ``__NEXT_DATA__`` são copiados da
+    página original, variando data, horário, adversário e id da partida.
+    """
+    page_html = template_path.read_text(encoding='utf-8')
+    date_html = DATE_RE.search(page_html).group(0)
+    card_html = CARD_RE.search(page_html).group(0)
+    script = NEXT_DATA_RE.search(page_html)
+    state = json.loads(script.group(2))
+    match_template = state['props']['pageProps']['matches'][0]
+
+    first_day = datetime(2025, 5, 10)
+    listing = []
+    matches = []
+    for i in range(match_count):
+        day = first_day + timedelta(days=i // MATCHES_PER_DAY)
+        hour = 10 + (i % MATCHES_PER_DAY) * 3
+        opponent = f"Team {i}"
+        match_id = 40000 + i
+
+        if i % MATCHES_PER_DAY == 0:
+            listing.append(re.sub(r'>[^<]*</p>$', f'>{_br_date_text(day)}</p>', date_html))
+        listing.append(
+            card_html
+            .replace('/partida/36905-The-MongolZ-', f'/partida/{match_id}-{opponent.replace(" ", "-")}-')
+            .replace('<span>05:00</span>', f'<span>{hour:02d}:00</span>')
+            .replace('The MongolZ', opponent)
+        )
+
+        start = day.replace(hour=hour, tzinfo=DRAFT5_TIMEZONE).astimezone(timezone.utc)
+        match = dict(match_template, matchId=match_id, matchDate=int(start.timestamp()))
+        match['teamA'] = dict(match_template['teamA'], teamName=opponent)
+        matches.append(match)
+
+    state['props']['pageProps']['matches'] = matches
+    first_date = DATE_RE.search(page_html)
+    last_card = list(CARD_RE.finditer(page_html))[-1]
+    page_html = page_html[:first_date.start()] + "".join(listing) + page_html[last_card.end():]
+    return NEXT_DATA_RE.sub(
+        lambda m: m.group(1) + json.dumps(state, ensure_ascii=False) + m.group(3), page_html, count=1
+    )
+
+
+def _stages(scraper, page_html):
+    """Etapas medidas, na ordem em que o scraper as executa"""
+    entries = extract_listing(page_html)
+    date_texts = [e['text'] for e in entries if e['kind'] == 'date']
+
+    def fetch_http():
+        with patch.object(scraper, '_http_get', return_value=(page_html, {})):
+            return scraper._fetch_via_http()
+
+    return {
+        'extract_listing': lambda: extract_listing(page_html),
+        'extract_next_data': lambda: extract_next_data(page_html),
+        'parse_br_date': lambda: [scraper._parse_br_date(text) for text in date_texts],
+        'build_matches': lambda: scraper._matches_from_entries(entries),
+        'fetch_http': fetch_http,
+        # Custo de descobrir que a página não mudou (e pular as etapas acima)
+        'fingerprint': lambda: content_fingerprint(listing_content(page_html), '2025-05-10'),
+    }
+
+
+def _measure(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Memória medida à parte: o tracemalloc deixa a execução mais lenta
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def load_pages(synthetic_sizes=DEFAULT_SYNTHETIC_SIZES):
+    pages = {name: (ROOT / name).read_text(encoding='utf-8') for name in RECORDED_PAGES}
+    for size in synthetic_sizes:
+        pages[f'synthetic_{size}'] = synthetic_page(size)
+    return pages
+
+
+def run_benchmark(pages, repeat=20):
+    """Executa todas as etapas em cada página; retorna ``{página: {etapa: medidas}}``"""
+    scraper = MatchesScraper(fetch_mode='http')
+    results = {}
+    for name, page_html in pages.items():
+        results[name] = {
+            stage: _measure(function, repeat)
+            for stage, function in _stages(scraper, page_html).items()
+        }
+    return results
+
+
+def check_thresholds(results, thresholds):
+    """Limites absolutos por página/etapa (``*`` vale para qualquer página)"""
+    violations = []
+    for page, stages in results.items():
+        limits = {**thresholds.get('*', {}), **thresholds.get(page, {})}
+        for stage, measures in stages.items():
+            for metric, limit in limits.get(stage, {}).items():
+                measured = measures['median_ms'] if metric == 'max_ms' else measures['peak_kib']
+                if measured > limit:
+                    violations.append(f"{page}/{stage}: {metric} {measured} > {limit}")
+    return violations
+
+
+def compare_baseline(results, baseline, max_regression):
+    """Compara a mediana de cada etapa com uma execução anterior salva"""
+    violations = []
+    for page, stages in results.items():
+        for stage, measures in stages.items():
+            previous = baseline.get(page, {}).get(stage)
+            if not previous or not previous['median_ms']:
+                continue
+            ratio = measures['median_ms'] / previous['median_ms']
+            if ratio > max_regression:
+                violations.append(
+                    f"{page}/{stage}: {measures['median_ms']}ms é {ratio:.2f}x o baseline "
+                    f"({previous['median_ms']}ms)"
+                )
+    return violations
+
+
+def print_report(results):
+    print(f"{'página':<20} {'etapa':<18} {'mín (ms)':>10} {'mediana (ms)':>13} {'pico (KiB)':>11}")
+    for page, stages in results.items():
+        for stage, m in stages.items():
+            print(f"{page:<20} {stage:<18} {m['min_ms']:>10.3f} {m['median_ms']:>13.3f} {m['peak_kib']:>11.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help="execuções por etapa")
+    parser.add_argument('--synthetic', type=int, nargs='*', default=list(DEFAULT_SYNTHETIC_SIZES),
+                        help="tamanhos das listagens sintéticas")
+    parser.add_argument('--thresholds', type=Path, default=DEFAULT_THRESHOLDS,
+                        help="arquivo JSON com limites absolutos")
+    parser.add_argument('--baseline', type=Path, help="resultado anterior para comparar")
+    parser.add_argument('--max-regression', type=float, default=1.5,
+                        help="razão máxima da mediana em relação ao baseline")
+    parser.add_argument('--save', type=Path, help="salva os resultados em JSON (ex.: novo baseline)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.disable(logging.WARNING)
+
+    results = run_benchmark(load_pages(args.synthetic), repeat=args.repeat)
+    print_report(results)
+
+    violations = []
+    if args.thresholds and args.thresholds.exists():
+        violations += check_thresholds(results, json.loads(args.thresholds.read_text()))
+    if args.baseline:
+        violations += compare_baseline(results, json.loads(args.baseline.read_text()), args.max_regression)
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+
+    if violations:
+        print("\nRegressões encontradas:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+    print("\nNenhum limite excedido")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização a frio do bot.
+
+Cada execução sobe um interpretador novo que importa o ``main``, monta e
+inicializa a aplicação, roda o ``post_init`` (eleição de líder, catálogo,
+processo de scraping) e processa um ``/start``, com a API do Telegram
+simulada e um banco SQLite vazio. Reporta o tempo de cada fase e o tempo
+até o primeiro update respondido, contado desde o início do processo.
+
+Execute com: python -m benchmarks.startup_bench
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+TOKEN = "123456:startup-bench"
+PHASES = ('import', 'build', 'initialize', 'post_init', 'first_update')
+
+FIRST_UPDATE = {
+    'update_id': 1,
+    'message': {
+        'message_id': 1,
+        'date': 0,
+        'chat': {'id': 1, 'type': 'private'},
+        'from': {'id': 1, 'is_bot': False, 'first_name': 'Fã'},
+        'text': '/start',
+        'entities': [{'type': 'bot_command', 'offset': 0, 'length': 6}],
+    },
+}
+
+# Respostas da API simulada; os demais métodos devolvem ``True``
+API_RESULTS = {
+    'getMe': {'id': 1, 'is_bot': True, 'first_name': 'FURIA Bot', 'username': 'furia_bot'},
+    'sendMessage': {'message_id': 2, 'date': 0, 'chat': {'id': 1, 'type': 'private'}},
+}
+
+
+def offline_request():
+    """Transporte do bot que responde localmente, sem rede"""
+    from telegram.request import BaseRequest
+
+    class OfflineRequest(BaseRequest):
+        def __init__(self):
+            self.calls = []
+
+        async def initialize(self):
+            pass
+
+        async def shutdown(self):
+            pass
+
+        async def do_request(self, url, method, request_data=None, *args, **kwargs):
+            endpoint = url.rsplit('/', 1)[-1]
+            self.calls.append(endpoint)
+            return 200, json.dumps({'ok': True, 'result': API_RESULTS.get(endpoint, True)}).encode()
+
+    return OfflineRequest()
+
+
+async def _startup(started):
+    """Fases da inicialização, em ms desde ``started``"""
+    phases = {}
+
+    def mark(phase):
+        phases[phase] = round((time.perf_counter() - started) * 1000, 2)
+
+    sys.path.insert(0, str(ROOT))
+    import main  # noqa: E402
+    mark('import')
+
+    from telegram import Update
+
+    request = offline_request()
+    app = main.build_application(TOKEN, request=request)
+    mark('build')
+
+    await app.initialize()
+    mark('initialize')
+    try:
+        await app.post_init(app)
+        mark('post_init')
+        await app.process_update(Update.de_json(FIRST_UPDATE, app.bot))
+        mark('first_update')
+    finally:
+        await app.post_shutdown(app)
+        await app.shutdown()
+
+    if 'sendMessage' not in request.calls:
+        raise RuntimeError(f"O primeiro update não foi respondido: {request.calls}")
+    return phases
+
+
+def _child():
+    started = time.perf_counter()
+    import logging
+    logging.disable(logging.WARNING)
+    phases = asyncio.run(_startup(started))
+    print(json.dumps(phases), flush=True)
+
+
+def run_once():
+    """Inicialização em um processo novo; retorna as fases e ``time_to_first_update``"""
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(
+            os.environ,
+            DATABASE_PATH=os.path.join(workdir, 'furia_bot.db'),
+            TRACING_EXPORTER='none',
+            PYTHONPATH=str(ROOT),
+        )
+        started = time.perf_counter()
+        # O diretório temporário recebe o bot.log criado na importação do main
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.startup_bench', '--child'],
+            cwd=workdir, env=env, stdout=subprocess.PIPE, text=True,
+        )
+        line = process.stdout.readline()
+        # Tempo até o primeiro update respondido, incluindo a subida do interpretador
+        total = (time.perf_counter() - started) * 1000
+        process.wait()
+
+    if process.returncode or not line:
+        raise RuntimeError(f"Inicialização falhou (código {process.returncode})")
+    phases = json.loads(line)
+    phases['time_to_first_update'] = round(total, 2)
+    return phases
+
+
+def run_benchmark(runs=5):
+    """Executa ``runs`` inicializações; retorna ``{fase: {'min_ms', 'median_ms'}}``"""
+    samples = [run_once() for _ in range(runs)]
+    return {
+        phase: {
+            'min_ms': min(s[phase] for s in samples),
+            'median_ms': round(statistics.median(s[phase] for s in samples), 2),
+        }
+        for phase in (*PHASES, 'time_to_first_update')
+    }
+
+
+def print_report(results):
+    print(f"{'fase':<22} {'mín (ms)':>10} {'mediana (ms)':>13}")
+    for phase, m in results.items():
+        print(f"{phase:<22} {m['min_ms']:>10.1f} {m['median_ms']:>13.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="inicializações medidas")
+    parser.add_argument('--max-ms', type=float,
+                        help="limite da mediana do tempo até o primeiro update")
+    parser.add_argument('--save', type=Path, help="salva os resultados em JSON")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child()
+        return 0
+
+    results = run_benchmark(args.runs)
+    print_report(results)
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+
+    median = results['time_to_first_update']['median_ms']
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"\nTempo até o primeiro update acima do limite: {median}ms > {args.max_ms}ms")
+        return 1
+    print(f"\nPrimeiro update respondido em {median:.0f}ms (mediana)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,92 +1,449 @@
+import os
 import sqlite3
-from datetime import datetime
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_DB_PATH = os.path.join(Path(__file__).parent.parent, 'data', 'furia_bot.db')
+
+MATCH_COLUMNS = ('id', 'team', 'opponent', 'event', 'date', 'time', 'format', 'link', 'start_ts', 'notified')
+
+
+def _match_time(match):
+    """Data e hora da partida no formato do SQLite, ou None se o horário for TBA"""
+    if ":" in match.get('time', "") and match.get('date'):
+        return f"{match['date']} {match['time']}:00"
+    return None
+
+
+class _ThreadConnection:
+    """Conexão de uma thread; fechada quando a thread termina e o local é descartado"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def close(self):
+        self.conn.close()
+
+    def __del__(self):
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
 class DatabaseManager:
-    def __init__(self, db_name='furia_bot.db'):
-        self.conn = sqlite3.connect(db_name)
+    """Acesso ao SQLite com uma conexão por thread e journal em modo WAL.
+
+    A conexão fica no ``threading.local`` da thread: ao fim da thread ela é
+    descartada e fechada, então threads de vida curta não acumulam conexões.
+    """
+
+    def __init__(self, db_name=None):
+        self.db_name = db_name or os.getenv("DATABASE_PATH", DEFAULT_DB_PATH)
+        if os.path.dirname(self.db_name):
+            os.makedirs(os.path.dirname(self.db_name), exist_ok=True)
+        self._local = threading.local()
+        self._connections = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
         self._create_tables()
 
+    @property
+    def conn(self):
+        """Conexão da thread atual, criada sob demanda"""
+        holder = getattr(self._local, 'conn', None)
+        if holder is None:
+            conn = sqlite3.connect(self.db_name, timeout=10, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=5000')
+            holder = self._local.conn = _ThreadConnection(conn)
+            # Só referências fracas: quem mantém a conexão viva é a própria thread
+            with self._connections_lock:
+                self._connections.add(holder)
+        return holder.conn
+
+    @contextmanager
+    def transaction(self):
+        """Executa um bloco em uma única transação"""
+        conn = self.conn
+        try:
+            yield conn.cursor()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
     def _create_tables(self):
         """Cria as tabelas necessárias"""
-        cursor = self.conn.cursor()
-        
-        # Tabela de partidas
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS matches (
-                id TEXT PRIMARY KEY,
-                opponent TEXT NOT NULL,
-                event TEXT NOT NULL,
-                match_time DATETIME NOT NULL,
-                notified BOOLEAN DEFAULT 0
+        with self.transaction() as cursor:
+            columns = [row['name'] for row in cursor.execute('PRAGMA table_info(matches)')]
+            if columns and 'link' not in columns:
+                # Esquema antigo (sem data/horário separados): as partidas são recriadas no próximo scraping
+                logger.warning("Tabela de partidas no formato antigo. Recriando...")
+                cursor.execute('DROP TABLE matches')
+
+            # Tabela de partidas
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS matches (
+                    id TEXT PRIMARY KEY,
+                    team TEXT NOT NULL DEFAULT 'FURIA',
+                    opponent TEXT NOT NULL,
+                    event TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    time TEXT NOT NULL,
+                    format TEXT NOT NULL DEFAULT '',
+                    link TEXT NOT NULL DEFAULT '',
+                    match_time DATETIME,
+                    start_ts INTEGER,
+                    position INTEGER NOT NULL DEFAULT 0,
+                    notified BOOLEAN DEFAULT 0
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_notified ON matches (notified, match_time)')
+            self._ensure_columns(cursor, 'matches', {
+                'start_ts': 'INTEGER',
+                'team': "TEXT NOT NULL DEFAULT 'FURIA'",
+            })
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_match_time ON matches (match_time)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_start_ts ON matches (start_ts)')
+
+            # Tabela de inscrições
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS subscriptions (
+                    user_id INTEGER PRIMARY KEY,
+                    notification_time INTEGER DEFAULT 30
+                )
+            ''')
+
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS idx_subscriptions_time ON subscriptions (notification_time)'
             )
-        ''')
-        
-        # Tabela de inscrições
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS subscriptions (
-                user_id INTEGER PRIMARY KEY,
-                notification_time INTEGER DEFAULT 30
+
+            # Avisos já enviados por (partida, antecedência em minutos)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS match_notifications (
+                    match_id TEXT NOT NULL,
+                    lead_minutes INTEGER NOT NULL,
+                    sent_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (match_id, lead_minutes)
+                )
+            ''')
+
+            # Entregas reservadas por (partida, usuário): cada aviso sai uma única vez.
+            # ``delivered_at`` fica vazio até o envio ser confirmado
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS notification_claims (
+                    match_id TEXT NOT NULL,
+                    user_id INTEGER NOT NULL,
+                    lead_minutes INTEGER NOT NULL,
+                    claimed_by TEXT,
+                    claimed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    delivered_at DATETIME,
+                    PRIMARY KEY (match_id, user_id)
+                )
+            ''')
+            if self._ensure_columns(cursor, 'notification_claims', {'delivered_at': 'DATETIME'}):
+                # Versões anteriores só reservavam depois de decidir enviar
+                cursor.execute('UPDATE notification_claims SET delivered_at = claimed_at')
+
+            # Leases de coordenação entre réplicas (ex.: líder do scraping)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS leases (
+                    name TEXT PRIMARY KEY,
+                    holder TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+
+            # Controle de migrações e outros metadados
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+
+    @staticmethod
+    def _ensure_columns(cursor, table, columns):
+        """Adiciona colunas novas a tabelas criadas por versões anteriores; retorna as adicionadas"""
+        existing = {row['name'] for row in cursor.execute(f'PRAGMA table_info({table})')}
+        added = []
+        for name, definition in columns.items():
+            if name not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
+                added.append(name)
+        return added
+
+    def upsert_matches(self, matches, cursor=None, keep_notified=False):
+        """Insere ou atualiza várias partidas com um único executemany.
+
+        Com ``keep_notified``, partidas já existentes mantêm o ``notified``
+        gravado no banco (evita sobrescrever um aviso enviado nesse meio tempo).
+        """
+        rows = [
+            (
+                m['id'], m.get('team', 'FURIA'), m['opponent'], m['event'], m['date'], m['time'],
+                m.get('format', ''), m.get('link', ''), _match_time(m), m.get('start_ts'),
+                position, int(bool(m.get('notified', False)))
             )
-        ''')
-        
-        self.conn.commit()
+            for position, m in enumerate(matches)
+        ]
+        sql = '''
+            INSERT INTO matches
+            (id, team, opponent, event, date, time, format, link, match_time, start_ts, position, notified)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                team = excluded.team,
+                opponent = excluded.opponent,
+                event = excluded.event,
+                date = excluded.date,
+                time = excluded.time,
+                format = excluded.format,
+                link = excluded.link,
+                match_time = excluded.match_time,
+                start_ts = excluded.start_ts,
+                position = excluded.position,
+                notified = {notified}
+        '''.format(notified='matches.notified' if keep_notified else 'excluded.notified')
+        if cursor is not None:
+            cursor.executemany(sql, rows)
+            return
+        with self.transaction() as cursor:
+            cursor.executemany(sql, rows)
+
+    def replace_matches(self, matches):
+        """Substitui o conjunto de partidas em uma única transação"""
+        with self.transaction() as cursor:
+            ids = [m['id'] for m in matches]
+            placeholders = ",".join("?" * len(ids))
+            cursor.execute(f'DELETE FROM matches WHERE id NOT IN ({placeholders})', ids)
+            self.upsert_matches(matches, cursor)
+
+    def apply_match_changes(self, changed, removed_ids):
+        """Grava apenas as partidas alteradas e remove as que sumiram, em uma transação.
+
+        Os avisos enviados e as entregas reservadas ficam: a partida pode voltar
+        à listagem no próximo scraping. Eles saem por idade, em ``prune_notifications``.
+        """
+        with self.transaction() as cursor:
+            if removed_ids:
+                cursor.executemany('DELETE FROM matches WHERE id = ?', [(i,) for i in removed_ids])
+            if changed:
+                self.upsert_matches(changed, cursor, keep_notified=True)
 
     def add_match(self, match):
         """Adiciona uma nova partida ao banco de dados"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                INSERT OR REPLACE INTO matches 
-                (id, opponent, event, match_time)
-                VALUES (?, ?, ?, ?)
-            ''', (
-                f"{match['time']}_{match['opponent']}",
-                match['opponent'],
-                match['event'],
-                match['time']
-            ))
-            self.conn.commit()
+            self.upsert_matches([match])
         except Exception as e:
             logger.error(f"Erro ao adicionar partida: {e}")
 
+    def get_matches(self):
+        """Retorna todas as partidas em ordem cronológica (TBA ao fim de cada dia)"""
+        cursor = self.conn.execute(
+            f'SELECT {", ".join(MATCH_COLUMNS)} FROM matches '
+            'ORDER BY date, start_ts IS NULL, start_ts, position'
+        )
+        return [
+            {**dict(row), 'notified': bool(row['notified'])}
+            for row in cursor.fetchall()
+        ]
+
+    def get_match(self, match_id):
+        row = self.conn.execute(
+            f'SELECT {", ".join(MATCH_COLUMNS)} FROM matches WHERE id = ?', (match_id,)
+        ).fetchone()
+        return {**dict(row), 'notified': bool(row['notified'])} if row else None
+
+    def clear_matches(self):
+        with self.transaction() as cursor:
+            cursor.execute('DELETE FROM matches')
+
+    def prune_notifications(self, now, retention):
+        """Apaga avisos e reservas de partidas que já começaram.
+
+        Partidas que saíram da listagem não têm mais horário no banco; as
+        delas saem quando foram gravadas há mais de ``retention`` segundos.
+        Retorna quantas linhas foram apagadas.
+        """
+        cutoff = now - retention
+        deleted = 0
+        with self.transaction() as cursor:
+            for table, stamp in (('match_notifications', 'sent_at'), ('notification_claims', 'claimed_at')):
+                cursor.execute(f'''
+                    DELETE FROM {table}
+                    WHERE match_id IN (SELECT id FROM matches WHERE start_ts <= ?)
+                    OR (
+                        match_id NOT IN (SELECT id FROM matches)
+                        AND {stamp} < datetime(?, 'unixepoch')
+                    )
+                ''', (now, cutoff))
+                deleted += cursor.rowcount
+        return deleted
+
     def get_upcoming_matches(self):
         """Retorna partidas não notificadas"""
         cursor = self.conn.cursor()
         cursor.execute('''
-            SELECT * FROM matches 
-            WHERE notified = 0 
+            SELECT id, opponent, event, match_time, notified FROM matches
+            WHERE notified = 0
             AND match_time > datetime('now')
         ''')
         return cursor.fetchall()
 
-    def mark_as_notified(self, match_id):
+    def mark_as_notified(self, match_id, status=True):
         """Marca partida como notificada"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            UPDATE matches 
-            SET notified = 1 
-            WHERE id = ?
-        ''', (match_id,))
-        self.conn.commit()
+        with self.transaction() as cursor:
+            cursor.execute('''
+                UPDATE matches
+                SET notified = ?
+                WHERE id = ?
+            ''', (int(status), match_id))
+
+    def claim_notification(self, match_id, lead_minutes):
+        """Registra o aviso da partida para a antecedência; False se já foi enviado"""
+        with self.transaction() as cursor:
+            cursor.execute(
+                'INSERT OR IGNORE INTO match_notifications (match_id, lead_minutes) VALUES (?, ?)',
+                (match_id, lead_minutes)
+            )
+            return cursor.rowcount > 0
+
+    def claim_deliveries(self, match_id, lead_minutes, user_ids, claimed_by=None, stale_before=0):
+        """Reserva o aviso da partida para cada usuário; retorna só os reservados agora.
+
+        Reservas sem entrega confirmada feitas antes de ``stale_before`` (epoch)
+        são de um envio interrompido (ex.: líder que caiu) e podem ser retomadas.
+        """
+        claimed = []
+        with self.transaction() as cursor:
+            for user_id in user_ids:
+                cursor.execute('''
+                    INSERT INTO notification_claims
+                    (match_id, user_id, lead_minutes, claimed_by, claimed_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(match_id, user_id) DO UPDATE SET
+                        lead_minutes = excluded.lead_minutes,
+                        claimed_by = excluded.claimed_by,
+                        claimed_at = excluded.claimed_at
+                    WHERE notification_claims.delivered_at IS NULL
+                    AND notification_claims.claimed_at < datetime(?, 'unixepoch')
+                ''', (match_id, user_id, lead_minutes, claimed_by, stale_before))
+                if cursor.rowcount > 0:
+                    claimed.append(user_id)
+        return claimed
+
+    def confirm_deliveries(self, match_id, user_ids):
+        """Marca as entregas reservadas como enviadas"""
+        with self.transaction() as cursor:
+            cursor.executemany('''
+                UPDATE notification_claims SET delivered_at = CURRENT_TIMESTAMP
+                WHERE match_id = ? AND user_id = ?
+            ''', [(match_id, user_id) for user_id in user_ids])
+
+    def release_deliveries(self, match_id, user_ids):
+        """Desfaz reservas não entregues, para o aviso ser tentado de novo"""
+        with self.transaction() as cursor:
+            cursor.executemany('''
+                DELETE FROM notification_claims
+                WHERE match_id = ? AND user_id = ? AND delivered_at IS NULL
+            ''', [(match_id, user_id) for user_id in user_ids])
+
+    def acquire_lease(self, name, holder, ttl, now):
+        """Obtém ou renova o lease se ele estiver livre, vencido ou já for do ``holder``"""
+        with self.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    holder = excluded.holder,
+                    expires_at = excluded.expires_at
+                WHERE leases.holder = excluded.holder OR leases.expires_at < ?
+            ''', (name, holder, now + ttl, now))
+            return cursor.rowcount > 0
+
+    def release_lease(self, name, holder):
+        with self.transaction() as cursor:
+            cursor.execute('DELETE FROM leases WHERE name = ? AND holder = ?', (name, holder))
+
+    def get_lease(self, name):
+        row = self.conn.execute(
+            'SELECT holder, expires_at FROM leases WHERE name = ?', (name,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_sent_notifications(self):
+        """Pares (partida, antecedência) já avisados"""
+        cursor = self.conn.execute('SELECT match_id, lead_minutes FROM match_notifications')
+        return {(row['match_id'], row['lead_minutes']) for row in cursor.fetchall()}
 
     def add_subscription(self, user_id, minutes=30):
         """Adiciona/atualiza uma inscrição"""
-        cursor = self.conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO subscriptions 
-            (user_id, notification_time) 
-            VALUES (?, ?)
-        ''', (user_id, minutes))
-        self.conn.commit()
+        with self.transaction() as cursor:
+            cursor.execute('''
+                INSERT INTO subscriptions (user_id, notification_time)
+                VALUES (?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET notification_time = excluded.notification_time
+            ''', (user_id, minutes))
+
+    def add_subscriptions(self, user_ids, minutes=30):
+        """Adiciona várias inscrições em uma única transação, sem alterar as existentes"""
+        with self.transaction() as cursor:
+            cursor.executemany(
+                'INSERT OR IGNORE INTO subscriptions (user_id, notification_time) VALUES (?, ?)',
+                [(user_id, minutes) for user_id in user_ids]
+            )
+
+    def remove_subscription(self, user_id):
+        """Remove uma inscrição; retorna True se ela existia"""
+        with self.transaction() as cursor:
+            cursor.execute('DELETE FROM subscriptions WHERE user_id = ?', (user_id,))
+            return cursor.rowcount > 0
+
+    def count_subscriptions(self):
+        """Quantidade de inscrições"""
+        return self.conn.execute('SELECT COUNT(*) FROM subscriptions').fetchone()[0]
 
     def get_subscriptions(self):
         """Retorna todas as inscrições"""
         cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM subscriptions')
+        cursor.execute('SELECT user_id, notification_time FROM subscriptions ORDER BY rowid')
         return cursor.fetchall()
 
+    def get_subscribers(self, minutes):
+        """Ids dos inscritos com a antecedência informada"""
+        cursor = self.conn.execute(
+            'SELECT user_id FROM subscriptions WHERE notification_time = ? ORDER BY rowid', (minutes,)
+        )
+        return [row['user_id'] for row in cursor.fetchall()]
+
+    def get_notification_times(self):
+        """Antecedências distintas escolhidas pelos inscritos"""
+        cursor = self.conn.execute(
+            'SELECT DISTINCT notification_time FROM subscriptions ORDER BY notification_time'
+        )
+        return [row['notification_time'] for row in cursor.fetchall()]
+
+    def get_meta(self, key):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, key, value, cursor=None):
+        sql = 'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)'
+        if cursor is not None:
+            cursor.execute(sql, (key, value))
+            return
+        with self.transaction() as cursor:
+            cursor.execute(sql, (key, value))
+
     def close(self):
-        self.conn.close()
\ No newline at end of file
+        with self._connections_lock:
+            connections, self._connections = list(self._connections), weakref.WeakSet()
+        for holder in connections:
+            holder.close()
+        self._local = threading.local()
@@ -0,0 +1,52 @@
+import logging
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCatalog:
+    """Respostas prontas indexadas por id.
+
+    Respostas fixas são registradas uma vez com ``add``; as que dependem da
+    data (ex.: tempo de time dos jogadores) são registradas com ``add_daily``
+    e recalculadas apenas quando o dia muda. ``get`` devolve os kwargs prontos
+    para ``reply_text``/``edit_message_text``.
+    """
+
+    def __init__(self):
+        self._static = {}
+        self._daily_builders = {}
+        self._daily = {}
+        self._day = None
+
+    def add(self, response_id, **response):
+        self._static[response_id] = response
+
+    def add_daily(self, response_id, build):
+        """Registra uma resposta construída por ``build(today)``"""
+        self._daily_builders[response_id] = build
+
+    def get(self, response_id):
+        response = self._static.get(response_id)
+        if response is not None:
+            return response
+
+        today = date.today()
+        if today != self._day:
+            self._daily = {}
+            self._day = today
+        response = self._daily.get(response_id)
+        if response is None:
+            response = self._daily[response_id] = self._daily_builders[response_id](today)
+        return response
+
+    def warm(self):
+        """Constrói antecipadamente todas as respostas do dia"""
+        for response_id in self._daily_builders:
+            self.get(response_id)
+        logger.info(
+            f"Catálogo pronto: {len(self._static)} respostas fixas e {len(self._daily)} diárias"
+        )
+
+
+catalog = ResponseCatalog()
@@ -1,16 +1,29 @@
 import logging
-import hashlib
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes, CallbackContext
-from bot.services.matches_scraper import matches_scraper
-from bot.services.storage import JSONStorage
-from bot.services.notifications import update_subscription
+from bot.services.broadcaster import broadcaster
+from bot.services.coordinator import coordinator
+from bot.services.metrics import registry
+from bot.services.draft5_parser import DRAFT5_TIMEZONE
+from bot.services.scraper_worker import scraper_worker
+from bot.services.storage import get_storage
+from bot.services.notifications import subscription_sync
+from bot.services.refresher import SnapshotRefresher
+from bot.services.render_cache import render_cache
+from bot.services.scheduler import LEAD_OPTIONS, NotificationScheduler, lead_label, time_left_label
+from bot.services.snapshot_diff import diff_snapshots
+from bot.services.tracing import tracer
 
 
 logger = logging.getLogger(__name__)
-storage = JSONStorage()
+storage = get_storage()
 
+SUBSCRIBERS = registry.gauge("furia_subscribers", "Usuários inscritos nas notificações")
+_stored_version = None  # Versão do snapshot do scraper gravada por último
+
+@tracer.traced("matches_handler")
 async def matches_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     try:
         if update.callback_query:
@@ -19,23 +32,34 @@ async def matches_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         force_update = False
         if context.args and context.args[0].lower() == 'force':
             force_update = True
-            await update.message.reply_text("⏳ Atualização forçada iniciada...")
+            if coordinator.is_leader:
+                await update.message.reply_text("⏳ Atualização forçada iniciada...")
+            else:
+                await update.message.reply_text(
+                    "ℹ️ As partidas são atualizadas por outra instância do bot. "
+                    "Mostrando a versão mais recente salva..."
+                )
 
         status_msg = await update.message.reply_text("🔍 Procurando partidas...")
 
+        if not coordinator.is_leader:
+            return await send_stored_matches(status_msg)
+
         try:
-            matches = matches_scraper.get_furia_matches(force_update)
-            
-            if not _validate_matches(matches):
-                raise ValueError("Dados inválidos do scraper")
-            
-            if not matches:
-                await status_msg.edit_text("📅 Nenhuma partida agendada")
-                storage.clear_matches()
+            # Sem snapshot salvo (primeira execução) ou com /matches force, o scraping é feito na hora
+            if force_update or not await storage.get_snapshot_state():
+                snapshot = await snapshot_refresher.refresh_now(context.job_queue, force_update)
+                if not snapshot['matches']:
+                    await status_msg.edit_text("📅 Nenhuma partida agendada")
+                    return
+                await send_matches_list(
+                    status_msg, snapshot['matches'], version=snapshot['version'],
+                    age=time.time() - snapshot['updated_at']
+                )
                 return
 
-            store_matches(matches)
-            await send_matches_list(status_msg, matches)
+            snapshot_refresher.revalidate(context.job_queue)
+            await send_stored_matches(status_msg)
 
         except Exception as e:
             logger.error(f"Erro no handler: {str(e)}", exc_info=True)
@@ -45,46 +69,61 @@ async def matches_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         logger.error(f"Erro crítico: {str(e)}", exc_info=True)
         await send_fallback(update)
 
-def _validate_matches(matches):
-    required_keys = ['opponent', 'event', 'date', 'time', 'format', 'link']
-    return all(
-        all(key in match for key in required_keys) and
-        isinstance(match['date'], str) and
-        isinstance(match['time'], str) and
-        len(match['opponent']) >= 2 and
-        not match['opponent'].lower() == "furia"
-        for match in matches
-    )
+async def refresh_snapshot(job_queue, force_update=False, max_age=None):
+    """Líder: faz o scraping, grava o que mudou e reagenda as notificações.
+
+    ``max_age`` (segundos) limita a idade do cache de cada time no scraper.
+
+    Se a versão do snapshot é a mesma da última gravação bem-sucedida
+    (páginas com a mesma impressão digital), não há nada a gravar. As
+    notificações são reagendadas mesmo assim: antecedências novas podem ter
+    sido escolhidas em outra réplica, e só o líder agenda os avisos.
+    """
+    global _stored_version
+    snapshot = await scraper_worker.get_snapshot(force_update, max_age)
+    version = snapshot.get('version')
+    # As partidas já vêm validadas pelo scraper
+    matches = [match.to_dict() for match in snapshot['matches']]
+
+    changed = version is None or version != _stored_version
+    if not changed:
+        logger.info("Partidas sem mudanças desde a última gravação")
+    elif not matches:
+        await storage.clear_matches()
+        _stored_version = version
+    else:
+        diff = await store_matches(matches)
+        if diff is not None:
+            _stored_version = version
+    await storage.prune_notifications()
+    # Relê partidas e antecedências do banco; só os jobs que mudaram são refeitos
+    await notification_scheduler.resync(job_queue)
 
-def store_matches(matches):
+    # O momento da última mudança versiona o texto renderizado da lista
+    state = await storage.set_snapshot_time(snapshot.get('updated_at') or time.time(), changed)
+    return {**snapshot, 'matches': matches, **state}
+
+async def store_matches(matches):
+    """Grava apenas o que mudou desde o último snapshot; retorna o ``SnapshotDiff``"""
     try:
-        valid_matches = []
-        for match in matches:
-            try:
-                match_id = hashlib.md5(
-                    f"{match['date']}_{match['opponent']}".encode()
-                ).hexdigest()
-                
-                valid_matches.append({
-                    'id': match_id,
-                    'opponent': match['opponent'],
-                    'event': match['event'],
-                    'date': match['date'],
-                    'time': match['time'],
-                    'format': match['format'],
-                    'link': match['link'],
-                    'notified': False
-                })
-            except KeyError as e:
-                logger.warning(f"Partida incompleta: {str(e)}")
-        
-        storage.add_matches(valid_matches)
-        
+        diff = diff_snapshots(await storage.get_matches(), matches)
+        if diff:
+            await storage.apply_diff(diff)
+            logger.info(f"Snapshot atualizado: {diff.summary()}")
+            for match in diff.rescheduled:
+                logger.info(f"Partida {match['id']} remarcada para {match['date']} {match['time']}")
+        return diff
+
     except Exception as e:
+        # As partidas salvas continuam valendo; o próximo refresh tenta gravar de novo
         logger.error(f"Erro no armazenamento: {str(e)}")
-        storage.clear_matches()
 
-async def send_matches_list(status_msg, matches):
+def _team_suffix(match):
+    """Indica o time quando a partida não é do elenco principal"""
+    team = match.get('team', "FURIA")
+    return "" if team == "FURIA" else f" ({team})"
+
+def render_matches_list(matches):
     message = "<b>🔴 Próximas Partidas da FURIA:</b>\n\n"
     
     for idx, match in enumerate(matches, 1):
@@ -99,25 +138,74 @@ async def send_matches_list(status_msg, matches):
         
         message += (
             f"🏁 <b>Partida {idx}</b>\n"
-            f"🆚 Adversário: <b>{match['opponent']}</b>\n"
+            f"🆚 Adversário: <b>{match['opponent']}</b>{_team_suffix(match)}\n"
             f"📅 Data: <code>{formatted_date}</code>\n" 
             f"⏰ Horário: {time_display}\n"
             f"🏆 Evento: {match['event']}\n"
             f"⚙ Formato: {match['format']}\n"
             f"🔗 Detalhes: {match['link']}\n\n"
         )
-    
+
+    reply_markup = InlineKeyboardMarkup([[
+        InlineKeyboardButton("🔔 Ativar Notificações", callback_data="notif_on"),
+        InlineKeyboardButton("🔕 Desativar", callback_data="notif_off")
+    ]])
+    return message, reply_markup
+
+def format_age(seconds):
+    """Idade do snapshot por extenso (ex.: "há 5 min")"""
+    if seconds < 60:
+        return "agora mesmo"
+    if seconds < 3600:
+        return f"há {int(seconds // 60)} min"
+    if seconds < 86400:
+        return f"há {int(seconds // 3600)} h"
+    days = int(seconds // 86400)
+    return f"há {days} dia" if days == 1 else f"há {days} dias"
+
+async def send_matches_list(status_msg, matches, version=None, age=None):
+    with tracer.span("matches.render", matches=len(matches)):
+        # Sem versão não há como saber se o cache corresponde a estas partidas
+        if version is None:
+            message, reply_markup = render_matches_list(matches)
+        else:
+            message, reply_markup = render_cache.get(
+                'matches_list', lambda: render_matches_list(matches), version=version
+            )
+
+    # A idade muda a cada pedido, então fica fora do texto em cache
+    if age is not None:
+        status = " · atualizando..." if snapshot_refresher.in_progress else ""
+        message += f"<i>🕒 Atualizado {format_age(age)}{status}</i>"
+
     await status_msg.edit_text(
         text=message,
         parse_mode="HTML",
         disable_web_page_preview=True,
-        reply_markup=InlineKeyboardMarkup([[
-            InlineKeyboardButton("🔔 Ativar Notificações", callback_data="notif_on"),
-            InlineKeyboardButton("🔕 Desativar", callback_data="notif_off")
-        ]])
+        reply_markup=reply_markup
     )
+
+async def send_stored_matches(status_msg):
+    """Responde na hora com o snapshot salvo no banco e a idade dele"""
+    try:
+        # A versão é lida antes das partidas: se o líder gravar entre as duas
+        # leituras, o texto novo fica sob a versão antiga, que não volta a ser pedida
+        state = await storage.get_snapshot_state()
+        matches = await storage.get_matches()
+        if not matches:
+            await status_msg.edit_text("📅 Nenhuma partida agendada")
+            return
+        await send_matches_list(
+            status_msg, matches,
+            version=state['version'] if state else None,
+            age=time.time() - state['updated_at'] if state else None
+        )
+    except Exception as e:
+        logger.error(f"Erro ao ler o snapshot compartilhado: {str(e)}", exc_info=True)
+        await handle_scrape_error(status_msg)
+
 async def handle_scrape_error(status_msg):
-    cached_matches = storage.get_matches()
+    cached_matches = await storage.get_matches()
     
     if cached_matches:
         await status_msg.edit_text(
@@ -134,19 +222,43 @@ async def handle_scrape_error(status_msg):
             "3. Tente novamente mais tarde"
         )
 
+def lead_keyboard():
+    """Botões para escolher com quanta antecedência receber os avisos"""
+    buttons = [
+        InlineKeyboardButton(f"⏰ {lead_label(lead)}", callback_data=f"notif_lead_{lead}")
+        for lead in LEAD_OPTIONS
+    ]
+    return InlineKeyboardMarkup([buttons[:3], buttons[3:]])
+
 async def handle_notification_callback(update: Update, context: CallbackContext):
     query = update.callback_query
     await query.answer()
 
     try:
         user_id = query.from_user.id
-        action = query.data.split("_")[1]  # "on" ou "off"
-
-        result = await update_subscription(user_id, action)
+        action = query.data.split("_")[1]  # "on", "off" ou "lead"
 
         if action == "on":
-            msg = "✅ Você receberá notificações 1h antes das partidas!"
+            await query.edit_message_text(
+                text="⏰ Com quanta antecedência você quer ser avisado?",
+                reply_markup=lead_keyboard()
+            )
+            return
+
+        if action == "lead":
+            lead = int(query.data.split("_")[2])
+            if lead not in LEAD_OPTIONS:
+                raise ValueError(f"Antecedência inválida: {lead}")
+            await storage.add_subscription(user_id, lead)
+            if lead not in notification_scheduler.lead_minutes:
+                await notification_scheduler.resync(context.job_queue)
+            subscription_sync.enqueue(user_id, "on")
+            await update_subscriber_count()
+            msg = f"✅ Você receberá notificações {lead_label(lead)} antes das partidas!"
         else:
+            await storage.remove_subscription(user_id)
+            subscription_sync.enqueue(user_id, "off")
+            await update_subscriber_count()
             msg = "🔕 Notificações desativadas com sucesso"
 
         await query.edit_message_text(text=msg, parse_mode="HTML")
@@ -159,74 +271,78 @@ async def handle_notification_callback(update: Update, context: CallbackContext)
         logger.error(f"Erro na callback: {str(e)}")
         await query.edit_message_text(text="⚠️ Erro no processamento")
 
-async def check_and_notify(context: ContextTypes.DEFAULT_TYPE):
-    try:
-        now = datetime.now()
-        matches = storage.get_matches()
-        
-        for match in matches:
-            if not match['notified'] and match['time'] != "TBA":
-                try:
-                    # Combinar a data e hora antes de converter para datetime
-                    date_str = match['date']  # Formato "%Y-%m-%d"
-                    time_str = match['time']  # Formato "HH:MM"
-                    
-                    # Verificar se time_str contém apenas hora (sem data)
-                    if ":" in time_str and len(time_str) <= 5:
-                        datetime_str = f"{date_str} {time_str}"
-                        match_time = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-                        
-                        if (match_time - timedelta(hours=1)) <= now < match_time:
-                            await send_notification(context.bot, match)
-                            storage.update_match_status(match['id'], True)
-                    else:
-                        logger.warning(f"Formato de hora inválido: {time_str}")
-                        
-                except Exception as e:
-                    logger.error(f"Erro na notificação: {str(e)}")
-                    
-    except Exception as e:
-        logger.error(f"Erro no job: {str(e)}")
-        context.job_queue.run_once(check_and_notify, 300)
+def render_notification(match, lead, now=None):
+    """Texto do alerta da partida, ou None se o horário for inválido.
+
+    Se a partida foi descoberta depois de a janela da antecedência começar
+    (o job dispara na hora), o texto traz o tempo que realmente falta.
+    """
+    if not match.get('start_ts'):
+        return None
 
-async def send_notification(bot, match):
+    remaining = match['start_ts'] - (now or time.time())
+    # Um minuto de folga para o atraso normal da JobQueue
+    if remaining < lead * 60 - 60:
+        time_left = time_left_label(remaining)
+    else:
+        time_left = lead_label(lead)
+
+    dt = datetime.fromtimestamp(match['start_ts'], DRAFT5_TIMEZONE)
+    return (
+        f"⏰ <b>Notificação de Partida!</b>\n\n"
+        f"A partida contra {match['opponent']}{_team_suffix(match)} começa em {time_left}!\n\n"
+        f"🏆 {match['event']}\n"
+        f"⏰ {dt.strftime('%d/%m/%Y %H:%M')}\n"
+        f"🔗 {match['link']}"
+    )
+
+async def send_notification(bot, match, lead, chat_ids):
+    """Envia o aviso da partida, de uma vez, aos inscritos de uma antecedência.
+
+    Retorna o ``BroadcastReport`` do envio, ou ``None`` se nada foi enviado.
+    """
     if match['time'] == "TBA":
-        return
+        return None
 
     try:
-        # Combinar data e hora
-        date_str = match['date']
-        time_str = match['time']
-        
-        if ":" in time_str and len(time_str) <= 5:
-            datetime_str = f"{date_str} {time_str}"
-            dt = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-            formatted_time = dt.strftime("%d/%m/%Y %H:%M")
-            
-            message = (
-                f"⏰ <b>Notificação de Partida!</b>\n\n"
-                f"A partida contra {match['opponent']} começa em 1 hora!\n\n"
-                f"🏆 {match['event']}\n"
-                f"⏰ {formatted_time}\n"
-                f"🔗 {match['link']}"
-            )
-            
-            for user_id in storage.get_subscriptions():
-                try:
-                    await bot.send_message(
-                        chat_id=user_id,
-                        text=message,
-                        parse_mode="HTML",
-                        disable_web_page_preview=True
-                    )
-                except Exception as e:
-                    logger.warning(f"Falha na notificação para {user_id}: {str(e)}")
-                    storage.remove_subscription(user_id)
-        else:
-            logger.warning(f"Formato de hora inválido: {time_str}")
+        # Sem cache: cada (partida, antecedência) é avisada uma única vez e o
+        # texto já é compartilhado por todos os inscritos do broadcast
+        message = render_notification(match, lead)
+        if message is None:
+            logger.warning(f"Partida {match['id']} sem horário de início")
+            return None
+
+        report = await broadcaster.broadcast(
+            bot,
+            chat_ids,
+            message,
+            parse_mode="HTML",
+            disable_web_page_preview=True
+        )
     except Exception as e:
         logger.error(f"Erro ao enviar notificação: {str(e)}")
+        return None
+
+    try:
+        for user_id in report.unreachable:
+            await storage.remove_subscription(user_id)
+        if report.unreachable:
+            await update_subscriber_count()
+    except Exception as e:
+        logger.error(f"Erro ao remover inscritos inalcançáveis: {str(e)}")
+    return report
         
+async def update_subscriber_count(context=None):
+    """Atualiza o gauge de inscritos pelo banco; o /metrics só lê o último valor.
+
+    Chamada após cada alteração local e, como job, periodicamente (as
+    inscrições também mudam por outras réplicas).
+    """
+    try:
+        SUBSCRIBERS.set(await storage.count_subscriptions())
+    except Exception as e:
+        logger.error(f"Erro ao contar inscritos: {str(e)}")
+
 async def send_fallback(update: Update):
     await update.message.reply_text(
         "⚠️ Serviço temporariamente indisponível\n\n"
@@ -237,4 +353,8 @@ async def send_fallback(update: Update):
         "Tente novamente mais tarde!",
         parse_mode="HTML",
         disable_web_page_preview=True
-    )
\ No newline at end of file
+    )
+
+
+notification_scheduler = NotificationScheduler(storage, send_notification, coordinator=coordinator)
+snapshot_refresher = SnapshotRefresher(refresh_snapshot, coordinator=coordinator)
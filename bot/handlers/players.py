@@ -1,7 +1,9 @@
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, CallbackContext, CallbackQueryHandler
-from datetime import datetime
+from datetime import date
+from functools import partial
+from bot.handlers.catalog import catalog
 
 logger = logging.getLogger(__name__)
 
@@ -61,22 +63,73 @@ FURIA_PLAYERS = [
 
 
 
+def _tenure_text(join_date, today):
+    """Texto do tempo de time do jogador na data ``today``"""
+    # Verifica se a data é futura
+    if join_date > today:
+        return "🔜 Ainda não ingressou no time"
+
+    # Calcula diferença
+    total_days = (today - join_date).days
+    
+    years = total_days // 365
+    remaining_days = total_days % 365
+    months = remaining_days // 30
+
+    # Formatação do texto
+    time_parts = []
+    if years > 0:
+        time_parts.append(f"{years} ano{'s' if years > 1 else ''}")
+    if months > 0:
+        time_parts.append(f"{months} {'meses' if months > 1 else 'mês'}")
+    
+    if years == 0 and months == 0:
+        if total_days == 0:
+            return "🏁 Ingressou hoje!"
+        return f"⏳ {total_days} dia{'s' if total_days > 1 else ''}"
+    return " há " + " e ".join(time_parts)
+
+
+def _player_card(player, join_date, today):
+    return {
+        'text': (
+            f"🐾 *{player['name']} ({player['full_name']})*\n\n"
+            f"🌎 Nacionalidade: {player['nationality']}\n"
+            f"🎂 Idade: {player['age']} anos\n"
+            f"🎮 Função: {player['role']}\n"
+            f"📅 No time{_tenure_text(join_date, today)}\n\n"
+            f"📸 [Foto do jogador]({player['photo_url']})"
+        ),
+        'parse_mode': "Markdown"
+    }
+
+
+catalog.add(
+    "team",
+    text=(
+        "🟡⚫ *Elenco Atual da FURIA* ⚫🟡\n\n"
+        "Selecione um jogador para ver mais informações:"
+    ),
+    # Cria teclado inline com os jogadores
+    reply_markup=InlineKeyboardMarkup([
+        [InlineKeyboardButton(player['name'], callback_data=f"player_{player['id']}")]
+        for player in FURIA_PLAYERS
+    ]),
+    parse_mode="Markdown"
+)
+
+# Os ids das respostas são os próprios callback_data dos botões
+for _player in FURIA_PLAYERS:
+    catalog.add_daily(
+        f"player_{_player['id']}",
+        partial(_player_card, _player, date.fromisoformat(_player['join_date']))
+    )
+
+
 async def team_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler para o comando /team - mostra o elenco atual"""
     try:
-        # Cria teclado inline com os jogadores
-        keyboard = [
-            [InlineKeyboardButton(player['name'], callback_data=f"player_{player['id']}")]
-            for player in FURIA_PLAYERS
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.message.reply_text(
-            "🟡⚫ *Elenco Atual da FURIA* ⚫🟡\n\n"
-            "Selecione um jogador para ver mais informações:",
-            reply_markup=reply_markup,
-            parse_mode="Markdown"
-        )
+        await update.message.reply_text(**catalog.get("team"))
     except Exception as e:
         logger.error(f"Erro no team_handler: {str(e)}")
         await update.message.reply_text(
@@ -91,53 +144,7 @@ async def button_handler(update: Update, context: CallbackContext):
     
     try:
         if query.data.startswith("player_"):
-            player_id = int(query.data.split("_")[1])
-            player = next(p for p in FURIA_PLAYERS if p['id'] == player_id)
-            
-            # Cálculo do tempo no time
-            join_date = datetime.strptime(player['join_date'], '%Y-%m-%d')
-            today = datetime.now()
-            
-            # Verifica se a data é futura
-            if join_date > today:
-                time_text = "🔜 Ainda não ingressou no time"
-            else:
-                # Calcula diferença
-                delta = today - join_date
-                total_days = delta.days
-                
-                years = total_days // 365
-                remaining_days = total_days % 365
-                months = remaining_days // 30
-
-                # Formatação do texto
-                time_parts = []
-                if years > 0:
-                    time_parts.append(f"{years} ano{'s' if years > 1 else ''}")
-                if months > 0:
-                    time_parts.append(f"{months} {'meses' if months > 1 else 'mês'}")
-                
-                if years == 0 and months == 0:
-                    if total_days == 0:
-                        time_text = "🏁 Ingressou hoje!"
-                    else:
-                        time_text = f"⏳ {total_days} dia{'s' if total_days > 1 else ''}"
-                else:
-                    time_text = " há " + " e ".join(time_parts)
-
-            response = (
-                f"🐾 *{player['name']} ({player['full_name']})*\n\n"
-                f"🌎 Nacionalidade: {player['nationality']}\n"
-                f"🎂 Idade: {player['age']} anos\n"
-                f"🎮 Função: {player['role']}\n"
-                f"📅 No time{time_text}\n\n"
-                f"📸 [Foto do jogador]({player['photo_url']})"
-            )
-            
-            await query.edit_message_text(
-                text=response,
-                parse_mode="Markdown"
-            )
+            await query.edit_message_text(**catalog.get(query.data))
             
     except Exception as e:
         logger.error(f"Erro no button_handler: {str(e)}")
@@ -1,13 +1,13 @@
 from telegram import Update
 from telegram.ext import ContextTypes
+from bot.handlers.catalog import catalog
 import logging
 
 logger = logging.getLogger(__name__)
 
-async def social_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handler para o comando /social"""
-    try:
-        social_links = """
+catalog.add(
+    "socials",
+    text="""
         <b>📱 Redes Sociais Oficiais da FURIA:</b>
 
         🔹 X: <a href="https://x.com/FURIA">@FURIA</a>
@@ -18,11 +18,14 @@ async def social_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         🔸 Twitch: <a href="https://www.twitch.tv/furiatv">/furiatv</a>
 
         📍 Acompanhe todas as novidades!
-        """
-        await update.message.reply_text(
-            social_links,
-            parse_mode="HTML",
-            disable_web_page_preview=True
-        )
+        """,
+    parse_mode="HTML",
+    disable_web_page_preview=True
+)
+
+async def social_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler para o comando /social"""
+    try:
+        await update.message.reply_text(**catalog.get("socials"))
     except Exception as e:
         logger.error(f"Erro no /social: {str(e)}")
\ No newline at end of file
@@ -1,12 +1,13 @@
 import logging
 from telegram import Update
 from telegram.ext import ContextTypes
+from bot.handlers.catalog import catalog
 
 logger = logging.getLogger(__name__)
 
-async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Handler para o comando /start"""
-    welcome_msg = (
+catalog.add(
+    "start",
+    text=(
         "🟡⚫ <b>Bem-vindo ao FURIA CS2 Bot!</b> ⚫🟡\n\n"
         "⚡ <b>Comandos disponíveis:</b>\n"
         "/start - Mostra esta mensagem\n"
@@ -14,9 +15,10 @@ async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "/matches - Próximos jogos\n"
         "/socials - Redes sociais da FURIA\n"
         "\nFollow the steps 🐾"
-    )
-    
-    await update.message.reply_text(
-        welcome_msg,
-        parse_mode="HTML"
-    )
\ No newline at end of file
+    ),
+    parse_mode="HTML"
+)
+
+async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handler para o comando /start"""
+    await update.message.reply_text(**catalog.get("start"))
\ No newline at end of file
@@ -1,20 +1,31 @@
 from telegram import Update
 from telegram.ext import ContextTypes
-from bot.services.storage import JSONStorage
+from bot.services.storage import get_storage
+from bot.services.scheduler import DEFAULT_LEAD_MINUTES, LEAD_OPTIONS, lead_label
+from bot.handlers.matches import notification_scheduler, update_subscriber_count
 import logging
 
 logger = logging.getLogger(__name__)
-storage = JSONStorage()
+storage = get_storage()
 
 async def subscribe_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler para inscrição de notificações"""
     try:
         user_id = update.effective_user.id
-        storage.add_subscription(user_id)
-        
+        lead = int(context.args[0]) if context.args and context.args[0].isdigit() else DEFAULT_LEAD_MINUTES
+        if lead not in LEAD_OPTIONS:
+            options = ", ".join(str(m) for m in LEAD_OPTIONS)
+            await update.message.reply_text(f"⚠️ Antecedência inválida. Use uma destas (minutos): {options}")
+            return
+
+        await storage.add_subscription(user_id, lead)
+        if lead not in notification_scheduler.lead_minutes:
+            await notification_scheduler.resync(context.job_queue)
+        await update_subscriber_count()
+
         await update.message.reply_text(
             "✅ Você foi inscrito nas notificações!\n"
-            "Receberá alertas 1 hora antes das partidas.",
+            f"Receberá alertas {lead_label(lead)} antes das partidas.",
             parse_mode="HTML"
         )
     except Exception as e:
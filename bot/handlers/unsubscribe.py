@@ -1,17 +1,19 @@
 from telegram import Update
 from telegram.ext import ContextTypes
-from bot.services.storage import JSONStorage
+from bot.services.storage import get_storage
+from bot.handlers.matches import update_subscriber_count
 import logging
 
 logger = logging.getLogger(__name__)
-storage = JSONStorage()
+storage = get_storage()
 
 async def unsubscribe_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handler para cancelar inscrição"""
     try:
         user_id = update.effective_user.id
-        storage.remove_subscription(user_id)
-        
+        await storage.remove_subscription(user_id)
+        await update_subscriber_count()
+
         await update.message.reply_text(
             "🔕 Inscrição cancelada com sucesso!\n"
             "Você não receberá mais notificações.",
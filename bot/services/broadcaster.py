@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from telegram.error import BadRequest, Forbidden, RetryAfter, TelegramError
+from telegram.ext import BaseRateLimiter
+from telegram.request import HTTPXRequest
+
+from bot.services.metrics import registry
+from bot.services.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_MESSAGES = registry.counter(
+    "furia_broadcast_messages_total", "Mensagens de broadcast por resultado", labels=("result",)
+)
+BROADCAST_SECONDS = registry.histogram(
+    "furia_broadcast_duration_seconds", "Duração de cada broadcast completo"
+)
+
+# Prioridades passadas em ``rate_limit_args``: menor valor é atendido primeiro
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+
+
+class PriorityRateLimiter(BaseRateLimiter):
+    """Rate limiter do Telegram com faixa prioritária para respostas interativas.
+
+    Todas as requisições respeitam o limite global de ``overall_rate`` por
+    segundo. Envios em massa (``rate_limit_args=PRIORITY_BULK``) também
+    respeitam ``per_chat_interval`` por chat e aguardam enquanto houver
+    requisições interativas (respostas, edições, callbacks) na fila.
+    """
+
+    def __init__(self, overall_rate=30, per_chat_interval=1.0, max_retries=3):
+        self.overall_rate = overall_rate
+        self.per_chat_interval = per_chat_interval
+        self.max_retries = max_retries
+        self._tokens = float(overall_rate)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._chat_next_slot = {}
+        self._interactive_waiting = 0
+        self._interactive_idle = asyncio.Event()
+        self._interactive_idle.set()
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._tokens = min(self.overall_rate, self._tokens + elapsed * self.overall_rate)
+        self._last_refill = now
+
+    async def _acquire_global(self, priority):
+        while True:
+            if priority != PRIORITY_INTERACTIVE and self._interactive_waiting:
+                await self._interactive_idle.wait()
+                continue
+
+            now = time.monotonic()
+            if self._paused_until > now:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.overall_rate)
+
+    async def _acquire_chat(self, chat_id):
+        now = time.monotonic()
+        slot = max(now, self._chat_next_slot.get(chat_id, 0.0))
+        self._chat_next_slot[chat_id] = slot + self.per_chat_interval
+        if len(self._chat_next_slot) > 10000:
+            self._chat_next_slot = {c: t for c, t in self._chat_next_slot.items() if t > now}
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _acquire(self, priority, chat_id):
+        if priority == PRIORITY_INTERACTIVE:
+            self._interactive_waiting += 1
+            self._interactive_idle.clear()
+            try:
+                await self._acquire_global(priority)
+            finally:
+                self._interactive_waiting -= 1
+                if not self._interactive_waiting:
+                    self._interactive_idle.set()
+            return
+
+        if chat_id is not None:
+            await self._acquire_chat(chat_id)
+        await self._acquire_global(priority)
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        priority = PRIORITY_INTERACTIVE if rate_limit_args is None else rate_limit_args
+        chat_id = data.get('chat_id')
+
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(priority, chat_id)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt >= self.max_retries:
+                    raise
+                # Backoff: espera o indicado pelo Telegram, crescendo a cada nova tentativa
+                delay = float(e.retry_after) * (attempt + 1)
+                logger.warning(f"Limite do Telegram atingido em {endpoint}. Aguardando {delay:.1f}s")
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+
+class TracedRequest(HTTPXRequest):
+    """Transporte do bot que mede cada chamada à API do Telegram em um span.
+
+    O span fica sob o do handler ou broadcast que fez a chamada. O long
+    polling (``getUpdates``) não é medido: não pertence a nenhum update.
+    """
+
+    async def do_request(self, url, method, *args, **kwargs):
+        endpoint = url.rsplit('/', 1)[-1]
+        if endpoint == "getUpdates":
+            return await super().do_request(url, method, *args, **kwargs)
+        with tracer.span(f"telegram.{endpoint}") as span:
+            status, payload = await super().do_request(url, method, *args, **kwargs)
+            span.set(status=status)
+            return status, payload
+
+
+@dataclass
+class BroadcastReport:
+    total: int
+    delivered: int = 0
+    failed: list = field(default_factory=list)
+    unreachable: list = field(default_factory=list)
+    duration: float = 0.0
+    time_to_last: float = 0.0
+
+    @property
+    def throughput(self):
+        return self.delivered / self.duration if self.duration else 0.0
+
+
+class Broadcaster:
+    """Envia a mesma mensagem a muitos chats em paralelo, na faixa de baixa prioridade"""
+
+    def __init__(self, concurrency=30):
+        self.concurrency = concurrency
+
+    async def broadcast(self, bot, chat_ids, text, **kwargs):
+        chat_ids = list(chat_ids)
+        report = BroadcastReport(total=len(chat_ids))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        if getattr(bot, 'rate_limiter', None):
+            kwargs['rate_limit_args'] = PRIORITY_BULK
+        started = time.monotonic()
+
+        async def send(chat_id):
+            async with semaphore:
+                try:
+                    await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+                    report.delivered += 1
+                    report.time_to_last = time.monotonic() - started
+                except (Forbidden, BadRequest) as e:
+                    # Usuário bloqueou o bot ou o chat não existe mais
+                    logger.warning(f"Chat {chat_id} inacessível: {str(e)}")
+                    report.unreachable.append(chat_id)
+                except TelegramError as e:
+                    logger.warning(f"Falha na notificação para {chat_id}: {str(e)}")
+                    report.failed.append(chat_id)
+
+        with tracer.span("broadcast", chats=len(chat_ids)) as span:
+            await asyncio.gather(*(send(chat_id) for chat_id in chat_ids))
+            span.set(delivered=report.delivered)
+        report.duration = time.monotonic() - started
+        BROADCAST_SECONDS.observe(report.duration)
+        BROADCAST_MESSAGES.inc(report.delivered, result="delivered")
+        BROADCAST_MESSAGES.inc(len(report.failed), result="failed")
+        BROADCAST_MESSAGES.inc(len(report.unreachable), result="unreachable")
+
+        logger.info(
+            f"Broadcast: {report.delivered}/{report.total} entregues em {report.duration:.2f}s "
+            f"({report.throughput:.1f} msg/s, último em {report.time_to_last:.2f}s)"
+        )
+        return report
+
+
+broadcaster = Broadcaster()
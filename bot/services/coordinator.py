@@ -0,0 +1,97 @@
+import logging
+import os
+import socket
+import time
+import uuid
+
+from bot.services.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+LEADER_LEASE = "leader"
+
+
+class Coordinator:
+    """Eleição de líder entre réplicas que compartilham o mesmo banco SQLite.
+
+    Só o líder faz scraping e dispara as notificações agendadas; as demais
+    réplicas respondem com o snapshot salvo no banco. O lease é renovado a
+    cada ``renew_interval`` segundos e vence após ``ttl``: se o líder parar,
+    outra réplica assume em no máximo ``ttl + renew_interval`` segundos.
+    Um líder que não consegue renovar deixa de agir assim que o lease vence.
+    """
+
+    def __init__(self, storage, replica_id=None, ttl=None, renew_interval=None, name=LEADER_LEASE):
+        self.storage = storage
+        self.name = name
+        self.replica_id = replica_id or os.getenv("REPLICA_ID") or (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        )
+        self.ttl = ttl or int(os.getenv("LEADER_LEASE_TTL", "30"))
+        self.renew_interval = renew_interval or self.ttl / 3
+        self._lease_until = 0.0
+        self._leader = False
+        self._on_elected = []
+        self._job = None
+
+    @property
+    def is_leader(self):
+        return self._leader and time.monotonic() < self._lease_until
+
+    def on_elected(self, callback):
+        """Registra uma corrotina chamada sempre que esta réplica vira líder"""
+        self._on_elected.append(callback)
+
+    async def renew(self):
+        """Tenta obter/renovar o lease; retorna se esta réplica é a líder"""
+        started = time.monotonic()
+        was_leader = self.is_leader
+        try:
+            acquired = await self.storage.acquire_lease(self.name, self.replica_id, self.ttl)
+        except Exception as e:
+            # Sem acesso ao banco, continua líder só até o lease atual vencer
+            logger.error(f"Erro ao renovar o lease '{self.name}': {str(e)}")
+            acquired = None
+
+        if acquired:
+            self._lease_until = started + self.ttl
+        if acquired is not None:
+            self._leader = acquired
+
+        if acquired and not was_leader:
+            logger.info(f"Réplica {self.replica_id} assumiu a liderança")
+            for callback in self._on_elected:
+                try:
+                    await callback()
+                except Exception as e:
+                    logger.error(f"Erro ao assumir a liderança: {str(e)}", exc_info=True)
+        elif was_leader and not self.is_leader:
+            logger.warning(f"Réplica {self.replica_id} perdeu a liderança")
+        return self.is_leader
+
+    async def _renew_job(self, context):
+        await self.renew()
+
+    async def start(self, job_queue):
+        """Disputa a liderança agora e agenda as renovações na JobQueue"""
+        await self.renew()
+        if not self.is_leader:
+            logger.info(f"Réplica {self.replica_id} iniciada como seguidora")
+        self._job = job_queue.run_repeating(
+            self._renew_job, interval=self.renew_interval, name=f"lease:{self.name}"
+        )
+
+    async def stop(self):
+        """Libera o lease para que outra réplica assuma sem esperar o vencimento"""
+        if self._job:
+            self._job.schedule_removal()
+            self._job = None
+        if self._leader:
+            self._leader = False
+            try:
+                await self.storage.release_lease(self.name, self.replica_id)
+            except Exception as e:
+                logger.error(f"Erro ao liberar o lease '{self.name}': {str(e)}")
+
+
+coordinator = Coordinator(get_storage())
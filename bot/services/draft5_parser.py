@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from urllib.parse import urljoin
+from zoneinfo import ZoneInfo
+
+from lxml import html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+DRAFT5_BASE_URL = "https://draft5.gg"
+DRAFT5_TIMEZONE = ZoneInfo("America/Sao_Paulo")
+
+# Trechos da página que descrevem as partidas, para a impressão digital
+LISTING_REGION_RE = re.compile(
+    r'<(p|a)\b[^>]*class="[^"]*(?:MatchList__MatchListDate|MatchCardSimple__MatchContainer)'
+    r'[^"]*"[^>]*>.*?</\1>',
+    re.S,
+)
+NEXT_DATA_RE = re.compile(r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+
+LISTING_XPATH = (
+    '//*[contains(@class, "MatchList__MatchListDate") or '
+    'contains(@class, "MatchCardSimple__MatchContainer")]'
+)
+
+
+def _first_text(element, xpath):
+    found = element.xpath(xpath)
+    return found[0].text_content().strip() if found else ""
+
+
+def extract_listing(page_html):
+    """Extrai datas e partidas da listagem renderizada, na ordem do documento.
+
+    Retorna uma lista de entradas no mesmo formato usado pelo scraper:
+    ``{'kind': 'date', 'text': ...}`` ou ``{'kind': 'match', 'teams': [...],
+    'time': ..., 'format': ..., 'event': ..., 'href': ...}``.
+    """
+    tree = lxml_html.fromstring(page_html)
+    entries = []
+
+    for element in tree.xpath(LISTING_XPATH):
+        css_class = element.get("class", "")
+        if "MatchList__MatchListDate" in css_class:
+            entries.append({'kind': 'date', 'text': element.text_content().strip()})
+        elif "MatchCardSimple__MatchContainer" in css_class:
+            teams = [
+                span.text_content().strip()
+                for span in element.xpath('.//div[contains(@class, "TeamNameAndLogo")]//span')
+            ]
+            entries.append({
+                'kind': 'match',
+                'teams': [t for t in teams if t],
+                'time': _first_text(element, './/small[contains(@class, "MatchTime")]'),
+                'format': _first_text(element, './/div[contains(@class, "Badge")]'),
+                'event': _first_text(element, './/div[contains(@class, "Tournament")]'),
+                'href': urljoin(DRAFT5_BASE_URL, element.get("href", "")),
+            })
+
+    return entries
+
+
+def _match_href(match):
+    """Monta o link da partida no mesmo padrão usado pelo site"""
+    title = (
+        f"{match['teamA']['teamName']} vs {match['teamB']['teamName']} "
+        f"{match['tournament']['tournamentName']}"
+    )
+    slug = re.sub(r'\W+', '-', title).strip('-')
+    return f"{DRAFT5_BASE_URL}/partida/{match['matchId']}-{slug}"
+
+
+def extract_next_data(page_html):
+    """Lê as partidas do estado embutido pelo Next.js (``__NEXT_DATA__``).
+
+    Retorna ``None`` se o estado não existir na página. As entradas já trazem
+    a data resolvida no fuso de Brasília, no mesmo formato de ``extract_listing``.
+    """
+    tree = lxml_html.fromstring(page_html)
+    scripts = tree.xpath('//script[@id="__NEXT_DATA__"]/text()')
+    if not scripts:
+        return None
+
+    try:
+        page_props = json.loads(scripts[0])['props']['pageProps']
+    except (ValueError, KeyError) as e:
+        logger.warning(f"Estado __NEXT_DATA__ inválido: {e}")
+        return None
+
+    if 'matches' not in page_props:
+        return None
+
+    entries = []
+    for match in page_props['matches'] or []:
+        try:
+            start = datetime.fromtimestamp(match['matchDate'], tz=timezone.utc).astimezone(DRAFT5_TIMEZONE)
+            best_of = match.get('bestOf')
+            entries.append({
+                'kind': 'match',
+                'date': start.replace(hour=0, minute=0, tzinfo=None),
+                'teams': [match['teamA']['teamName'], match['teamB']['teamName']],
+                'team_ids': [match['teamA'].get('teamId'), match['teamB'].get('teamId')],
+                'time': "TBA" if match.get('isTBA') else start.strftime("%H:%M"),
+                'format': f"MD{best_of}" if best_of else "",
+                'event': match['tournament']['tournamentName'],
+                'href': _match_href(match),
+            })
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Partida inválida no __NEXT_DATA__: {e}")
+
+    return entries
+
+
+def extract_team(page_html):
+    """Id e nome, como exibido no site, do time dono da página (``{'id', 'name'}``).
+
+    Lidos do ``__NEXT_DATA__``; retorna ``None`` se a página não os trouxer.
+    """
+    state = NEXT_DATA_RE.search(page_html)
+    if not state:
+        return None
+    try:
+        team = json.loads(state.group(1))['props']['pageProps']['data']
+        return {'id': team['teamId'], 'name': team['teamName']}
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Time da página não encontrado no __NEXT_DATA__: {e}")
+        return None
+
+
+def start_timestamp(date_str, time_str):
+    """Início da partida (data e hora de Brasília) como timestamp UTC, ou None se TBA"""
+    try:
+        start = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+    except (TypeError, ValueError):
+        return None
+    return int(start.replace(tzinfo=DRAFT5_TIMEZONE).timestamp())
+
+
+def listing_content(page_html):
+    """Só o que importa para as partidas: cartões e datas da listagem ou, sem
+    eles, as partidas do ``__NEXT_DATA__`` (sem notícias, resultados etc.).
+
+    Segue a mesma ordem de preferência da coleta e usa regex em vez de montar
+    a árvore, saindo bem mais barato que o parsing. Retorna os trechos em ordem.
+    """
+    # A listagem vem antes do estado embutido, que é a maior parte da página
+    state_at = page_html.find('<script id="__NEXT_DATA__"')
+    end = state_at if state_at >= 0 else len(page_html)
+    regions = [region.group(0) for region in LISTING_REGION_RE.finditer(page_html, 0, end)]
+    if regions or state_at < 0:
+        return regions
+
+    state = NEXT_DATA_RE.match(page_html, state_at)
+    if not state:
+        return []
+    try:
+        matches = json.loads(state.group(1))['props']['pageProps'].get('matches')
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return [state.group(1)]
+    return [json.dumps(matches, sort_keys=True, ensure_ascii=False)]
+
+
+def content_fingerprint(parts, day):
+    """Hash dos trechos da listagem no dia ``day``.
+
+    O dia entra no hash porque "HOJE" e "AMANHÃ" mudam de sentido na virada
+    do dia mesmo com a página idêntica.
+    """
+    digest = hashlib.blake2b(day.encode(), digest_size=16)
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
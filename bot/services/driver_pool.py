@@ -0,0 +1,173 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+MEMINFO_PATH = "/proc/meminfo"
+
+
+def available_memory_mb():
+    """Memória disponível no host (MemAvailable), ou ``None`` se indisponível"""
+    try:
+        with open(MEMINFO_PATH) as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "created_at", "last_used", "uses")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = self.last_used = time.monotonic()
+        self.uses = 0
+
+
+class DriverPool:
+    """Pool de navegadores aquecidos reutilizados entre scrapings.
+
+    Cada navegador é descartado após ``max_uses`` usos ou ``max_age`` segundos,
+    quando falha na verificação de vida, ou quando a memória livre do host
+    fica abaixo de ``min_free_mb`` ao ser devolvido ao pool.
+
+    Entre scrapings (que podem ficar horas sem acontecer), uma thread verifica
+    os ociosos a cada ``reap_interval`` segundos: encerra os vencidos, os
+    parados há mais de ``idle_timeout`` (sobras de um pico de scraping em
+    paralelo) e, com pouca memória livre, todos eles.
+    """
+
+    def __init__(self, factory, max_size=None, max_uses=20, max_age=1800,
+                 memory_per_driver_mb=350, min_free_mb=200, idle_timeout=600, reap_interval=60):
+        self.factory = factory
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.memory_per_driver_mb = memory_per_driver_mb
+        self.min_free_mb = min_free_mb
+        self.idle_timeout = idle_timeout
+        self.reap_interval = reap_interval
+        self.max_size = max_size or self._size_from_memory()
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._closed = threading.Event()
+        self._reaper = None
+        logger.info(f"Pool de navegadores com até {self.max_size} instância(s)")
+
+    def _size_from_memory(self, limit=3):
+        available = available_memory_mb()
+        if available is None:
+            return 1
+        return max(1, min(limit, available // self.memory_per_driver_mb))
+
+    def _is_expired(self, pooled):
+        return (
+            pooled.uses >= self.max_uses
+            or (time.monotonic() - pooled.created_at) >= self.max_age
+        )
+
+    def _is_alive(self, pooled):
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            logger.warning(f"Navegador do pool não respondeu: {e}")
+            return False
+
+    def _discard(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Erro ao encerrar navegador: {e}")
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                logger.info("Iniciando novo navegador para o pool")
+                return _PooledDriver(self.factory())
+            if not self._is_expired(pooled) and self._is_alive(pooled):
+                return pooled
+            self._discard(pooled)
+
+    def _checkin(self, pooled):
+        free = available_memory_mb()
+        if self._is_expired(pooled):
+            logger.info(f"Reciclando navegador após {pooled.uses} usos")
+            self._discard(pooled)
+        elif free is not None and free < self.min_free_mb:
+            logger.info(f"Pouca memória livre ({free} MB). Encerrando navegador ocioso")
+            self._discard(pooled)
+        else:
+            pooled.last_used = time.monotonic()
+            with self._lock:
+                self._idle.append(pooled)
+            self._start_reaper()
+
+    def reap(self):
+        """Encerra os navegadores ociosos que não devem mais ser reutilizados; retorna quantos"""
+        free = available_memory_mb()
+        low_memory = free is not None and free < self.min_free_mb
+        now = time.monotonic()
+        with self._lock:
+            if low_memory:
+                reaped, self._idle = self._idle, []
+            else:
+                reaped = [
+                    p for p in self._idle
+                    if self._is_expired(p) or now - p.last_used >= self.idle_timeout
+                ]
+                self._idle = [p for p in self._idle if p not in reaped]
+
+        if reaped:
+            reason = f"pouca memória livre ({free} MB)" if low_memory else "vencidos ou ociosos"
+            logger.info(f"Encerrando {len(reaped)} navegador(es) do pool: {reason}")
+        for pooled in reaped:
+            self._discard(pooled)
+        return len(reaped)
+
+    def _start_reaper(self):
+        with self._lock:
+            if self._reaper is not None or not self.reap_interval or self._closed.is_set():
+                return
+            self._reaper = threading.Thread(
+                target=self._reap_loop, name="driver-pool-reaper", daemon=True
+            )
+        self._reaper.start()
+
+    def _reap_loop(self):
+        while not self._closed.wait(self.reap_interval):
+            try:
+                self.reap()
+            except Exception as e:
+                logger.error(f"Erro ao limpar o pool de navegadores: {e}")
+
+    @contextmanager
+    def driver(self):
+        """Empresta um navegador do pool, devolvendo-o ao final do uso"""
+        self._slots.acquire()
+        try:
+            pooled = self._checkout()
+            pooled.uses += 1
+            try:
+                yield pooled.driver
+            except Exception:
+                # Um erro durante o scraping pode deixar o navegador inconsistente
+                self._discard(pooled)
+                raise
+            self._checkin(pooled)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        self._closed.set()
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._discard(pooled)
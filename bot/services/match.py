@@ -0,0 +1,113 @@
+import json
+import re
+import sys
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from operator import attrgetter
+
+from bot.services.draft5_parser import DRAFT5_TIMEZONE, start_timestamp
+from bot.services.snapshot_diff import match_id
+
+TBA = "TBA"
+TIME_RE = re.compile(r'^(\d{1,2}):(\d{2})$')
+
+
+class InvalidMatch(ValueError):
+    """Partida coletada que não passa na validação"""
+
+
+@dataclass(frozen=True, slots=True)
+class Match:
+    """Partida validada, como sai do scraper.
+
+    ``date`` e ``time`` ficam no horário de Brasília, como exibidos no site;
+    ``start_ts`` é o início em UTC (None quando o horário é TBA). Time,
+    evento e formato se repetem entre partidas e são internados.
+    """
+
+    id: str
+    team: str
+    opponent: str
+    event: str
+    format: str
+    link: str
+    date: str
+    time: str
+    start_ts: int = None
+
+    @classmethod
+    def create(cls, team, opponent, date, time, format="", event="", link=""):
+        """Valida os campos coletados e calcula id e início; levanta ``InvalidMatch``"""
+        opponent = (opponent or "").strip()
+        if len(opponent) < 2 or opponent.lower() == team.lower():
+            raise InvalidMatch(f"Adversário inválido: {opponent!r}")
+        try:
+            datetime.strptime(date, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            raise InvalidMatch(f"Data inválida: {date!r}") from None
+
+        found = TIME_RE.match(time or "")
+        if found:
+            time = f"{int(found.group(1)):02d}:{found.group(2)}"
+        elif time != TBA:
+            raise InvalidMatch(f"Horário inválido: {time!r}")
+
+        return cls(
+            id=match_id({'opponent': opponent, 'date': date, 'link': link}),
+            team=sys.intern(team),
+            opponent=opponent,
+            event=sys.intern(event or ""),
+            format=sys.intern(format or ""),
+            link=link or "",
+            date=date,
+            time=time,
+            start_ts=start_timestamp(date, time),
+        )
+
+    @property
+    def start(self):
+        """Início em UTC, ou None se o horário ainda não foi definido"""
+        if self.start_ts is None:
+            return None
+        return datetime.fromtimestamp(self.start_ts, tz=timezone.utc)
+
+    @property
+    def local_start(self):
+        """Início no horário de Brasília"""
+        start = self.start
+        return start.astimezone(DRAFT5_TIMEZONE) if start else None
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstrói uma partida já validada (ex.: lida do storage)"""
+        return cls(**{name: data.get(name) for name in FIELDS})
+
+    def __reduce__(self):
+        # Pickle compacto: só a tupla de valores, sem o __dict__ de cada campo
+        return (_from_values, _VALUES(self))
+
+
+FIELDS = tuple(f.name for f in fields(Match))
+_VALUES = attrgetter(*FIELDS)
+
+
+def _from_values(*values):
+    return Match(*values)
+
+
+def encode_matches(matches):
+    """Serializa partidas como JSON compacto (uma lista de valores por partida)"""
+    return json.dumps(
+        [_VALUES(m) for m in matches], separators=(',', ':'), ensure_ascii=False
+    ).encode()
+
+
+def decode_matches(data):
+    """Inverso de ``encode_matches``; não repete a validação"""
+    return [
+        Match(id_, sys.intern(team), opponent, sys.intern(event), sys.intern(format_), *rest)
+        for id_, team, opponent, event, format_, *rest in json.loads(data)
+    ]
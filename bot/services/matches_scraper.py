@@ -1,23 +1,185 @@
+import contextvars
 import logging
+import os
 import re
+import threading
 import time
-from datetime import datetime, timedelta 
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta 
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+import requests
+from requests.adapters import HTTPAdapter
+
+from bot.services.draft5_parser import (
+    content_fingerprint, extract_listing, extract_next_data, extract_team, listing_content
+)
+from bot.services.driver_pool import DriverPool
+from bot.services.match import InvalidMatch, Match
+from bot.services.tracing import tracer
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+TEAM_URL = "https://draft5.gg/equipe/{slug}/proximas-partidas"
+DEFAULT_TEAMS = "330-FURIA"
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Modos de coleta: "auto" tenta HTTP + lxml e cai para o Selenium se falhar
+FETCH_MODES = ("auto", "http", "selenium")
+
+# Extrai datas e partidas em uma única ida ao navegador, no mesmo formato do draft5_parser
+EXTRACT_LISTING_SCRIPT = """
+function text(root, selector) {
+    var el = root.querySelector(selector);
+    return el ? el.innerText.trim() : '';
+}
+var dateSelector = 'p[class*="MatchList__MatchListDate"]';
+var cardSelector = 'a[class*="MatchCardSimple__MatchContainer"]';
+return Array.from(document.querySelectorAll(dateSelector + ', ' + cardSelector)).map(function (el) {
+    if (el.matches(dateSelector)) {
+        return {kind: 'date', text: el.innerText.trim()};
+    }
+    return {
+        kind: 'match',
+        teams: Array.from(el.querySelectorAll('div[class*="TeamNameAndLogo"] span'))
+            .map(function (span) { return span.innerText.trim(); })
+            .filter(function (name) { return name; }),
+        time: text(el, 'small[class*="MatchTime"]'),
+        format: text(el, 'div[class*="Badge"]'),
+        event: text(el, 'div[class*="Tournament"]'),
+        href: el.href
+    };
+});
+"""
+
+# Marcação das datas e partidas renderizadas, para a impressão digital da página
+LISTING_CONTENT_SCRIPT = """
+return Array.from(document.querySelectorAll(
+    'p[class*="MatchList__MatchListDate"], a[class*="MatchCardSimple__MatchContainer"]'
+)).map(function (el) { return el.outerHTML; });
+"""
+
+# Id e nome do time dono da página, como exibidos no site
+TEAM_INFO_SCRIPT = """
+try {
+    var team = JSON.parse(document.getElementById('__NEXT_DATA__').textContent).props.pageProps.data;
+    return {id: team.teamId, name: team.teamName};
+} catch (e) { return null; }
+"""
+
+# Página pronta: listagem renderizada, ou carregamento completo sem partidas no estado
+PAGE_READY_SCRIPT = """
+if (document.querySelector(
+    'p[class*="MatchList__MatchListDate"], a[class*="MatchCardSimple__MatchContainer"]'
+)) { return 'listing'; }
+if (document.readyState !== 'complete') { return null; }
+try {
+    var state = JSON.parse(document.getElementById('__NEXT_DATA__').textContent);
+    if (state.props.pageProps.matches.length === 0) { return 'empty'; }
+} catch (e) {}
+return null;
+"""
+
+
+@dataclass(frozen=True)
+class TeamPage:
+    """Página de próximas partidas de um time no draft5 (ex.: ``330-FURIA``)"""
+
+    slug: str
+    ttl: int = None  # Sem TTL próprio, vale o ``cache_ttl`` do scraper
+    display_name: str = None  # Nome como o draft5 exibe, se diferir do slug
+
+    @property
+    def name(self):
+        # "330-FURIA" -> "FURIA", "11896-FURIA-Academy" -> "FURIA Academy"
+        return self.display_name or self.slug.split("-", 1)[-1].replace("-", " ")
+
+    @property
+    def id(self):
+        """Id do time no draft5 (o número no início do slug), ou None"""
+        prefix = self.slug.split("-", 1)[0]
+        return int(prefix) if prefix.isdigit() else None
+
+    @property
+    def url(self):
+        return TEAM_URL.format(slug=self.slug)
+
+
+def parse_teams(spec):
+    """Lê a lista de times no formato ``slug[:ttl][=nome],...``"""
+    teams = []
+    for item in spec.split(","):
+        page, _, display_name = item.partition("=")
+        slug, _, ttl = page.strip().partition(":")
+        if slug:
+            teams.append(TeamPage(slug, int(ttl) if ttl else None, display_name.strip() or None))
+    if not teams:
+        raise ValueError(f"Nenhum time configurado: {spec!r}")
+    return teams
+
+
+def _normalize_name(name):
+    """Nome comparável: sem acentos, caixa ou espaços extras"""
+    decomposed = unicodedata.normalize("NFKD", name)
+    return " ".join("".join(c for c in decomposed if not unicodedata.combining(c)).casefold().split())
+
 
 class MatchesScraper:
-    def __init__(self):
-        self.chrome_options = Options()
-        self._setup_chrome_options()
+    """Coleta as próximas partidas de um ou mais times do draft5.
+
+    Cada time tem sua entrada no cache e seu TTL; só os times vencidos são
+    atualizados, em paralelo, até ``max_parallel`` de cada vez. As threads
+    dividem a mesma sessão HTTP e o mesmo pool de navegadores. O resultado é
+    um único snapshot, sem repetir partidas entre dois times acompanhados
+    (vale a versão do primeiro time da lista).
+    """
+
+    def __init__(self, fetch_mode=None, teams=None, max_parallel=None):
+        self._chrome_options = None
         self.cache_ttl = 3600  # 1 hora
+        self.teams = list(teams or parse_teams(os.getenv("SCRAPER_TEAMS", DEFAULT_TEAMS)))
+        self.max_parallel = max_parallel or int(os.getenv("SCRAPER_MAX_PARALLEL", "3"))
+        # slug -> {'matches', 'updated', 'source', 'fingerprint', 'day', 'validators'}
+        self._team_cache = {}
+        self._site_names = {}  # slug -> nome do time como exibido pelo draft5
         self.last_update = 0
         self.cached_matches = []
+        self.last_changed = False  # Se o último get_furia_matches trouxe partidas diferentes
+        self.fetch_mode = fetch_mode or os.getenv("SCRAPER_FETCH_MODE", "auto")
+        if self.fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Modo de coleta inválido: {self.fetch_mode}")
+        self.http_timeout = 10
+        self.page_timeout = 15  # Espera máxima pela renderização da listagem
+        # Intervalo mínimo entre scrapings, mesmo com force_update=True
+        self.min_force_interval = int(os.getenv("SCRAPER_MIN_FORCE_INTERVAL", "60"))
+        self.driver_pool = DriverPool(
+            self._get_driver,
+            max_size=int(os.getenv("SCRAPER_POOL_SIZE", "0")) or None,
+        )
+        # Sessão compartilhada: no máximo ``max_parallel`` conexões abertas com o draft5
+        self.http = requests.Session()
+        self.http.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.max_parallel))
+        self.last_source = None  # "http", "next_data" ou "selenium" (separados por vírgula)
+        # Métricas do último scraping; chaves ``<fase>_seconds`` guardam a duração de cada fase
+        # e ``teams`` as fases de cada time atualizado
+        self.last_stats = {}
+        self._local = threading.local()
+
+    @property
+    def chrome_options(self):
+        # O Selenium só é importado quando um navegador é realmente necessário
+        if self._chrome_options is None:
+            from selenium.webdriver.chrome.options import Options
+
+            self._chrome_options = Options()
+            self._setup_chrome_options()
+        return self._chrome_options
 
     def _setup_chrome_options(self):
         self.chrome_options.add_argument("--headless=new")
@@ -25,49 +187,292 @@ class MatchesScraper:
         self.chrome_options.add_argument("--window-size=1920x1080")
         self.chrome_options.add_argument("--disable-dev-shm-usage")
         self.chrome_options.add_argument("--no-sandbox")
-        self.chrome_options.add_argument(
-            "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
+        self.chrome_options.add_argument(f"user-agent={USER_AGENT}")
     
 
-    def _is_cache_valid(self):
-        return (time.time() - self.last_update) < self.cache_ttl
+    @property
+    def _stats(self):
+        """Métricas do time sendo atualizado nesta thread (ou ``last_stats`` fora delas)"""
+        return getattr(self._local, 'stats', self.last_stats)
+
+    @property
+    def _page(self):
+        """Impressão digital e validadores HTTP da página baixada nesta thread"""
+        return getattr(self._local, 'page', {})
+
+    @contextmanager
+    def _phase(self, name):
+        """Registra a duração da fase em ``<stats>['<name>_seconds']`` e em um span"""
+        started = time.perf_counter()
+        try:
+            with tracer.span(f"scraper.{name}"):
+                yield
+        finally:
+            self._stats[f'{name}_seconds'] = round(time.perf_counter() - started, 4)
+
+    def _team_name(self, team):
+        """Nome gravado nas partidas: o configurado, o do site ou o do slug"""
+        return team.display_name or self._site_names.get(team.slug) or team.name
+
+    def _learn_team(self, team, info):
+        """Guarda o nome exibido pelo site, se a página for mesmo do time"""
+        if not info or not info.get('name'):
+            return
+        if team.id is not None and info.get('id') != team.id:
+            logger.warning(f"Página de {team.slug} pertence ao time {info.get('id')}")
+            return
+        self._site_names[team.slug] = info['name']
 
+    def _is_tracked_name(self, team, name):
+        names = {team.display_name, self._site_names.get(team.slug), team.name}
+        return _normalize_name(name) in {_normalize_name(n) for n in names if n}
+
+    def _updated_at(self, team):
+        return self._team_cache.get(team.slug, {}).get('updated', 0)
+
+    def _is_cache_valid(self, team, max_age=None):
+        ttl = team.ttl or self.cache_ttl
+        if max_age is not None:
+            ttl = min(ttl, max_age)
+        return (time.time() - self._updated_at(team)) < ttl
+
+    @tracer.traced("scraper.get_driver")
     def _get_driver(self):
+        from selenium import webdriver
+
         try:
-            return webdriver.Chrome(options=self.chrome_options)
+            driver = webdriver.Chrome(options=self.chrome_options)
+            # O fuso vale para a aba inteira, então basta configurar uma vez por navegador
+            driver.execute_cdp_cmd(
+                "Emulation.setTimezoneOverride",
+                {"timezoneId": "America/Sao_Paulo"}
+            )
+            return driver
         except Exception as e:
             logger.error(f"Erro ao iniciar o driver: {e}")
             raise
 
-    def get_furia_matches(self, force_update=False):
-        if not force_update and self._is_cache_valid() and self.cached_matches:
+    @tracer.traced("scraper.get_furia_matches")
+    def get_furia_matches(self, force_update=False, max_age=None):
+        """Partidas de todos os times acompanhados, atualizando os que venceram.
+
+        Um time vence pelo próprio TTL ou, com ``max_age`` (segundos), quando
+        o cache dele é mais velho que isso. Levanta ``RuntimeError`` se uma
+        atualização forçada falhar em todos os times; sem forçar, devolve o cache.
+        """
+        self.last_changed = False
+        if force_update:
+            now = time.time()
+            due = [t for t in self.teams if now - self._updated_at(t) >= self.min_force_interval]
+            if not due:
+                logger.info("Atualização forçada ignorada: scraping concluído há pouco")
+                return self.cached_matches
+        else:
+            due = [t for t in self.teams if not self._is_cache_valid(t, max_age)]
+            if not due:
+                if self.cached_matches:
+                    return self.cached_matches
+                due = list(self.teams)
+
+        self.last_stats = {'teams': {}}
+        with self._phase('total'):
+            refreshed = self._refresh_teams(due)
+
+        if not refreshed:
+            if force_update:
+                raise RuntimeError("Scraping falhou em todos os times")
             return self.cached_matches
 
-        driver = None
+        # Páginas com a mesma impressão digital devolvem as mesmas partidas
+        self.last_changed = any(
+            self.last_stats['teams'][t.slug]['fingerprint'] == "changed" for t in refreshed
+        )
+        if self.last_changed:
+            self.cached_matches = self._merge()
+        self.last_update = max(self._updated_at(t) for t in self.teams)
+        self.last_source = ",".join(sorted({
+            self._team_cache[t.slug]['source'] or "?" for t in refreshed
+        }))
+        logger.info(
+            f"{len(self.cached_matches)} partidas de {len(self.teams)} time(s); "
+            f"{len(refreshed)} atualizado(s) via {self.last_source}"
+            f"{'' if self.last_changed else ', sem mudanças'}"
+        )
+        return self.cached_matches
+
+    def _refresh_teams(self, teams):
+        """Atualiza os times em paralelo; retorna os que deram certo"""
+        workers = min(self.max_parallel, len(teams))
+        if workers <= 1:
+            results = [self._refresh_team(team) for team in teams]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as pool:
+                # Cada thread roda numa cópia do contexto, sob o span atual
+                futures = [
+                    pool.submit(contextvars.copy_context().run, self._refresh_team, team)
+                    for team in teams
+                ]
+                results = [future.result() for future in futures]
+        return [team for team, ok in zip(teams, results) if ok]
+
+    def _refresh_team(self, team):
+        with tracer.span("scraper.team", team=team.slug) as span:
+            ok = self._refresh_team_cache(team)
+            stats = self.last_stats['teams'][team.slug]
+            span.set(ok=ok, source=stats.get('source'), fingerprint=stats.get('fingerprint'))
+            return ok
+
+    def _refresh_team_cache(self, team):
+        stats = self._local.stats = {}
+        page = self._local.page = {}
         try:
-            driver = self._get_driver()
-            driver.execute_cdp_cmd(
-                "Emulation.setTimezoneOverride",
-                {"timezoneId": "America/Sao_Paulo"}
-            )
-            matches = self._scrape_matches(driver)
-            self.cached_matches = matches
-            self.last_update = time.time()
-            return matches
+            matches = self._fetch_matches(team)
+            stats.setdefault('fingerprint', "changed")
+            # A impressão digital só é gravada junto com as partidas que ela descreve
+            self._team_cache[team.slug] = {
+                'matches': matches,
+                'updated': time.time(),
+                'source': stats.get('source'),
+                'fingerprint': page.get('fingerprint'),
+                'day': page.get('day'),
+                'validators': page.get('validators'),
+            }
+            return True
         except Exception as e:
-            logger.error(f"Erro no scraping: {e}")
-            return self.cached_matches if not force_update else []
+            # O time mantém a entrada anterior no cache até o próximo scraping
+            logger.error(f"Erro no scraping de {team.slug}: {e}")
+            return False
         finally:
-            if driver:
-                driver.quit()
+            self.last_stats['teams'][team.slug] = stats
+            del self._local.stats
+            del self._local.page
+
+    def _reuse_if_unchanged(self, team, parts):
+        """Registra a impressão digital dos trechos da listagem.
+
+        Se ela for igual à do último scraping do time, devolve as partidas já
+        extraídas (sem parsing nem validação); senão, ``None``.
+        """
+        day = date.today().isoformat()
+        fingerprint = content_fingerprint(parts, day)
+        self._page.update(fingerprint=fingerprint, day=day)
+
+        entry = self._team_cache.get(team.slug)
+        if entry and entry['fingerprint'] == fingerprint:
+            self._stats['fingerprint'] = "unchanged"
+            self._stats['source'] = entry['source']
+            return entry['matches']
+        return None
+
+    def _merge(self):
+        """Junta as partidas dos times, sem repetir confrontos entre times acompanhados"""
+        merged, seen = [], set()
+        for team in self.teams:
+            for match in self._team_cache.get(team.slug, {}).get('matches', []):
+                if match.id not in seen:
+                    seen.add(match.id)
+                    merged.append(match)
+        # Ordenação estável: com um único time, preserva a ordem da página
+        merged.sort(key=lambda m: (m.date, m.start_ts is None, m.start_ts or 0))
+        return merged
+
+    def _fetch_matches(self, team=None):
+        """Escolhe o caminho de coleta conforme o modo configurado"""
+        team = team or self.teams[0]
+        if self.fetch_mode in ("auto", "http"):
+            try:
+                matches = self._fetch_via_http(team)
+                if matches is not None:
+                    return matches
+                logger.warning("Listagem não reconhecida na resposta HTTP")
+            except Exception as e:
+                logger.warning(f"Falha na coleta via HTTP: {e}")
+
+            if self.fetch_mode == "http":
+                raise RuntimeError("Coleta via HTTP falhou e o fallback está desativado")
+            logger.info("Usando o Selenium como fallback")
+
+        matches = self._fetch_via_selenium(team)
+        self._stats['source'] = "selenium"
+        return matches
+
+    def _http_get(self, url, validators=None):
+        """Baixa a página; retorna ``(html, validadores)``, com html ``None`` se não mudou (304)"""
+        headers = {"User-Agent": USER_AGENT, "Accept-Language": "pt-BR,pt;q=0.9"}
+        if validators and validators.get('etag'):
+            headers["If-None-Match"] = validators['etag']
+        if validators and validators.get('last_modified'):
+            headers["If-Modified-Since"] = validators['last_modified']
+
+        response = self.http.get(url, headers=headers, timeout=self.http_timeout)
+        if response.status_code == 304:
+            return None, validators
+        response.raise_for_status()
+        return response.text, {
+            'etag': response.headers.get("ETag"),
+            'last_modified': response.headers.get("Last-Modified"),
+        }
+
+    def _fetch_via_http(self, team=None):
+        """Baixa a página sem navegador e extrai as partidas com lxml.
+
+        Retorna ``None`` quando nem a listagem renderizada nem o estado
+        embutido da página puderem ser lidos.
+        """
+        team = team or self.teams[0]
+        entry = self._team_cache.get(team.slug)
+        # Validadores só valem no mesmo dia: "HOJE"/"AMANHÃ" mudam de sentido na virada
+        validators = entry['validators'] if entry and entry['day'] == date.today().isoformat() else None
+        with self._phase('http'):
+            page_html, validators = self._http_get(team.url, validators)
+        self._page['validators'] = validators
+
+        if page_html is None:
+            self._stats['fingerprint'] = "not_modified"
+            self._stats['source'] = entry['source']
+            self._page.update(fingerprint=entry['fingerprint'], day=entry['day'])
+            return entry['matches']
+
+        with self._phase('fingerprint'):
+            matches = self._reuse_if_unchanged(team, listing_content(page_html))
+        if matches is not None:
+            return matches
+
+        with self._phase('parse'):
+            if team.slug not in self._site_names:
+                self._learn_team(team, extract_team(page_html))
+            entries = extract_listing(page_html)
+            if entries:
+                matches = self._matches_from_entries(entries, team)
+                if matches:
+                    self._stats['source'] = "http"
+                    return matches
+
+            entries = extract_next_data(page_html)
+            if entries is not None:
+                self._stats['source'] = "next_data"
+                return self._matches_from_entries(entries, team)
+
+        return None
+
+    def _fetch_via_selenium(self, team=None):
+        # O pool limita quantos navegadores existem; threads excedentes aguardam um livre
+        with ExitStack() as stack:
+            with self._phase('driver'):
+                driver = stack.enter_context(self.driver_pool.driver())
+            return self._scrape_matches(driver, team)
+
+    def close(self):
+        """Encerra os navegadores mantidos no pool e a sessão HTTP"""
+        self.driver_pool.close()
+        self.http.close()
 
     def _parse_br_date(self, date_text):
         """Converte texto de data em português para objeto datetime"""
         try:
             # Remover emojis e espaços extras
-            clean_date = re.sub(r'[^\w\s,-]', '', date_text).strip()
+            # O site exibe a data em maiúsculas via CSS; o HTML bruto vem em minúsculas
+            clean_date = re.sub(r'[^\w\s,-]', '', date_text).strip().upper()
             
             # Verificar se é uma data relativa (AMANHÃ, HOJE)
             today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -106,157 +511,152 @@ class MatchesScraper:
             logger.warning(f"Erro ao analisar data '{date_text}': {e}")
             return None
 
-    def _scrape_matches(self, driver):
-        driver.get("https://draft5.gg/equipe/330-FURIA/proximas-partidas")
-        time.sleep(5)
+    def _wait_for_page(self, driver):
+        """Aguarda a listagem ficar pronta, até no máximo ``page_timeout`` segundos"""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        started = time.monotonic()
+        with tracer.span("scraper.wait") as span:
+            try:
+                state = WebDriverWait(driver, self.page_timeout, poll_frequency=0.2).until(
+                    lambda d: d.execute_script(PAGE_READY_SCRIPT)
+                )
+            except TimeoutException:
+                state = "timeout"
+                logger.warning(f"Listagem não ficou pronta em {self.page_timeout}s")
+            span.set(ready_state=state)
+
+        waited = time.monotonic() - started
+        self._stats['wait_seconds'] = round(waited, 3)
+        self._stats['ready_state'] = state
+        if state == "timeout":
+            # Sem a listagem, o time mantém as partidas do último scraping
+            raise RuntimeError(f"Listagem não ficou pronta em {self.page_timeout}s")
+        logger.info(f"Página pronta ({state}) após {waited:.2f}s de espera")
+
+    @tracer.traced("scraper.scrape_matches")
+    def _scrape_matches(self, driver, team=None):
+        team = team or self.teams[0]
+        with self._phase('load'):
+            driver.get(team.url)
+        self._wait_for_page(driver)
+
+        with self._phase('fingerprint'):
+            regions = driver.execute_script(LISTING_CONTENT_SCRIPT) or []
+            matches = self._reuse_if_unchanged(team, regions)
+        if matches is not None:
+            logger.info("Listagem sem mudanças desde o último scraping")
+            return matches
 
         logger.info("Página carregada. Buscando partidas e suas datas...")
-        
-        # Obter todas as partidas
-        match_containers = driver.find_elements(
-            By.CSS_SELECTOR, 'a[class*="MatchCardSimple__MatchContainer"]'
-        )
-        
-        logger.info(f"Encontrados {len(match_containers)} containers de partidas")
-        
-        # Obter todas as datas
-        date_elements = driver.find_elements(
-            By.CSS_SELECTOR, 'p[class*="MatchList__MatchListDate"]'
-        )
-        
-        logger.info(f"Encontrados {len(date_elements)} elementos de data")
-        
-        # Processar partidas e associar às datas corretas
+        if team.slug not in self._site_names:
+            self._learn_team(team, driver.execute_script(TEAM_INFO_SCRIPT))
+
+        # Uma única chamada ao chromedriver devolve datas e partidas na ordem da página
+        with self._phase('extract'):
+            entries = driver.execute_script(EXTRACT_LISTING_SCRIPT) or []
+        logger.info(f"Encontrados {len(entries)} elementos totais (datas + partidas)")
+
+        with self._phase('parse'):
+            matches = self._matches_from_entries(entries, team)
+
+            # Se não encontramos partidas com o método acima, tentamos uma abordagem alternativa
+            if not matches:
+                logger.warning("Método de data + partida falhou. Tentando método alternativo...")
+                matches = self._scrape_matches_alternative(entries, team)
+
+        # Lista vazia só vale se a própria página indicou que não há partidas
+        if not matches and self._stats.get('ready_state') != "empty":
+            raise RuntimeError("Nenhuma partida extraída da listagem carregada")
+        return matches
+
+    def _scrape_matches_alternative(self, entries, team=None):
+        """Método alternativo: usa a última data válida antes de cada partida"""
         matches = []
         current_date = None
-        
-        # Para cada elemento na página (na ordem em que aparecem)
-        all_elements = driver.find_elements(
-            By.XPATH, '//*[contains(@class, "MatchList__MatchListDate") or contains(@class, "MatchCardSimple__MatchContainer")]'
-        )
-        
-        logger.info(f"Encontrados {len(all_elements)} elementos totais (datas + partidas)")
-        
-        for element in all_elements:
+
+        for idx, entry in enumerate(entries, start=1):
             try:
-                # Verifica se o elemento é uma data
-                if "MatchList__MatchListDate" in element.get_attribute("class"):
-                    date_text = element.text.strip()
-                    logger.info(f"Encontrado elemento de data: {date_text}")
-                    current_date = self._parse_br_date(date_text)
-                    if not current_date:
-                        logger.warning(f"Não foi possível interpretar a data: {date_text}")
-                
-                # Verifica se o elemento é uma partida
-                elif "MatchCardSimple__MatchContainer" in element.get_attribute("class") and current_date:
-                    logger.info(f"Processando partida com data {current_date}")
-                    match_info = self._process_match(element, current_date)
-                    if match_info:
-                        matches.append(match_info)
+                if entry['kind'] == 'date':
+                    current_date = self._parse_br_date(entry['text']) or current_date
+                    continue
+
+                date = current_date
+                if not date:
+                    logger.warning(f"Não foi possível determinar a data para partida {idx}")
+                    date = datetime.now()  # Fallback para data atual
+                matches.append(self._build_match(entry, date, team))
+            except InvalidMatch as e:
+                logger.warning(f"Partida {idx} descartada: {e}")
             except Exception as e:
-                logger.error(f"Erro ao processar elemento: {e}")
-        
-        # Se não encontramos partidas com o método acima, tentamos uma abordagem alternativa
-        if not matches:
-            logger.warning("Método de data + partida falhou. Tentando método alternativo...")
-            matches = self._scrape_matches_alternative(driver, match_containers)
-        
+                logger.error(f"Erro ao processar partida {idx}: {e}")
+
         return matches
 
-    def _scrape_matches_alternative(self, driver, containers):
-        """Método alternativo para extrair partidas e suas datas"""
+    def _matches_from_entries(self, entries, team=None):
+        """Converte as entradas extraídas da página (datas + partidas) em partidas"""
         matches = []
-        
-        for idx, container in enumerate(containers, start=1):
-            try:
-                # Para cada partida, procuramos a data mais próxima antes dela
-                date_elements = driver.find_elements(
-                    By.XPATH, f'(//a[contains(@class, "MatchCardSimple__MatchContainer")])[{idx}]/preceding::p[contains(@class, "MatchList__MatchListDate")][1]'
-                )
-                
-                current_date = None
-                if date_elements:
-                    date_text = date_elements[0].text.strip()
-                    logger.info(f"Data encontrada antes da partida {idx}: {date_text}")
-                    current_date = self._parse_br_date(date_text)
-                
+        current_date = None
+
+        for entry in entries:
+            if entry['kind'] == 'date':
+                current_date = self._parse_br_date(entry['text'])
                 if not current_date:
-                    logger.warning(f"Não foi possível determinar a data para partida {idx}")
-                    current_date = datetime.now()  # Fallback para data atual
-                
-                match_info = self._process_match(container, current_date)
-                if match_info:
-                    matches.append(match_info)
-                
-            except Exception as e:
-                logger.error(f"Erro ao processar partida {idx}: {e}")
-        
+                    logger.warning(f"Não foi possível interpretar a data: {entry['text']}")
+            elif entry['kind'] == 'match':
+                date = entry.get('date') or current_date
+                if not date:
+                    continue
+                try:
+                    matches.append(self._build_match(entry, date, team))
+                except InvalidMatch as e:
+                    logger.warning(f"Partida descartada: {e}")
+
         return matches
-    
-    def _process_match(self, container, date):
-        """Processa um container de partida e extrai suas informações"""
-        try:
-            # Extrair times
-            teams = container.find_elements(
-                By.CSS_SELECTOR, 'div[class*="TeamNameAndLogo"] span'
+
+    def _build_match(self, entry, date, team=None):
+        """Valida a entrada e monta a ``Match``; levanta ``InvalidMatch`` se não der"""
+        team = team or self.teams[0]
+        team_ids = entry.get('team_ids')
+        if team.id is not None and team_ids and team.id in team_ids:
+            # O estado embutido traz os ids: não depende de como o nome é escrito
+            opponent = next(
+                (name for name, id_ in zip(entry['teams'], team_ids) if id_ != team.id), "Desconhecido"
             )
-            team_names = [t.text.strip() for t in teams if t.text.strip()]
+        else:
             opponent = next(
-                (t for t in team_names if t.lower() != "furia"), "Desconhecido"
+                (name for name in entry['teams'] if not self._is_tracked_name(team, name)),
+                "Desconhecido"
             )
+        return Match.create(
+            team=self._team_name(team),
+            opponent=opponent,
+            date=date.strftime("%Y-%m-%d"),
+            time=self._parse_time_text(entry['time']),
+            format=entry['format'],
+            event=entry['event'],
+            link=entry['href'],
+        )
 
-            # Extrair formato e evento
-            try:
-                format_text = container.find_element(
-                    By.CSS_SELECTOR, 'div[class*="Badge"]'
-                ).text.strip()
-            except:
-                format_text = ""
-            try:
-                event_text = container.find_element(
-                    By.CSS_SELECTOR, 'div[class*="Tournament"]'
-                ).text.strip()
-            except:
-                event_text = ""
-
-            # Extrair hora
-            time_info = self._extract_time(container)
-            logger.info(f"Horário extraído: {time_info}")
-            
-            return {
-                'opponent': opponent,
-                'date': date.strftime("%Y-%m-%d"),
-                'time': time_info,
-                'format': format_text,
-                'event': event_text,
-                'link': container.get_attribute('href')
-            }
-        except Exception as e:
-            logger.error(f"Erro ao processar informações da partida: {e}")
-            return None
-    
-    def _extract_time(self, container):
-        """Extrai apenas o horário da partida exatamente como aparece no site"""
-        try:
-            time_el = container.find_element(
-                By.CSS_SELECTOR, 'small[class*="MatchTime"]'
-            )
-            time_text = time_el.text.strip().upper()
-            
-            if "TBA" in time_text:
-                return "TBA"
-            
-            # Extrair apenas o horário (HH:MM) sem fazer ajustes de fuso
-            time_match = re.search(r'(\d{1,2}:\d{2})', time_text)
-            if not time_match:
-                return "TBA"
-            
-            # Retorna o horário exatamente como está no site
-            return time_match.group(1)
-            
-        except Exception as e:
-            logger.error(f"Erro ao extrair horário: {e}")
+    def _parse_time_text(self, time_text):
+        """Extrai apenas o horário (HH:MM) exatamente como aparece no site"""
+        time_text = time_text.strip().upper()
+        if "TBA" in time_text:
             return "TBA"
 
+        time_match = re.search(r'(\d{1,2}:\d{2})', time_text)
+        return time_match.group(1) if time_match else "TBA"
+
+
+_matches_scraper = None
+
 
-matches_scraper = MatchesScraper()
\ No newline at end of file
+def __getattr__(name):
+    # ``matches_scraper`` é criado no primeiro acesso, não na importação do módulo
+    global _matches_scraper
+    if name == "matches_scraper":
+        if _matches_scraper is None:
+            _matches_scraper = MatchesScraper()
+        return _matches_scraper
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
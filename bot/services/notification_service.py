@@ -1,7 +1,7 @@
 from telegram import Bot
 from datetime import datetime, timedelta
 import logging
-from database.database import DatabaseManager
+from bot.database.database import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
@@ -47,11 +47,10 @@ class NotificationService:
     def cleanup_old_matches(self):
         """Limpa partidas antigas"""
         try:
-            cursor = self.db.conn.cursor()
-            cursor.execute('''
-                DELETE FROM matches 
-                WHERE match_time < datetime('now', '-1 day')
-            ''')
-            self.db.conn.commit()
+            with self.db.transaction() as cursor:
+                cursor.execute('''
+                    DELETE FROM matches 
+                    WHERE match_time < datetime('now', '-1 day')
+                ''')
         except Exception as e:
             logger.error(f"Erro na limpeza de partidas: {e}")
\ No newline at end of file
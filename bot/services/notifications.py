@@ -1,13 +1,136 @@
-import httpx
+import asyncio
+import logging
 import os
 
+import httpx
+
+from bot.services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
 BACKEND_URL = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
 
+BACKEND_REQUESTS = registry.counter(
+    "furia_backend_sync_requests_total", "Requisições de inscrição ao backend", labels=("result",)
+)
+BACKEND_COALESCED = registry.counter(
+    "furia_backend_sync_coalesced_total", "Alterações de inscrição descartadas por uma mais recente"
+)
+
+
+class BackendError(Exception):
+    """Resposta de erro definitiva do backend (não adianta repetir)"""
+
+
+class SubscriptionSync:
+    """Cliente do backend de notificações com conexões reaproveitadas.
+
+    As alterações de inscrição já foram aplicadas no storage local; aqui elas
+    só são enfileiradas e enviadas ao backend em lotes a cada
+    ``flush_interval`` segundos. Dentro de uma janela vale apenas a última
+    alteração de cada usuário. Falhas temporárias (rede, 5xx) são repetidas
+    com backoff; o que continuar falhando volta para o próximo lote.
+    """
+
+    def __init__(self, base_url=BACKEND_URL, flush_interval=2.0, max_retries=3,
+                 backoff=0.5, concurrency=5, transport=None):
+        self.base_url = base_url
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.concurrency = concurrency
+        self.transport = transport
+        self._client = None
+        self._pending = {}  # user_id -> "on"/"off", na ordem da última alteração
+        self._flusher = None
+
+    @property
+    def client(self):
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(5.0, connect=3.0),
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+                transport=self.transport,
+            )
+        return self._client
+
+    def enqueue(self, telegram_id, action):
+        """Agenda a sincronização sem esperar pelo backend"""
+        if self._pending.pop(telegram_id, None) is not None:
+            BACKEND_COALESCED.inc()
+        self._pending[telegram_id] = action
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        """Envia agora o lote pendente"""
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(telegram_id, action):
+            async with semaphore:
+                try:
+                    await self.request(telegram_id, action)
+                except BackendError as e:
+                    logger.error(f"Backend recusou a inscrição de {telegram_id}: {str(e)}")
+                except Exception as e:
+                    logger.warning(f"Sincronização de {telegram_id} adiada: {str(e)}")
+                    # Reenvia no próximo lote, a menos que o usuário já tenha mudado de novo
+                    self._pending.setdefault(telegram_id, action)
+
+        await asyncio.gather(*(send(user_id, action) for user_id, action in batch.items()))
+        logger.info(f"{len(batch)} inscrição(ões) sincronizadas com o backend")
+        if self._pending and (self._flusher is None or self._flusher.done()):
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def request(self, telegram_id, action):
+        """Envia uma alteração ao backend, repetindo falhas temporárias"""
+        path = "/notifications/subscribe" if action == "on" else "/notifications/unsubscribe"
+        payload = {"telegram_id": str(telegram_id)}
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.client.post(path, json=payload)
+                if response.status_code in (200, 201):
+                    BACKEND_REQUESTS.inc(result="ok")
+                    return response.json() if response.content else None
+                if response.status_code < 500 and response.status_code != 429:
+                    BACKEND_REQUESTS.inc(result="rejected")
+                    raise BackendError(f"Erro ao atualizar inscrição: {response.text}")
+                error = Exception(f"Backend respondeu {response.status_code}")
+            except httpx.TransportError as e:
+                error = e
+
+            if attempt < self.max_retries:
+                BACKEND_REQUESTS.inc(result="retry")
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+        BACKEND_REQUESTS.inc(result="failed")
+        raise error
+
+    async def close(self):
+        """Envia o que estiver pendente e fecha as conexões"""
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+        try:
+            await self.flush()
+        finally:
+            if self._client is not None:
+                await self._client.aclose()
+                self._client = None
+
+
+subscription_sync = SubscriptionSync()
+
+
 async def update_subscription(telegram_id: int, action: str):
-    url = f"{BACKEND_URL}/notifications/subscribe" if action == "on" else f"{BACKEND_URL}/notifications/unsubscribe"
-    payload = {"telegram_id": str(telegram_id)}
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload)
-        if response.status_code not in (200, 201):
-            raise Exception(f"Erro ao atualizar inscrição: {response.text}")
-        return response.json()
+    """Atualiza a inscrição no backend imediatamente (usa o cliente compartilhado)"""
+    return await subscription_sync.request(telegram_id, action)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import os
+import time
+
+from bot.services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# (segundos até a próxima partida, intervalo entre atualizações)
+REFRESH_TIERS = (
+    (2 * 3600, 5 * 60),
+    (12 * 3600, 15 * 60),
+    (48 * 3600, 60 * 60),
+)
+
+REFRESH_INTERVAL = registry.gauge(
+    "furia_refresh_interval_seconds", "Intervalo atual entre atualizações do snapshot"
+)
+REFRESH_RUNS = registry.counter(
+    "furia_refresh_runs_total", "Atualizações do snapshot em segundo plano", labels=("result",)
+)
+
+
+class SnapshotRefresher:
+    """Mantém o snapshot de partidas atualizado pela JobQueue.
+
+    O intervalo se adapta à próxima partida: algumas horas quando ela ainda
+    está a dias de distância e poucos minutos nas horas antes do jogo, quando
+    os horários costumam mudar. Os usuários recebem sempre o snapshot salvo;
+    ``revalidate`` só dispara uma atualização em segundo plano se ele venceu.
+
+    ``refresh(job_queue, force_update, max_age)`` faz o scraping e grava o
+    resultado, devolvendo o snapshot com as partidas em ``matches``. As
+    atualizações agendadas passam o intervalo atual como ``max_age``: o
+    scraper só baixa de novo os times com cache mais velho que isso; forçar
+    (ignorar o cache) fica para o ``/matches force``.
+    """
+
+    def __init__(self, refresh, coordinator=None, min_interval=None, max_interval=None):
+        self.refresh = refresh
+        self.coordinator = coordinator
+        self.min_interval = min_interval or int(os.getenv("REFRESH_MIN_INTERVAL", "300"))
+        self.max_interval = max_interval or int(os.getenv("REFRESH_MAX_INTERVAL", "21600"))
+        self.interval = self.min_interval
+        self.last_refresh = None
+        self._task = None
+        self._job = None
+        REFRESH_INTERVAL.set(self.interval)
+
+    def interval_for(self, matches, now=None):
+        """Intervalo até a próxima atualização, conforme a partida mais próxima"""
+        now = now or time.time()
+        upcoming = [m['start_ts'] for m in matches if m.get('start_ts') and m['start_ts'] > now]
+        if not upcoming:
+            return self.max_interval
+
+        until_next = min(upcoming) - now
+        interval = next(
+            (interval for horizon, interval in REFRESH_TIERS if until_next <= horizon),
+            self.max_interval,
+        )
+        return max(self.min_interval, min(interval, self.max_interval))
+
+    @property
+    def in_progress(self):
+        return self._task is not None and not self._task.done()
+
+    @property
+    def is_stale(self):
+        return self.last_refresh is None or time.time() - self.last_refresh >= self.interval
+
+    def start(self, job_queue):
+        """Agenda a primeira atualização para já (ex.: ao assumir a liderança)"""
+        self._schedule(job_queue, 0)
+
+    def stop(self):
+        if self._job:
+            self._job.schedule_removal()
+            self._job = None
+
+    def _schedule(self, job_queue, delay):
+        self.stop()
+        self._job = job_queue.run_once(self._run, when=delay, name="refresh:snapshot")
+
+    async def _run(self, context):
+        self._job = None
+        if self.coordinator and not self.coordinator.is_leader:
+            return  # O novo líder reinicia o agendamento
+        try:
+            await self.refresh_now(context.job_queue, max_age=self.interval)
+        except Exception:
+            pass  # Já registrado em _refresh; a próxima tentativa foi agendada
+
+    async def refresh_now(self, job_queue, force_update=False, max_age=None):
+        """Atualiza agora, ou aguarda a atualização que já estiver em andamento"""
+        if not self.in_progress:
+            self._task = asyncio.ensure_future(self._refresh(job_queue, force_update, max_age))
+        return await asyncio.shield(self._task)
+
+    def revalidate(self, job_queue):
+        """Dispara uma atualização em segundo plano se o snapshot venceu"""
+        if self.is_stale and not self.in_progress:
+            logger.info("Snapshot vencido. Atualizando em segundo plano")
+            self._task = asyncio.ensure_future(self._refresh(job_queue, False, self.interval))
+            self._task.add_done_callback(_consume_exception)
+
+    async def _refresh(self, job_queue, force_update=False, max_age=None):
+        try:
+            snapshot = await self.refresh(job_queue, force_update, max_age)
+            self.last_refresh = time.time()
+            self.interval = self.interval_for(snapshot['matches'])
+            REFRESH_RUNS.inc(result="ok")
+            logger.info(f"Snapshot atualizado; próxima atualização em {self.interval // 60} min")
+            return snapshot
+        except Exception as e:
+            self.interval = self.min_interval
+            REFRESH_RUNS.inc(result="error")
+            logger.error(f"Erro ao atualizar o snapshot: {str(e)}")
+            raise
+        finally:
+            REFRESH_INTERVAL.set(self.interval)
+            self._schedule(job_queue, self.interval)
+
+
+def _consume_exception(task):
+    if not task.cancelled():
+        task.exception()
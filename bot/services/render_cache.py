@@ -0,0 +1,56 @@
+import logging
+import threading
+
+from bot.services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+RENDER_CACHE_REQUESTS = registry.counter(
+    "furia_render_cache_requests_total", "Consultas ao cache de renderização", labels=("result",)
+)
+
+
+class RenderCache:
+    """Cache de mensagens renderizadas, válido para uma versão de snapshot.
+
+    Quando ``get`` recebe uma versão diferente da atual, todas as entradas são
+    descartadas; sem versão, usa a versão corrente.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, build, version=None):
+        with self._lock:
+            if version is not None and version != self.version:
+                logger.info(f"Snapshot versão {version}: descartando {len(self._entries)} renderizações")
+                self._entries.clear()
+                self.version = version
+            if key in self._entries:
+                self.hits += 1
+                RENDER_CACHE_REQUESTS.inc(result="hit")
+                return self._entries[key]
+            self.misses += 1
+            RENDER_CACHE_REQUESTS.inc(result="miss")
+
+        value = build()
+        with self._lock:
+            if version is None or version == self.version:
+                self._entries[key] = value
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+render_cache = RenderCache()
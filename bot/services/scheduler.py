@@ -0,0 +1,149 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Antecedências (em minutos) que o usuário pode escolher
+LEAD_OPTIONS = (5, 15, 30, 60, 1440)
+DEFAULT_LEAD_MINUTES = 60
+
+
+def lead_label(minutes):
+    """Antecedência por extenso (ex.: "15 minutos", "1 hora", "1 dia")"""
+    if minutes % 1440 == 0:
+        days = minutes // 1440
+        return f"{days} dia" if days == 1 else f"{days} dias"
+    if minutes % 60 == 0:
+        hours = minutes // 60
+        return f"{hours} hora" if hours == 1 else f"{hours} horas"
+    return f"{minutes} minutos"
+
+
+def time_left_label(seconds):
+    """Tempo restante por extenso, em minutos (ex.: "2 horas e 55 minutos")"""
+    minutes = max(1, round(seconds / 60))
+    if minutes < 60:
+        return "1 minuto" if minutes == 1 else f"{minutes} minutos"
+    hours, minutes = divmod(minutes, 60)
+    label = lead_label(hours * 60)
+    if minutes:
+        label += " e 1 minuto" if minutes == 1 else f" e {minutes} minutos"
+    return label
+
+
+class NotificationScheduler:
+    """Agenda um job exato na JobQueue por (partida, antecedência).
+
+    Os inscritos são agrupados pela antecedência escolhida: cada par
+    (partida, antecedência) gera um único job, que avisa todo o grupo de uma
+    vez. O trabalho do agendador cresce com o número de antecedências
+    distintas, não com o de usuários.
+
+    ``sync`` cria os jobs de partidas novas, reagenda os de partidas cujo
+    horário mudou e cancela os de partidas que sumiram. Na hora marcada,
+    ``notify(bot, match, lead, chat_ids)`` recebe a partida lida novamente do
+    storage e os inscritos daquela antecedência, e devolve o
+    ``BroadcastReport`` do envio (``None`` se nada foi enviado).
+
+    Com um ``coordinator``, só a réplica líder dispara os jobs. Cada entrega é
+    reservada por (partida, usuário) antes do envio e confirmada depois dele;
+    as que falharam são liberadas e o par só é dado como avisado quando
+    todos receberam, então o próximo ``resync`` tenta de novo só quem faltou.
+    Reservas de um envio interrompido (ex.: líder que caiu no meio) ficam
+    sem confirmação e são retomadas pelo novo líder depois de um tempo.
+    """
+
+    def __init__(self, storage, notify, lead_minutes=(DEFAULT_LEAD_MINUTES,), coordinator=None):
+        self.storage = storage
+        self.notify = notify
+        self.lead_minutes = tuple(lead_minutes)
+        self.coordinator = coordinator
+        self._jobs = {}  # (match_id, lead) -> Job
+
+    def sync(self, job_queue, matches, lead_minutes=None, sent=()):
+        """Ajusta os jobs às partidas; ``sent`` são os pares (partida, antecedência) já avisados"""
+        if lead_minutes is not None:
+            self.lead_minutes = tuple(lead_minutes)
+
+        now = time.time()
+        wanted = {}
+        for match in matches:
+            start_ts = match.get('start_ts')
+            if match.get('notified') or not start_ts or start_ts <= now:
+                continue
+            for lead in self.lead_minutes:
+                if (match['id'], lead) not in sent:
+                    wanted[(match['id'], lead)] = start_ts
+
+        for key, job in list(self._jobs.items()):
+            if wanted.get(key) != job.data['start_ts']:
+                job.schedule_removal()
+                del self._jobs[key]
+
+        for key, start_ts in wanted.items():
+            if key in self._jobs:
+                continue
+            match_id, lead = key
+            # Se a janela de aviso já começou, o job dispara imediatamente
+            delay = max(0.0, start_ts - lead * 60 - now)
+            self._jobs[key] = job_queue.run_once(
+                self._run,
+                when=delay,
+                data={'match_id': match_id, 'lead': lead, 'start_ts': start_ts},
+                name=f"notify:{match_id}:{lead}",
+            )
+
+        logger.info(
+            f"{len(self._jobs)} notificações agendadas para {len(self.lead_minutes)} antecedência(s)"
+        )
+
+    async def resync(self, job_queue):
+        """Relê partidas, antecedências e avisos enviados do storage e reagenda"""
+        self.sync(
+            job_queue,
+            await self.storage.get_matches(),
+            lead_minutes=await self.storage.get_lead_times(),
+            sent=await self.storage.get_sent_notifications(),
+        )
+
+    async def _run(self, context):
+        data = context.job.data
+        self._jobs.pop((data['match_id'], data['lead']), None)
+
+        if self.coordinator and not self.coordinator.is_leader:
+            return
+
+        try:
+            match = await self.storage.get_match(data['match_id'])
+            if not match or match['notified'] or match.get('start_ts') != data['start_ts']:
+                return
+            chat_ids = await self.storage.get_subscribers(data['lead'])
+            if not chat_ids:
+                return
+            chat_ids = await self.storage.claim_deliveries(
+                match['id'], data['lead'], chat_ids,
+                self.coordinator.replica_id if self.coordinator else None
+            )
+            if not chat_ids:
+                # Já entregue, ou em envio por outro job; quem envia marca o par
+                return
+            report = await self.notify(context.bot, match, data['lead'], chat_ids)
+            failed = set(chat_ids) if report is None else set(report.failed)
+            delivered = [chat_id for chat_id in chat_ids if chat_id not in failed]
+            if delivered:
+                await self.storage.confirm_deliveries(match['id'], delivered)
+            if failed:
+                await self.storage.release_deliveries(match['id'], list(failed))
+                logger.warning(
+                    f"Aviso de {match['id']} ({data['lead']} min) não entregue a "
+                    f"{len(failed)} inscrito(s); nova tentativa no próximo refresh"
+                )
+                return
+            # O grupo só é dado como avisado depois de todos receberem
+            await self.storage.claim_notification(match['id'], data['lead'])
+        except Exception as e:
+            logger.error(f"Erro na notificação agendada: {str(e)}")
+
+    async def load(self, job_queue):
+        """Agenda as notificações das partidas já salvas (ex.: na inicialização)"""
+        await self.resync(job_queue)
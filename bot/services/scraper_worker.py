@@ -0,0 +1,285 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+
+from bot.services.match import decode_matches, encode_matches
+from bot.services.metrics import registry
+from bot.services.tracing import InMemoryExporter, tracer
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_PHASE_SECONDS = registry.histogram(
+    "furia_scrape_phase_seconds", "Duração de cada fase do scraping", labels=("phase", "source")
+)
+SCRAPER_REQUESTS = registry.counter(
+    "furia_scraper_requests_total", "Pedidos ao scraper por resultado do cache", labels=("cache",)
+)
+SNAPSHOT_AGE = registry.gauge("furia_snapshot_age_seconds", "Idade do último snapshot de partidas")
+SCRAPE_PAGES = registry.counter(
+    "furia_scrape_pages_total",
+    "Páginas baixadas por resultado da impressão digital (changed, unchanged, not_modified)",
+    labels=("result",),
+)
+SCRAPE_SKIP_RATIO = registry.gauge(
+    "furia_scrape_skip_ratio", "Fração das páginas baixadas cujo parsing foi evitado"
+)
+
+
+def _default_scraper():
+    # Importado só no processo de scraping: o principal não carrega requests nem Selenium
+    from bot.services.matches_scraper import MatchesScraper
+
+    return MatchesScraper()
+
+
+def _worker_main(requests, responses, scraper_factory):
+    """Loop do processo de scraping: atende pedidos até receber ``None``"""
+    # Os spans do processo ficam em memória e voltam ao principal junto do snapshot;
+    # fora de um trace vindo de lá, nada é amostrado
+    spans = InMemoryExporter()
+    tracer.configure(spans, sample_rate=0.0)
+    scraper = scraper_factory()
+
+    while True:
+        request = requests.get()
+        if request is None:
+            scraper.close()
+            break
+
+        request_id, force_update, max_age, trace_context = request
+        try:
+            previous_update = scraper.last_update
+            with tracer.continue_trace(trace_context):
+                matches = scraper.get_furia_matches(force_update, max_age)
+            snapshot = {
+                # Sem mudanças, as partidas nem atravessam o processo: vale a última lista enviada
+                'matches': encode_matches(matches) if scraper.last_changed else None,
+                'source': scraper.last_source,
+                'updated_at': scraper.last_update,
+                'stats': dict(scraper.last_stats),
+                # False quando a resposta veio do cache do scraper
+                'fresh': scraper.last_update != previous_update,
+                'changed': scraper.last_changed,
+                'spans': [span.to_dict() for span in spans.drain()],
+            }
+            responses.put((request_id, snapshot, None))
+        except Exception as e:
+            spans.drain()
+            responses.put((request_id, None, f"{type(e).__name__}: {e}"))
+
+
+class ScraperWorker:
+    """Executa o MatchesScraper em um processo dedicado.
+
+    Os handlers aguardam o resultado sem bloquear o event loop do bot, e um
+    Chrome travado ou encerrado só derruba o processo de scraping, que é
+    reiniciado no próximo pedido.
+    """
+
+    def __init__(self, scraper_factory=_default_scraper, request_timeout=120):
+        self.scraper_factory = scraper_factory
+        self.request_timeout = request_timeout
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._process = None
+        self._requests = None
+        self._pending = {}
+        self._inflight = {}  # (force_update, max_age) -> Task compartilhada entre os chamadores
+        self._version = 0
+        self._last_matches = None
+        self.last_updated_at = None
+
+    def start(self):
+        with self._lock:
+            if self._process and self._process.is_alive():
+                return
+            if self._process:
+                logger.warning("Processo de scraping encerrado inesperadamente. Reiniciando...")
+            self._spawn()
+
+    def _spawn(self):
+        self._requests = self._ctx.Queue()
+        responses = self._ctx.Queue()
+        self._pending = {}
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(self._requests, responses, self.scraper_factory),
+            name="scraper-worker",
+            daemon=True,
+        )
+        self._process.start()
+        threading.Thread(
+            target=self._read_responses,
+            args=(self._process, responses, self._pending),
+            name="scraper-worker-reader",
+            daemon=True,
+        ).start()
+        logger.info(f"Processo de scraping iniciado (pid {self._process.pid})")
+
+    def stop(self, timeout=5):
+        with self._lock:
+            process, self._process = self._process, None
+            if not process:
+                return
+            try:
+                self._requests.put(None)
+                process.join(timeout)
+            finally:
+                if process.is_alive():
+                    process.terminate()
+                    process.join(timeout)
+            self._fail_pending(self._pending, RuntimeError("Processo de scraping finalizado"))
+
+    def restart(self):
+        with self._lock:
+            process = self._process
+            if process and process.is_alive():
+                process.terminate()
+                process.join(5)
+            self._fail_pending(self._pending, RuntimeError("Processo de scraping reiniciado"))
+            self._spawn()
+
+    def _read_responses(self, process, responses, pending):
+        while True:
+            try:
+                request_id, snapshot, error = responses.get(timeout=1)
+            except queue.Empty:
+                if not process.is_alive():
+                    self._fail_pending(pending, RuntimeError("Processo de scraping encerrado"))
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+
+            entry = pending.pop(request_id, None)
+            if entry is None:
+                continue
+            loop, future = entry
+            if error:
+                loop.call_soon_threadsafe(_set_exception, future, RuntimeError(error))
+            else:
+                loop.call_soon_threadsafe(_set_result, future, snapshot)
+
+    @staticmethod
+    def _fail_pending(pending, exc):
+        while pending:
+            _, (loop, future) = pending.popitem()
+            loop.call_soon_threadsafe(_set_exception, future, exc)
+
+    async def get_snapshot(self, force_update=False, max_age=None):
+        """Pede um snapshot ao processo de scraping e aguarda sem bloquear.
+
+        Com ``max_age`` (segundos), os times com cache mais velho que isso são
+        atualizados mesmo dentro do TTL. Pedidos simultâneos iguais são
+        agrupados: todos aguardam o mesmo scraping em andamento. Qualquer
+        pedido também aproveita um forçado em andamento.
+        """
+        with tracer.span("scraper_worker.get_snapshot", force=force_update, max_age=max_age):
+            return await self._shared_snapshot(force_update, max_age)
+
+    async def _shared_snapshot(self, force_update, max_age=None):
+        key = (True, None) if force_update else (False, max_age)
+        task = self._inflight.get(key) or self._inflight.get((True, None))
+        if task is None:
+            task = asyncio.ensure_future(self._request_snapshot(force_update, max_age))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            logger.info("Scraping já em andamento. Aguardando o resultado compartilhado")
+
+        return await asyncio.shield(task)
+
+    async def _request_snapshot(self, force_update, max_age=None):
+        self.start()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        request_id = next(self._ids)
+        with self._lock:
+            self._pending[request_id] = (loop, future)
+            # O processo de scraping continua o trace de quem criou o pedido
+            self._requests.put((request_id, force_update, max_age, tracer.current_context()))
+
+        try:
+            snapshot = await asyncio.wait_for(future, self.request_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Scraping excedeu {self.request_timeout}s. Reiniciando o processo...")
+            await loop.run_in_executor(None, self.restart)
+            raise
+
+        tracer.export_dicts(snapshot.pop('spans', ()))
+        if snapshot['matches'] is None:
+            snapshot['matches'] = self._last_matches or []
+        else:
+            snapshot['matches'] = decode_matches(snapshot['matches'])
+            snapshot['version'] = self._assign_version(snapshot['matches'])
+        snapshot.setdefault('version', self._version)
+        self._record_metrics(snapshot)
+        return snapshot
+
+    def _record_metrics(self, snapshot):
+        if snapshot.get('updated_at'):
+            self.last_updated_at = snapshot['updated_at']
+        if not snapshot.get('fresh'):
+            SCRAPER_REQUESTS.inc(cache="hit")
+            return
+
+        SCRAPER_REQUESTS.inc(cache="miss")
+        stats = snapshot.get('stats', {})
+        _observe_phases(stats, snapshot.get('source') or "")
+        # Fases de cada time atualizado, com a origem de cada um
+        for team_stats in stats.get('teams', {}).values():
+            _observe_phases(team_stats, team_stats.get('source') or "")
+            if 'fingerprint' in team_stats:
+                SCRAPE_PAGES.inc(result=team_stats['fingerprint'])
+
+    def snapshot_age(self):
+        """Segundos desde o último scraping concluído, ou None se ainda não houve"""
+        if not self.last_updated_at:
+            return None
+        return time.time() - self.last_updated_at
+
+    def _assign_version(self, matches):
+        """Versão do snapshot: muda apenas quando o conteúdo das partidas muda"""
+        if matches != self._last_matches:
+            self._version += 1
+            self._last_matches = matches
+        return self._version
+
+    async def get_furia_matches(self, force_update=False):
+        snapshot = await self.get_snapshot(force_update)
+        return snapshot['matches']
+
+
+def skip_ratio():
+    """Fração das páginas cujo conteúdo repetido dispensou parsing e gravação"""
+    changed = SCRAPE_PAGES.value(result="changed")
+    skipped = SCRAPE_PAGES.value(result="unchanged") + SCRAPE_PAGES.value(result="not_modified")
+    total = changed + skipped
+    return skipped / total if total else 0.0
+
+
+def _observe_phases(stats, source):
+    for key, value in stats.items():
+        if key.endswith('_seconds'):
+            SCRAPE_PHASE_SECONDS.observe(value, phase=key[:-len('_seconds')], source=source)
+
+
+def _set_result(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future, exc):
+    if not future.done():
+        future.set_exception(exc)
+
+
+scraper_worker = ScraperWorker()
+SNAPSHOT_AGE.set_function(scraper_worker.snapshot_age)
+SCRAPE_SKIP_RATIO.set_function(skip_ratio)
@@ -0,0 +1,78 @@
+import hashlib
+import logging
+import re
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+MATCH_ID_RE = re.compile(r'/partida/(\d+)')
+
+# Campos que, se mudarem, exigem regravar a partida
+CONTENT_FIELDS = ('team', 'opponent', 'event', 'format', 'link')
+SCHEDULE_FIELDS = ('date', 'time', 'start_ts')
+
+
+def match_id(match):
+    """Id estável da partida: o número dela no link do draft5.
+
+    Sem link reconhecível, usa o hash de data + adversário, como antes.
+    """
+    found = MATCH_ID_RE.search(match.get('link') or "")
+    if found:
+        return found.group(1)
+    return hashlib.md5(f"{match['date']}_{match['opponent']}".encode()).hexdigest()
+
+
+@dataclass
+class SnapshotDiff:
+    """Diferença entre o snapshot armazenado e um novo scraping"""
+
+    added: list = field(default_factory=list)
+    rescheduled: list = field(default_factory=list)
+    updated: list = field(default_factory=list)
+    removed: list = field(default_factory=list)  # ids
+
+    @property
+    def changed(self):
+        """Partidas que precisam ser gravadas"""
+        return self.added + self.rescheduled + self.updated
+
+    def __bool__(self):
+        return bool(self.added or self.rescheduled or self.updated or self.removed)
+
+    def summary(self):
+        return (
+            f"{len(self.added)} novas, {len(self.rescheduled)} remarcadas, "
+            f"{len(self.updated)} atualizadas, {len(self.removed)} removidas"
+        )
+
+
+def diff_snapshots(previous, current):
+    """Compara as partidas armazenadas com as do novo scraping.
+
+    ``current`` deve trazer o ``id`` de cada partida. O estado ``notified``
+    sempre vem do registro anterior, inclusive em partidas remarcadas e em
+    registros antigos cujo id mudou (casados pelo link).
+    """
+    previous_by_id = {m['id']: m for m in previous}
+    previous_by_link = {m['link']: m for m in previous if m.get('link')}
+    current_ids = {m['id'] for m in current}
+    diff = SnapshotDiff()
+
+    for match in current:
+        old = previous_by_id.get(match['id']) or previous_by_link.get(match.get('link'))
+        if old is None:
+            diff.added.append({**match, 'notified': False})
+            continue
+
+        record = {**match, 'notified': old.get('notified', False)}
+        if old['id'] != match['id']:
+            # Registro salvo com o id antigo (hash de data + adversário)
+            diff.added.append(record)
+        elif any(old.get(key) != match.get(key) for key in SCHEDULE_FIELDS):
+            diff.rescheduled.append(record)
+        elif any(old.get(key) != match.get(key) for key in CONTENT_FIELDS):
+            diff.updated.append(record)
+
+    diff.removed = [match_id for match_id in previous_by_id if match_id not in current_ids]
+    return diff
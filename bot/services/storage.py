@@ -1,76 +1,253 @@
+import asyncio
+import contextvars
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import logging
 
+from bot.database.database import DatabaseManager
+from bot.services.draft5_parser import start_timestamp
+from bot.services.metrics import registry
+from bot.services.scheduler import DEFAULT_LEAD_MINUTES
+from bot.services.tracing import tracer
+
 logger = logging.getLogger(__name__)
 
-class JSONStorage:
-    def __init__(self, file_path=None):
-        self.file_path = file_path or os.path.join(Path(__file__).parent.parent, 'data', 'storage.json')
-        self._ensure_data_file()
+STORAGE_SECONDS = registry.histogram(
+    "furia_storage_operation_seconds", "Duração das operações de storage", labels=("operation",)
+)
 
-    def _ensure_data_file(self):
-        try:
-            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-            if not os.path.exists(self.file_path):
-                with open(self.file_path, 'w') as f:
-                    json.dump({'matches': [], 'subscriptions': []}, f)
-        except Exception as e:
-            logger.error(f"Falha ao criar arquivo: {str(e)}")
-            raise
+# Avisos de partidas que saíram da listagem ficam guardados por este tempo (s);
+# cobre a maior antecedência (1 dia) para a partida não ser avisada de novo se voltar
+NOTIFICATION_RETENTION = 2 * 86400
 
-    def _read_data(self):
-        try:
-            with open(self.file_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Erro na leitura: {str(e)}")
-            return {'matches': [], 'subscriptions': []}
+# Reservas de entrega sem confirmação por mais que isso (s) são de um envio
+# interrompido e podem ser retomadas por outro líder
+CLAIM_TIMEOUT = 15 * 60
+
+DEFAULT_JSON_PATH = os.path.join(Path(__file__).parent.parent, 'data', 'storage.json')
+
+
+class SQLiteStorage:
+    """Armazenamento das partidas, inscrições e avisos em SQLite.
+
+    Na primeira inicialização importa, uma única vez, os dados do
+    ``storage.json`` legado.
+    """
+
+    JSON_MIGRATION_KEY = 'json_migrated'
+    LEAD_MIGRATION_KEY = 'lead_minutes_default'
+    SNAPSHOT_TIME_KEY = 'snapshot_updated_at'
+    SNAPSHOT_VERSION_KEY = 'snapshot_changed_at'
+
+    def __init__(self, db_path=None, json_path=DEFAULT_JSON_PATH):
+        self.db = DatabaseManager(db_path)
+        if json_path:
+            self._migrate_from_json(json_path)
+        self._migrate_lead_times()
+
+    def _migrate_lead_times(self):
+        """Inscrições antigas ficaram com o padrão de 30 min do esquema, mas
+        sempre receberam o aviso 1h antes: mantém o que foi prometido a elas."""
+        if self.db.get_meta(self.LEAD_MIGRATION_KEY):
+            return
+        with self.db.transaction() as cursor:
+            cursor.execute('UPDATE subscriptions SET notification_time = ?', (DEFAULT_LEAD_MINUTES,))
+            self.db.set_meta(self.LEAD_MIGRATION_KEY, str(DEFAULT_LEAD_MINUTES), cursor)
+
+    def _migrate_from_json(self, json_path):
+        if self.db.get_meta(self.JSON_MIGRATION_KEY) or not os.path.exists(json_path):
+            return
 
-    def _write_data(self, data):
         try:
-            with open(self.file_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            with open(json_path, 'r') as f:
+                data = json.load(f)
         except Exception as e:
-            logger.error(f"Erro na escrita: {str(e)}")
-            raise
+            logger.error(f"Erro ao ler {json_path} para migração: {str(e)}")
+            return
+
+        required = ('id', 'opponent', 'event', 'date', 'time')
+        matches = [
+            {**m, 'start_ts': start_timestamp(m['date'], m['time'])}
+            for m in data.get('matches', []) if all(k in m for k in required)
+        ]
+        subscriptions = data.get('subscriptions', [])
+
+        with self.db.transaction() as cursor:
+            self.db.upsert_matches(matches, cursor)
+            cursor.executemany(
+                'INSERT OR IGNORE INTO subscriptions (user_id, notification_time) VALUES (?, ?)',
+                [(user_id, DEFAULT_LEAD_MINUTES) for user_id in subscriptions]
+            )
+            self.db.set_meta(self.JSON_MIGRATION_KEY, json_path, cursor)
+
+        logger.info(
+            f"Migrados {len(matches)} partidas e {len(subscriptions)} inscrições de {json_path}"
+        )
 
     # Métodos de matches
     def add_matches(self, matches):
-        data = self._read_data()
-        data['matches'] = matches
-        self._write_data(data)
+        self.db.replace_matches(matches)
+
+    def apply_diff(self, diff):
+        """Grava só as partidas alteradas de um ``SnapshotDiff``"""
+        self.db.apply_match_changes(diff.changed, diff.removed)
 
     def get_matches(self):
-        return self._read_data()['matches']
+        return self.db.get_matches()
+
+    def get_match(self, match_id):
+        return self.db.get_match(match_id)
 
     def clear_matches(self):
-        data = self._read_data()
-        data['matches'] = []
-        self._write_data(data)
+        self.db.clear_matches()
+
+    def prune_notifications(self, now=None):
+        """Remove avisos enviados e entregas reservadas que não servem mais"""
+        deleted = self.db.prune_notifications(now or time.time(), NOTIFICATION_RETENTION)
+        if deleted:
+            logger.info(f"{deleted} registros de notificação antigos removidos")
+        return deleted
+
+    def set_snapshot_time(self, updated_at, changed=True):
+        """Registra quando o líder concluiu o scraping das partidas salvas.
+
+        A versão (momento da última mudança de conteúdo) só avança se as
+        partidas mudaram. Retorna o estado como em ``get_snapshot_state``.
+        """
+        with self.db.transaction() as cursor:
+            self.db.set_meta(self.SNAPSHOT_TIME_KEY, repr(float(updated_at)), cursor)
+            if changed:
+                self.db.set_meta(self.SNAPSHOT_VERSION_KEY, repr(float(updated_at)), cursor)
+        return self.get_snapshot_state()
+
+    def get_snapshot_state(self):
+        """``{'updated_at', 'version'}`` do snapshot salvo, ou None se ainda não houve scraping"""
+        updated_at = self.db.get_meta(self.SNAPSHOT_TIME_KEY)
+        if not updated_at:
+            return None
+        version = self.db.get_meta(self.SNAPSHOT_VERSION_KEY)
+        return {'updated_at': float(updated_at), 'version': float(version) if version else None}
 
     # Métodos de subscriptions
-    def add_subscription(self, user_id):
-        data = self._read_data()
-        if user_id not in data['subscriptions']:
-            data['subscriptions'].append(user_id)
-            self._write_data(data)
-            logger.info(f"Usuário {user_id} inscrito")
+    def add_subscription(self, user_id, lead_minutes=None):
+        """Inscreve o usuário; sem ``lead_minutes`` mantém a antecedência já escolhida"""
+        if lead_minutes is None:
+            self.db.add_subscriptions([user_id], DEFAULT_LEAD_MINUTES)
+        else:
+            self.db.add_subscription(user_id, lead_minutes)
+        logger.info(f"Usuário {user_id} inscrito")
 
     def remove_subscription(self, user_id):
-        data = self._read_data()
-        if user_id in data['subscriptions']:
-            data['subscriptions'].remove(user_id)
-            self._write_data(data)
+        if self.db.remove_subscription(user_id):
             logger.info(f"Usuário {user_id} removido")
 
     def get_subscriptions(self):
-        return self._read_data()['subscriptions']
+        return [row['user_id'] for row in self.db.get_subscriptions()]
+
+    def count_subscriptions(self):
+        return self.db.count_subscriptions()
+
+    def get_subscribers(self, lead_minutes):
+        return self.db.get_subscribers(lead_minutes)
+
+    def get_lead_times(self):
+        return self.db.get_notification_times()
+
+    def claim_notification(self, match_id, lead_minutes):
+        return self.db.claim_notification(match_id, lead_minutes)
+
+    def get_sent_notifications(self):
+        return self.db.get_sent_notifications()
+
+    def claim_deliveries(self, match_id, lead_minutes, user_ids, claimed_by=None, now=None):
+        return self.db.claim_deliveries(
+            match_id, lead_minutes, user_ids, claimed_by, (now or time.time()) - CLAIM_TIMEOUT
+        )
+
+    def confirm_deliveries(self, match_id, user_ids):
+        self.db.confirm_deliveries(match_id, user_ids)
+
+    def release_deliveries(self, match_id, user_ids):
+        self.db.release_deliveries(match_id, user_ids)
+
+    # Coordenação entre réplicas
+    def acquire_lease(self, name, holder, ttl):
+        return self.db.acquire_lease(name, holder, ttl, time.time())
+
+    def release_lease(self, name, holder):
+        self.db.release_lease(name, holder)
+
+    def get_lease(self, name):
+        return self.db.get_lease(name)
 
     def update_match_status(self, match_id, status):
-        data = self._read_data()
-        for match in data['matches']:
-            if match['id'] == match_id:
-                match['notified'] = status
-        self._write_data(data)
\ No newline at end of file
+        self.db.mark_as_notified(match_id, status)
+
+
+class AsyncStorage:
+    """Fachada assíncrona: executa cada operação do storage em uma thread.
+
+    Os handlers fazem ``await storage.get_matches()`` sem bloquear o event
+    loop; o storage síncrono continua disponível em ``storage.sync``. Com
+    uma ``factory`` no lugar do storage, ele só é criado (e o banco aberto)
+    no primeiro uso, já dentro da thread da operação.
+
+    As operações rodam em um pool próprio de ``max_workers`` threads, então
+    o banco nunca tem mais que esse número de conexões abertas pela fachada.
+    """
+
+    def __init__(self, storage=None, factory=None, max_workers=4):
+        self._sync = storage
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="storage")
+
+    @property
+    def sync(self):
+        if self._sync is None:
+            with self._lock:
+                if self._sync is None:
+                    self._sync = self._factory()
+        return self._sync
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                with tracer.span(f"storage.{name}"):
+                    # Copia o contexto para que os spans da thread fiquem sob este
+                    context = contextvars.copy_context()
+                    return await asyncio.get_running_loop().run_in_executor(
+                        self._executor, lambda: context.run(self._call, name, *args, **kwargs)
+                    )
+            finally:
+                STORAGE_SECONDS.observe(time.perf_counter() - started, operation=name)
+
+        call.__name__ = name
+        return call
+
+    def _call(self, name, *args, **kwargs):
+        return getattr(self.sync, name)(*args, **kwargs)
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """Storage compartilhado pelos handlers (SQLite com acesso assíncrono).
+
+    O banco só é aberto na primeira operação, não na importação dos handlers.
+    """
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = AsyncStorage(factory=SQLiteStorage)
+        return _storage
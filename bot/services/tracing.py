@@ -0,0 +1,208 @@
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Span ativo no contexto atual; atravessa ``await`` e é copiado por ``asyncio.to_thread``
+SpanContext = namedtuple("SpanContext", "trace_id span_id sampled")
+_current = contextvars.ContextVar("furia_trace", default=None)
+_UNSAMPLED = SpanContext(None, None, False)
+
+
+def _new_id(size):
+    return random.getrandbits(size * 8).to_bytes(size, "big").hex()
+
+
+class Span:
+    """Trecho medido de um trace; ``duration`` em segundos"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "duration", "attributes", "error")
+
+    def __init__(self, name, trace_id, span_id, parent_id=None, attributes=None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.duration = None
+        self.attributes = dict(attributes or {})
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        span = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(span, name, data.get(name))
+        return span
+
+
+class _NoopSpan:
+    """Span de um trace não amostrado: não mede nem exporta nada"""
+
+    def set(self, **attributes):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class InMemoryExporter:
+    """Guarda os spans em memória (testes e repasse entre processos)"""
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def drain(self):
+        with self._lock:
+            spans, self.spans = self.spans, []
+        return spans
+
+    def names(self):
+        return [span.name for span in self.spans]
+
+
+class FileExporter:
+    """Grava um span por linha (JSON) em um arquivo local"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def export(self, span):
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Tracer:
+    """Spans leves com propagação por ``contextvars``.
+
+    A amostragem é decidida no span raiz (``sample_rate`` de 0 a 1) e vale
+    para o trace inteiro; spans de traces não amostrados custam só a troca
+    do contextvar. Sem ``exporter``, nada é medido.
+    """
+
+    def __init__(self, exporter=None, sample_rate=1.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def from_env(cls):
+        """Configura pelo ambiente: TRACING_EXPORTER (none/file), TRACING_FILE, TRACING_SAMPLE_RATE"""
+        exporter = None
+        if os.getenv("TRACING_EXPORTER", "none") == "file":
+            exporter = FileExporter(os.getenv("TRACING_FILE", "traces.jsonl"))
+        return cls(exporter, float(os.getenv("TRACING_SAMPLE_RATE", "1.0")))
+
+    def configure(self, exporter=None, sample_rate=None):
+        self.exporter = exporter
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+
+    @contextmanager
+    def span(self, name, **attributes):
+        parent = _current.get()
+        if parent is None:
+            sampled = self.exporter is not None and random.random() < self.sample_rate
+            context = SpanContext(_new_id(16), None, True) if sampled else _UNSAMPLED
+        else:
+            context = parent
+
+        if not context.sampled:
+            token = _current.set(context)
+            try:
+                yield _NOOP
+            finally:
+                _current.reset(token)
+            return
+
+        span = Span(name, context.trace_id, _new_id(8), context.span_id, attributes)
+        token = _current.set(SpanContext(context.trace_id, span.span_id, True))
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = round(time.perf_counter() - started, 6)
+            _current.reset(token)
+            self._export(span)
+
+    def traced(self, name=None):
+        """Decorador: mede cada chamada da função (síncrona ou corrotina) em um span"""
+        def decorator(function):
+            span_name = name or function.__qualname__
+
+            if inspect.iscoroutinefunction(function):
+                @functools.wraps(function)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name):
+                        return await function(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def current_context():
+        """Contexto do span ativo, para continuar o trace em outro processo"""
+        return _current.get()
+
+    @contextmanager
+    def continue_trace(self, context):
+        """Usa ``context`` (de ``current_context``) como pai dos próximos spans"""
+        token = _current.set(SpanContext(*context) if context else None)
+        try:
+            yield
+        finally:
+            _current.reset(token)
+
+    def export_dicts(self, spans):
+        """Exporta spans recebidos de outro processo"""
+        for data in spans:
+            self._export(Span.from_dict(data))
+
+    def _export(self, span):
+        if self.exporter is None:
+            return
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            logger.error(f"Erro ao exportar span {span.name}: {str(e)}")
+
+
+tracer = Tracer.from_env()
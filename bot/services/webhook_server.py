@@ -0,0 +1,169 @@
+import asyncio
+import hmac
+import json
+import logging
+import signal
+
+from telegram import Update
+from tornado.httpserver import HTTPServer
+from tornado.netutil import bind_sockets
+from tornado.web import Application, RequestHandler
+
+from bot.services.metrics import CONTENT_TYPE, registry
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class HealthHandler(RequestHandler):
+    def get(self):
+        self.write({"status": "ok"})
+
+
+class MetricsHandler(RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", CONTENT_TYPE)
+        self.write(registry.render())
+
+
+class HomeHandler(RequestHandler):
+    def get(self):
+        self.write("🟡⚫ FURIA Bot está online! ⚫🟡")
+
+
+class UpdateHandler(RequestHandler):
+    def initialize(self, server):
+        self.server = server
+
+    def post(self):
+        if not self.server.check_secret(self.request.headers.get(SECRET_HEADER)):
+            logger.warning("Webhook recebido com token secreto inválido")
+            self.set_status(403)
+            return
+
+        try:
+            data = json.loads(self.request.body)
+            update = Update.de_json(data, self.server.application.bot)
+        except Exception as e:
+            logger.warning(f"Update inválido recebido no webhook: {str(e)}")
+            self.set_status(400)
+            return
+
+        try:
+            self.server.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            # O Telegram reenvia o update mais tarde quando não recebe 2xx
+            self.server.rejected += 1
+            logger.warning(f"Fila de updates cheia, update {update.update_id} recusado")
+            self.set_status(503)
+            return
+
+        self.set_status(200)
+
+
+class WebhookServer:
+    """Servidor HTTP assíncrono único do modo webhook.
+
+    Recebe os updates do Telegram em ``path`` e também responde ``/health``,
+    ``/metrics`` e ``/``. Os updates entram numa fila limitada a ``queue_size`` e são
+    processados por ``workers`` tarefas; com a fila cheia a requisição recebe
+    503 e o Telegram tenta de novo depois.
+    """
+
+    def __init__(self, application, path="/telegram", secret_token=None,
+                 queue_size=100, workers=4):
+        self.application = application
+        self.path = path if path.startswith("/") else f"/{path}"
+        self.secret_token = secret_token
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.workers = workers
+        self.rejected = 0
+        self.port = None
+        self._http_server = None
+        self._consumers = []
+
+    def check_secret(self, received):
+        if not self.secret_token:
+            return True
+        return received is not None and hmac.compare_digest(received, self.secret_token)
+
+    def make_app(self):
+        return Application([
+            (r"/", HomeHandler),
+            (r"/health", HealthHandler),
+            (r"/metrics", MetricsHandler),
+            (self.path, UpdateHandler, {"server": self}),
+        ])
+
+    async def start(self, host="0.0.0.0", port=8080):
+        sockets = bind_sockets(port, host)
+        self.port = sockets[0].getsockname()[1]
+        self._http_server = HTTPServer(self.make_app())
+        self._http_server.add_sockets(sockets)
+        self._consumers = [
+            asyncio.create_task(self._consume()) for _ in range(self.workers)
+        ]
+        logger.info(f"Webhook escutando em {host}:{self.port}{self.path}")
+
+    async def stop(self, drain_timeout=10):
+        if self._http_server:
+            self._http_server.stop()
+            self._http_server = None
+
+        if self._consumers:
+            try:
+                await asyncio.wait_for(self.queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"{self.queue.qsize()} update(s) descartados no desligamento")
+
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+
+    async def _consume(self):
+        while True:
+            update = await self.queue.get()
+            try:
+                await self.application.process_update(update)
+            except Exception as e:
+                logger.error(f"Erro ao processar update {update.update_id}: {str(e)}", exc_info=True)
+            finally:
+                self.queue.task_done()
+
+
+async def run_webhook(application, server, webhook_url, host="0.0.0.0", port=8080):
+    """Roda o bot em modo webhook até receber SIGINT/SIGTERM"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            pass
+
+    async with application:
+        # ``post_init``/``post_shutdown`` só são chamados sozinhos por run_polling/run_webhook
+        if application.post_init:
+            await application.post_init(application)
+        await application.start()
+        await server.start(host, port)
+        if webhook_url:
+            await application.bot.set_webhook(
+                url=f"{webhook_url.rstrip('/')}{server.path}",
+                secret_token=server.secret_token,
+                allowed_updates=Update.ALL_TYPES,
+            )
+        else:
+            # Útil para testes locais, postando updates gravados direto no servidor
+            logger.warning("WEBHOOK_URL não definido: webhook não registrado no Telegram")
+        logger.info("Bot em modo webhook")
+
+        try:
+            await stop_event.wait()
+        finally:
+            await server.stop()
+            await application.stop()
+            if application.post_shutdown:
+                await application.post_shutdown(application)
@@ -0,0 +1,56 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telegram.error import Forbidden, RetryAfter
+
+from bot.services.broadcaster import (
+    PRIORITY_BULK, Broadcaster, PriorityRateLimiter
+)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reports_delivery_and_unreachable_chats():
+    async def send_message(chat_id, **kwargs):
+        if chat_id == 3:
+            raise Forbidden("bot was blocked by the user")
+
+    bot = MagicMock(spec=['send_message'])
+    bot.send_message = AsyncMock(side_effect=send_message)
+
+    report = await Broadcaster(concurrency=2).broadcast(bot, [1, 2, 3], "Partida!")
+
+    assert bot.send_message.await_count == 3
+    assert report.delivered == 2
+    assert report.unreachable == [3]
+    assert report.time_to_last <= report.duration
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_skip_bulk_queue():
+    limiter = PriorityRateLimiter(overall_rate=20, per_chat_interval=0)
+    order = []
+
+    def request(name, priority):
+        async def callback():
+            order.append(name)
+        return limiter.process_request(callback, (), {}, 'sendMessage', {'chat_id': name}, priority)
+
+    bulk = [asyncio.create_task(request(f"bulk{i}", PRIORITY_BULK)) for i in range(30)]
+    await asyncio.sleep(0)
+    await request("reply", None)
+    await asyncio.gather(*bulk)
+
+    # O burst inicial de 20 tokens vai para a fila em massa; a resposta é a próxima
+    assert order.index("reply") <= 21
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honored():
+    limiter = PriorityRateLimiter()
+    callback = AsyncMock(side_effect=[RetryAfter(0), {'ok': True}])
+
+    result = await limiter.process_request(callback, (), {}, 'sendMessage', {'chat_id': 1}, None)
+
+    assert result == {'ok': True}
+    assert callback.await_count == 2
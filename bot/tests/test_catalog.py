@@ -0,0 +1,35 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from bot.handlers import catalog as catalog_module
+from bot.handlers.catalog import ResponseCatalog, catalog
+from bot.handlers.players import _tenure_text
+
+
+def test_player_cards_are_indexed_by_callback_data():
+    card = catalog.get("player_3")
+
+    assert card['text'].startswith("🐾 *FalleN (Gabriel Toledo)*")
+    assert card['parse_mode'] == "Markdown"
+    assert catalog.get("team")['reply_markup'].inline_keyboard[2][0].callback_data == "player_3"
+
+
+def test_daily_responses_are_rebuilt_only_when_the_day_changes():
+    responses = ResponseCatalog()
+    build = MagicMock(side_effect=lambda today: {'text': today.isoformat()})
+    responses.add_daily("card", build)
+
+    with patch.object(catalog_module, 'date') as fake_date:
+        fake_date.today.return_value = date(2025, 5, 10)
+        responses.get("card")
+        responses.get("card")
+        fake_date.today.return_value = date(2025, 5, 11)
+        assert responses.get("card") == {'text': '2025-05-11'}
+
+    assert build.call_count == 2
+
+
+def test_tenure_text():
+    assert _tenure_text(date(2023, 7, 1), date(2025, 9, 1)) == " há 2 anos e 2 meses"
+    assert _tenure_text(date(2025, 5, 1), date(2025, 5, 1)) == "🏁 Ingressou hoje!"
+    assert _tenure_text(date(2025, 6, 1), date(2025, 5, 1)) == "🔜 Ainda não ingressou no time"
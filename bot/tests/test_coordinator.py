@@ -0,0 +1,79 @@
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bot.services.coordinator import Coordinator
+from bot.services.storage import CLAIM_TIMEOUT, AsyncStorage, SQLiteStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    sqlite_storage = SQLiteStorage(str(tmp_path / 'bot.db'), json_path=None)
+    yield AsyncStorage(sqlite_storage)
+    sqlite_storage.db.close()
+
+
+@pytest.mark.asyncio
+async def test_only_one_replica_leads_and_follower_takes_over_after_ttl(storage):
+    first = Coordinator(storage, replica_id='a', ttl=1)
+    second = Coordinator(storage, replica_id='b', ttl=1)
+    elected = AsyncMock()
+    second.on_elected(elected)
+
+    assert await first.renew() is True
+    assert await second.renew() is False
+    assert await first.renew() is True
+
+    time.sleep(1.1)
+    assert first.is_leader is False  # lease vencido sem renovação
+    assert await second.renew() is True
+    assert await first.renew() is False
+    elected.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_released_lease_is_taken_immediately(storage):
+    first = Coordinator(storage, replica_id='a', ttl=60)
+    second = Coordinator(storage, replica_id='b', ttl=60)
+    await first.start(MagicMock())
+
+    await first.stop()
+
+    assert await second.renew() is True
+
+
+@pytest.mark.asyncio
+async def test_delivery_claims_are_exclusive_across_replicas(storage):
+    await storage.add_matches([{
+        'id': 'm', 'opponent': 'MIBR', 'event': 'PGL', 'date': '2025-05-16', 'time': '08:00'
+    }])
+
+    first = await storage.claim_deliveries('m', 60, [1, 2], 'a')
+    second = await storage.claim_deliveries('m', 5, [1, 2, 3], 'b')
+
+    assert (first, second) == ([1, 2], [3])
+
+
+@pytest.mark.asyncio
+async def test_new_leader_reclaims_only_stale_unconfirmed_deliveries(storage):
+    await storage.add_matches([{
+        'id': 'm', 'opponent': 'MIBR', 'event': 'PGL', 'date': '2025-05-16', 'time': '08:00'
+    }])
+    # O líder "a" reservou 1 e 2, confirmou só o 1 e caiu
+    await storage.claim_deliveries('m', 60, [1, 2], 'a')
+    await storage.confirm_deliveries('m', [1])
+
+    soon = await storage.claim_deliveries('m', 60, [1, 2], 'b')
+    later = await storage.claim_deliveries('m', 60, [1, 2], 'b', now=time.time() + CLAIM_TIMEOUT + 5)
+
+    assert (soon, later) == ([], [2])
+
+
+@pytest.mark.asyncio
+async def test_released_deliveries_can_be_claimed_again(storage):
+    await storage.claim_deliveries('m', 60, [1, 2], 'a')
+    await storage.confirm_deliveries('m', [1])
+    await storage.release_deliveries('m', [1, 2])
+
+    assert await storage.claim_deliveries('m', 60, [1, 2], 'a') == [2]
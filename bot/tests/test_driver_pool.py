@@ -0,0 +1,102 @@
+import time
+from unittest.mock import patch
+
+import pytest
+
+from bot.services.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("chrome not reachable")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def pool():
+    created = []
+
+    def factory():
+        created.append(FakeDriver())
+        return created[-1]
+
+    pool = DriverPool(factory, max_size=1, max_uses=2, min_free_mb=0)
+    pool.created = created
+    yield pool
+    pool.close()
+
+
+def test_driver_is_reused_and_recycled_after_max_uses(pool):
+    for _ in range(3):
+        with pool.driver():
+            pass
+
+    assert len(pool.created) == 2
+    assert pool.created[0].quit_called
+
+
+def test_dead_driver_is_replaced(pool):
+    with pool.driver() as driver:
+        pass
+    driver.alive = False
+
+    with pool.driver() as replacement:
+        pass
+
+    assert replacement is not driver
+    assert driver.quit_called
+
+
+def test_driver_is_discarded_when_scrape_fails(pool):
+    with pytest.raises(ValueError):
+        with pool.driver() as driver:
+            raise ValueError("falha no scraping")
+
+    assert driver.quit_called
+    assert not pool._idle
+
+
+def test_idle_drivers_are_reaped_without_a_new_scrape(pool):
+    pool.max_age = 0.05
+    pool.reap_interval = 0.01
+
+    with pool.driver() as driver:
+        pass
+    deadline = time.monotonic() + 2
+    while not driver.quit_called and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not pool._idle
+    assert driver.quit_called
+
+
+def test_idle_drivers_past_idle_timeout_are_reaped(pool):
+    pool.reap_interval = 0
+    with pool.driver() as driver:
+        pass
+
+    assert pool.reap() == 0
+    pool._idle[0].last_used -= pool.idle_timeout
+
+    assert pool.reap() == 1
+    assert driver.quit_called
+
+
+def test_idle_drivers_are_released_under_memory_pressure(pool):
+    pool.reap_interval = 0
+    with pool.driver() as driver:
+        pass
+    pool.min_free_mb = 200
+
+    with patch('bot.services.driver_pool.available_memory_mb', return_value=100):
+        assert pool.reap() == 1
+
+    assert driver.quit_called and not pool._idle
@@ -0,0 +1,59 @@
+import pickle
+
+import pytest
+
+from bot.services.match import InvalidMatch, Match, decode_matches, encode_matches
+
+
+def _match(**extra):
+    fields = {
+        'team': 'FURIA', 'opponent': 'MIBR', 'date': '2025-05-16', 'time': '8:00',
+        'format': 'MD3', 'event': 'PGL Astana 2025',
+        'link': 'https://draft5.gg/partida/36905-MIBR-vs-FURIA', **extra
+    }
+    return Match.create(**fields)
+
+
+def test_create_normalizes_time_and_computes_start():
+    match = _match()
+
+    assert match.id == '36905'
+    assert match.time == '08:00'
+    assert match.start_ts == 1747393200
+    assert match.start.isoformat() == '2025-05-16T11:00:00+00:00'
+    assert match.local_start.strftime('%d/%m/%Y %H:%M') == '16/05/2025 08:00'
+
+
+def test_tba_match_has_no_start():
+    match = _match(time='TBA')
+
+    assert match.start_ts is None
+    assert match.start is None
+
+
+@pytest.mark.parametrize('extra', [
+    {'opponent': 'FURIA'},
+    {'opponent': 'x'},
+    {'date': '16/05/2025'},
+    {'time': 'amanhã'},
+])
+def test_create_rejects_invalid_fields(extra):
+    with pytest.raises(InvalidMatch):
+        _match(**extra)
+
+
+def test_repeated_strings_are_interned():
+    # Strings montadas em tempo de execução, como as que vêm do parser
+    first = _match()
+    second = _match(event=" ".join(["PGL", "Astana", "2025"]), format="MD" + str(3))
+
+    assert first.event is second.event
+    assert first.format is second.format
+
+
+def test_encode_decode_and_pickle_round_trip():
+    matches = [_match(), _match(time='TBA', link='')]
+
+    assert decode_matches(encode_matches(matches)) == matches
+    assert pickle.loads(pickle.dumps(matches)) == matches
+    assert Match.from_dict(matches[0].to_dict()) == matches[0]
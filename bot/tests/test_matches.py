@@ -1,12 +1,10 @@
+import time
+
 import pytest
-import sys
-import os
 from unittest.mock import AsyncMock, MagicMock, patch
-from bot.handlers.matches import matches_handler, format_matches_message
+from bot.handlers.matches import matches_handler, refresh_snapshot, render_matches_list, render_notification
+from bot.services.match import Match
 from telegram import Update
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
-from bot.handlers.matches import store_matches
 
 
 @pytest.fixture
@@ -23,52 +21,197 @@ def mock_context():
     context.job_queue = MagicMock()
     return context
 
+@pytest.fixture(autouse=True)
+def mock_storage():
+    with patch('bot.handlers.matches.storage', AsyncMock()) as storage, \
+            patch('bot.handlers.matches.notification_scheduler', MagicMock(resync=AsyncMock())), \
+            patch('bot.handlers.matches.coordinator', MagicMock(is_leader=True)):
+        storage.get_matches.return_value = []
+        storage.get_snapshot_state.return_value = None
+        storage.set_snapshot_time.return_value = {'updated_at': 0, 'version': None}
+        yield storage
+
+def _snapshot(matches):
+    return {'matches': matches, 'source': 'http', 'updated_at': 0, 'stats': {}, 'version': None}
+
 @pytest.mark.asyncio
 async def test_matches_handler_with_matches(mock_update, mock_context):
-    mock_matches = [{
-        'opponent': 'Team Liquid',
-        'event': 'BLAST Premier 2025',
-        'time': '30/04/2025 19:00',
-        'link': 'https://draft5.gg/fake-match',
-        'format': 'BO3'
-    }]
+    mock_matches = [Match.create(
+        team='FURIA',
+        opponent='Team Liquid',
+        event='BLAST Premier 2025',
+        date='2025-04-30',
+        time='19:00',
+        link='https://draft5.gg/fake-match',
+        format='BO3'
+    )]
     
-    with patch('bot.handlers.matches.matches_scraper.get_furia_matches', return_value=mock_matches):
+    with patch('bot.handlers.matches.scraper_worker.get_snapshot', AsyncMock(return_value=_snapshot(mock_matches))):
         await matches_handler(mock_update, mock_context)
         
         # Verifica o número de chamadas
         assert mock_update.message.reply_text.await_count == 1
         
-        args, kwargs = mock_update.message.reply_text.call_args
-        assert 'Team Liquid' in args[0]
-        assert 'BO3' in args[0]
+        status_msg = mock_update.message.reply_text.return_value
+        args, kwargs = status_msg.edit_text.call_args
+        assert 'Team Liquid' in kwargs['text']
+        assert 'BO3' in kwargs['text']
 
 @pytest.mark.asyncio
 async def test_matches_handler_no_matches(mock_update, mock_context):
-    with patch('bot.handlers.matches.matches_scraper.get_furia_matches', return_value=[]):
+    with patch('bot.handlers.matches.scraper_worker.get_snapshot', AsyncMock(return_value=_snapshot([]))):
         await matches_handler(mock_update, mock_context)
         
-        args, kwargs = mock_update.message.reply_text.call_args
-        assert 'Nenhum jogo agendado' in args[0]
+        status_msg = mock_update.message.reply_text.return_value
+        args, kwargs = status_msg.edit_text.call_args
+        assert 'Nenhuma partida agendada' in args[0]
+
+@pytest.mark.asyncio
+async def test_follower_serves_shared_snapshot_without_scraping(mock_update, mock_context, mock_storage):
+    mock_storage.get_matches.return_value = [{
+        'id': '1', 'opponent': 'MIBR', 'event': 'PGL Astana 2025', 'date': '2025-05-16',
+        'time': '08:00', 'link': 'https://draft5.gg/partida/1', 'format': 'MD3'
+    }]
+
+    with patch('bot.handlers.matches.coordinator', MagicMock(is_leader=False)), \
+            patch('bot.handlers.matches.scraper_worker.get_snapshot', AsyncMock()) as scraper:
+        await matches_handler(mock_update, mock_context)
+
+    scraper.assert_not_awaited()
+    status_msg = mock_update.message.reply_text.return_value
+    assert 'MIBR' in status_msg.edit_text.call_args.kwargs['text']
+
+@pytest.mark.asyncio
+async def test_leader_serves_stored_snapshot_and_revalidates(mock_update, mock_context, mock_storage):
+    mock_storage.get_snapshot_state.return_value = {'updated_at': time.time() - 600, 'version': 1.0}
+    mock_storage.get_matches.return_value = [{
+        'id': '1', 'opponent': 'MIBR', 'event': 'PGL Astana 2025', 'date': '2025-05-16',
+        'time': '08:00', 'link': 'https://draft5.gg/partida/1', 'format': 'MD3'
+    }]
+
+    with patch('bot.handlers.matches.scraper_worker.get_snapshot', AsyncMock()) as scraper, \
+            patch('bot.handlers.matches.snapshot_refresher') as refresher:
+        refresher.in_progress = True
+        await matches_handler(mock_update, mock_context)
+
+    scraper.assert_not_awaited()
+    refresher.revalidate.assert_called_once_with(mock_context.job_queue)
+    text = mock_update.message.reply_text.return_value.edit_text.call_args.kwargs['text']
+    assert 'MIBR' in text
+    assert 'Atualizado há 10 min · atualizando...' in text
 
 @pytest.mark.asyncio
 async def test_matches_handler_force_update(mock_update, mock_context):
     mock_context.args = ['force']
     
-    with patch('bot.handlers.matches.matches_scraper.get_furia_matches') as mock_scraper:
-        mock_scraper.return_value = []
+    with patch('bot.handlers.matches.scraper_worker.get_snapshot', AsyncMock(return_value=_snapshot([]))) as mock_scraper:
         await matches_handler(mock_update, mock_context)
-        mock_scraper.assert_called_once_with(force_update=True)
+        mock_scraper.assert_awaited_once_with(True, None)
+
+@pytest.mark.asyncio
+async def test_refresh_skips_writes_for_unchanged_version(mock_storage):
+    match = Match.create('FURIA', 'MIBR', '2025-05-16', '08:00', link='https://draft5.gg/partida/1')
+    snapshot = {**_snapshot([match]), 'version': 7, 'updated_at': 100}
+
+    with patch('bot.handlers.matches._stored_version', None), \
+            patch('bot.handlers.matches.scraper_worker.get_snapshot', AsyncMock(return_value=snapshot)):
+        await refresh_snapshot(MagicMock())
+        await refresh_snapshot(MagicMock())
+
+    mock_storage.apply_diff.assert_awaited_once()
+    assert [c.args[1] for c in mock_storage.set_snapshot_time.await_args_list] == [True, False]
+
+@pytest.mark.asyncio
+async def test_every_refresh_resyncs_lead_times_chosen_on_other_replicas(mock_storage):
+    from bot.handlers.matches import notification_scheduler
+
+    match = Match.create('FURIA', 'MIBR', '2025-05-16', '08:00', link='https://draft5.gg/partida/1')
+    snapshot = {**_snapshot([match]), 'version': 7, 'updated_at': 100}
 
-def test_format_matches_message():
+    with patch('bot.handlers.matches._stored_version', 7), \
+            patch('bot.handlers.matches.scraper_worker.get_snapshot', AsyncMock(return_value=snapshot)):
+        await refresh_snapshot(MagicMock())
+
+    mock_storage.apply_diff.assert_not_awaited()
+    notification_scheduler.resync.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_storage_error_keeps_saved_matches_and_notifications(mock_storage):
+    match = Match.create('FURIA', 'MIBR', '2025-05-16', '08:00', link='https://draft5.gg/partida/1')
+    mock_storage.apply_diff.side_effect = RuntimeError("database is locked")
+
+    with patch('bot.handlers.matches._stored_version', None), \
+            patch('bot.handlers.matches.scraper_worker.get_snapshot', AsyncMock(return_value=_snapshot([match]))):
+        await refresh_snapshot(MagicMock())
+
+    mock_storage.clear_matches.assert_not_awaited()
+    mock_storage.prune_notifications.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_follower_force_does_not_promise_an_update(mock_update, mock_context):
+    mock_context.args = ['force']
+
+    with patch('bot.handlers.matches.coordinator', MagicMock(is_leader=False)), \
+            patch('bot.handlers.matches.scraper_worker.get_snapshot', AsyncMock()) as scraper:
+        await matches_handler(mock_update, mock_context)
+
+    scraper.assert_not_awaited()
+    first_reply = mock_update.message.reply_text.await_args_list[0].args[0]
+    assert 'forçada' not in first_reply
+    assert 'outra instância' in first_reply
+
+def test_render_matches_list():
     matches = [{
         'opponent': 'Natus Vincere',
         'event': 'IEM Katowice 2025',
-        'time': '01/05/2025 20:00',
+        'date': '2025-05-01',
+        'time': '20:00',
         'link': 'https://draft5.gg/another-match',
         'format': 'BO3'
     }]
     
-    message, _ = format_matches_message(matches)
+    message, _ = render_matches_list(matches)
     assert 'BO3' in message
-    assert 'IEM Katowice 2025' in message
\ No newline at end of file
+    assert 'IEM Katowice 2025' in message
+    assert '01/05/2025' in message
+
+@pytest.mark.asyncio
+async def test_lead_time_callback_subscribes_locally(mock_storage, mock_context):
+    update = MagicMock()
+    update.callback_query = AsyncMock()
+    update.callback_query.from_user.id = 7
+    update.callback_query.data = "notif_lead_15"
+
+    with patch('bot.handlers.matches.subscription_sync') as backend:
+        await matches_handler(update, mock_context)
+
+    mock_storage.add_subscription.assert_awaited_once_with(7, 15)
+    backend.enqueue.assert_called_once_with(7, "on")
+    args, kwargs = update.callback_query.edit_message_text.call_args
+    assert '15 minutos' in kwargs['text']
+
+@pytest.mark.asyncio
+async def test_subscriber_gauge_is_cached_and_never_queries_on_scrape(mock_storage, mock_context):
+    from bot.services.metrics import registry
+
+    mock_storage.count_subscriptions.return_value = 3
+    update = MagicMock()
+    update.callback_query = AsyncMock()
+    update.callback_query.from_user.id = 7
+    update.callback_query.data = "notif_off"
+
+    with patch('bot.handlers.matches.subscription_sync'):
+        await matches_handler(update, mock_context)
+    mock_storage.count_subscriptions.reset_mock()
+
+    assert "furia_subscribers 3" in registry.render()
+    mock_storage.count_subscriptions.assert_not_called()
+
+def test_notification_shows_real_time_left_when_window_already_started():
+    match = Match.create('FURIA', 'MIBR', '2025-05-16', '08:00', link='https://draft5.gg/partida/1').to_dict()
+
+    on_time = render_notification(match, 1440, now=match['start_ts'] - 86400)
+    late = render_notification(match, 1440, now=match['start_ts'] - 3 * 3600)
+
+    assert 'começa em 1 dia!' in on_time
+    assert 'começa em 3 horas!' in late
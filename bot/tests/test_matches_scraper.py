@@ -0,0 +1,364 @@
+import re
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from bot.services.draft5_parser import extract_listing, extract_next_data
+from bot.services.match import Match
+from bot.services.matches_scraper import MatchesScraper, TeamPage, parse_teams
+
+PAGE_SOURCE = Path(__file__).resolve().parents[2] / 'page_source.html'
+
+
+@pytest.fixture
+def page_html():
+    return PAGE_SOURCE.read_text(encoding='utf-8')
+
+
+def _strip_listing(page_html):
+    """Remove a listagem renderizada, mantendo apenas o estado embutido"""
+    return re.sub(
+        r'<p class="MatchList__MatchListDate.*?</a></div>', '</div>', page_html, flags=re.S
+    )
+
+
+def test_extract_listing_from_saved_page(page_html):
+    entries = extract_listing(page_html)
+
+    assert [e['kind'] for e in entries] == ['date', 'match']
+    assert 'sábado, 10 de maio de 2025' in entries[0]['text']
+    assert entries[1] == {
+        'kind': 'match',
+        'teams': ['The MongolZ', 'FURIA'],
+        'time': '05:00',
+        'format': 'MD3',
+        'event': 'PGL Astana 2025',
+        'href': 'https://draft5.gg/partida/36905-The-MongolZ-vs-FURIA-PGL-Astana-2025',
+    }
+
+
+def test_extract_next_data_from_saved_page(page_html):
+    entries = extract_next_data(page_html)
+
+    assert len(entries) == 1
+    assert entries[0]['date'].strftime('%Y-%m-%d') == '2025-05-10'
+    assert entries[0]['time'] == '05:00'
+    assert entries[0]['href'] == 'https://draft5.gg/partida/36905-The-MongolZ-vs-FURIA-PGL-Astana-2025'
+
+
+def test_http_mode_reports_source(page_html):
+    scraper = MatchesScraper(fetch_mode='http')
+
+    with patch.object(scraper, '_http_get', return_value=(page_html, {})), \
+            patch.object(scraper, '_fetch_via_selenium') as selenium:
+        matches = scraper.get_furia_matches(force_update=True)
+
+    selenium.assert_not_called()
+    assert scraper.last_source == 'http'
+    assert [m.to_dict() for m in matches] == [{
+        'id': '36905',
+        'team': 'FURIA',
+        'opponent': 'The MongolZ',
+        'date': '2025-05-10',
+        'time': '05:00',
+        'format': 'MD3',
+        'event': 'PGL Astana 2025',
+        'link': 'https://draft5.gg/partida/36905-The-MongolZ-vs-FURIA-PGL-Astana-2025',
+        'start_ts': 1746864000,
+    }]
+
+
+def test_http_mode_falls_back_to_next_data(page_html):
+    scraper = MatchesScraper(fetch_mode='http')
+
+    with patch.object(scraper, '_http_get', return_value=(_strip_listing(page_html), {})):
+        matches = scraper.get_furia_matches(force_update=True)
+
+    assert scraper.last_source == 'next_data'
+    assert matches[0].opponent == 'The MongolZ'
+    assert matches[0].format == 'MD3'
+
+
+def test_auto_mode_falls_back_to_selenium():
+    scraper = MatchesScraper(fetch_mode='auto')
+    selenium_matches = [Match.create('FURIA', 'MIBR', '2025-05-16', '08:00', link='https://draft5.gg/partida/1')]
+
+    def fake_selenium(team):
+        return selenium_matches
+
+    with patch.object(scraper, '_http_get', return_value=('<html><body></body></html>', {})), \
+            patch.object(scraper, '_fetch_via_selenium', side_effect=fake_selenium):
+        matches = scraper.get_furia_matches(force_update=True)
+
+    assert matches == selenium_matches
+    assert scraper.last_source == 'selenium'
+
+
+def test_force_update_respects_min_interval(page_html):
+    scraper = MatchesScraper(fetch_mode='http')
+    scraper.min_force_interval = 60
+
+    with patch.object(scraper, '_http_get', return_value=(page_html, {})) as http_get:
+        first = scraper.get_furia_matches(force_update=True)
+        second = scraper.get_furia_matches(force_update=True)
+
+    assert http_get.call_count == 1
+    assert second == first
+
+
+def test_wait_for_page_records_wait_time():
+    scraper = MatchesScraper(fetch_mode='selenium')
+    driver = MagicMock()
+    driver.execute_script.side_effect = [None, None, 'listing']
+
+    scraper._wait_for_page(driver)
+
+    assert scraper.last_stats['ready_state'] == 'listing'
+    assert 0 < scraper.last_stats['wait_seconds'] < scraper.page_timeout
+
+
+def test_wait_for_page_gives_up_after_timeout():
+    scraper = MatchesScraper(fetch_mode='selenium')
+    scraper.page_timeout = 0.3
+    driver = MagicMock()
+    driver.execute_script.return_value = None
+
+    with pytest.raises(RuntimeError):
+        scraper._wait_for_page(driver)
+
+    assert scraper.last_stats['ready_state'] == 'timeout'
+    assert scraper.last_stats['wait_seconds'] >= 0.3
+
+
+def test_selenium_scrape_uses_single_extraction_call(page_html):
+    scraper = MatchesScraper(fetch_mode='selenium')
+    driver = MagicMock()
+    driver.execute_script.side_effect = [
+        'listing', ['<p>listagem</p>'], {'id': 330, 'name': 'FURIA'}, extract_listing(page_html)
+    ]
+
+    matches = scraper._scrape_matches(driver)
+
+    # Prontidão, impressão digital, nome do time (só na primeira vez) e extração
+    assert driver.execute_script.call_count == 4
+    driver.find_elements.assert_not_called()
+    assert matches[0].opponent == 'The MongolZ'
+    assert matches[0].date == '2025-05-10'
+
+
+def test_selenium_timeout_keeps_previous_team_entry():
+    scraper = MatchesScraper(fetch_mode='selenium')
+    scraper.page_timeout = 0.3
+    previous = {'matches': [Match.create('FURIA', 'MIBR', '2025-05-16', '08:00')], 'updated': 0,
+                'source': 'selenium', 'fingerprint': None, 'day': None, 'validators': None}
+    scraper._team_cache[scraper.teams[0].slug] = previous
+    scraper.cached_matches = previous['matches']
+    driver = MagicMock()
+    driver.execute_script.return_value = None
+    scraper.driver_pool = MagicMock()
+    scraper.driver_pool.driver.return_value.__enter__.return_value = driver
+
+    matches = scraper.get_furia_matches()
+
+    assert matches == previous['matches']
+    assert scraper._team_cache[scraper.teams[0].slug] is previous
+
+
+@pytest.mark.parametrize('ready_state, empty_is_valid', [('empty', True), ('listing', False)])
+def test_empty_listing_is_only_accepted_when_the_page_says_so(ready_state, empty_is_valid):
+    scraper = MatchesScraper(fetch_mode='selenium')
+    scraper._site_names[scraper.teams[0].slug] = 'FURIA'
+    driver = MagicMock()
+    driver.execute_script.side_effect = [ready_state, [], []]
+
+    if empty_is_valid:
+        assert scraper._scrape_matches(driver) == []
+    else:
+        with pytest.raises(RuntimeError):
+            scraper._scrape_matches(driver)
+
+
+def test_alternative_scrape_keeps_cards_without_date(page_html):
+    scraper = MatchesScraper(fetch_mode='selenium')
+    card = extract_listing(page_html)[1]
+
+    matches = scraper._scrape_matches_alternative([card])
+
+    assert len(matches) == 1
+    assert matches[0].time == '05:00'
+
+
+def _listing(team_name, *games):
+    """Entradas de listagem (data + partidas) com ``(id, adversário, horário)``"""
+    entries = [{'kind': 'date', 'text': 'sábado, 10 de maio de 2025'}]
+    for game_id, opponent, match_time in games:
+        entries.append({
+            'kind': 'match', 'teams': [opponent, team_name], 'time': match_time,
+            'format': 'MD3', 'event': 'PGL Astana 2025',
+            'href': f'https://draft5.gg/partida/{game_id}-{opponent}-vs-{team_name}',
+        })
+    return entries
+
+
+def test_parse_teams_reads_slugs_and_ttls():
+    teams = parse_teams("330-FURIA, 11896-FURIA-Academy:600, 9999-Furia-Fe=FURIA fe")
+
+    assert teams == [
+        TeamPage('330-FURIA'), TeamPage('11896-FURIA-Academy', 600), TeamPage('9999-Furia-Fe', None, 'FURIA fe'),
+    ]
+    assert teams[1].name == 'FURIA Academy'
+    assert teams[0].id == 330
+    assert teams[2].name == 'FURIA fe'
+    assert teams[1].url == 'https://draft5.gg/equipe/11896-FURIA-Academy/proximas-partidas'
+
+
+def test_teams_are_scraped_concurrently_and_merged_without_duplicates():
+    main, academy = TeamPage('330-FURIA'), TeamPage('11896-FURIA-Academy')
+    scraper = MatchesScraper(fetch_mode='http', teams=[main, academy], max_parallel=2)
+    pages = {
+        main.url: _listing('FURIA', (1, 'FURIA Academy', '15:00'), (2, 'MIBR', '10:00')),
+        academy.url: _listing('FURIA Academy', (1, 'FURIA', '15:00'), (3, 'paiN', '12:00')),
+    }
+    running, peak = [], []
+
+    def fake_fetch(team):
+        running.append(team)
+        peak.append(len(running))
+        time.sleep(0.2)
+        running.remove(team)
+        return scraper._matches_from_entries(pages[team.url], team)
+
+    with patch.object(scraper, '_fetch_via_http', side_effect=fake_fetch):
+        matches = scraper.get_furia_matches()
+
+    assert max(peak) == 2
+    assert [(m.team, m.opponent) for m in matches] == [
+        ('FURIA', 'MIBR'), ('FURIA Academy', 'paiN'), ('FURIA', 'FURIA Academy'),
+    ]
+    assert set(scraper.last_stats['teams']) == {main.slug, academy.slug}
+
+
+def test_only_expired_teams_are_refreshed(page_html):
+    main, rival = TeamPage('330-FURIA'), TeamPage('8297-MIBR', ttl=60)
+    scraper = MatchesScraper(fetch_mode='http', teams=[main, rival])
+
+    with patch.object(scraper, '_http_get', return_value=(page_html, {})) as http_get:
+        scraper.get_furia_matches()
+        scraper._team_cache[rival.slug]['updated'] -= 120
+        scraper.get_furia_matches()
+
+    assert [c.args[0] for c in http_get.call_args_list] == [main.url, rival.url, rival.url]
+
+
+def test_max_age_refreshes_teams_older_than_it_within_ttl(page_html):
+    scraper = MatchesScraper(fetch_mode='http', teams=[TeamPage('330-FURIA', ttl=3600)])
+
+    with patch.object(scraper, '_http_get', return_value=(page_html, {})) as http_get:
+        scraper.get_furia_matches()
+        scraper._team_cache['330-FURIA']['updated'] -= 600
+        scraper.get_furia_matches()
+        scraper.get_furia_matches(max_age=900)
+        scraper.get_furia_matches(max_age=300)
+
+    # Dentro do TTL e de max_age=900 não baixa; com max_age=300 o cache de 10 min venceu
+    assert http_get.call_count == 2
+
+
+def test_failed_team_keeps_previous_entry(page_html):
+    main, rival = TeamPage('330-FURIA'), TeamPage('8297-MIBR')
+    scraper = MatchesScraper(fetch_mode='http', teams=[main, rival])
+
+    with patch.object(scraper, '_http_get', return_value=(page_html, {})):
+        first = scraper.get_furia_matches()
+
+    def flaky(url, validators=None):
+        if url == rival.url:
+            raise requests.ConnectionError("offline")
+        return page_html, {}
+
+    scraper._team_cache[main.slug]['updated'] = 0
+    scraper._team_cache[rival.slug]['updated'] = 0
+    with patch.object(scraper, '_http_get', side_effect=flaky):
+        second = scraper.get_furia_matches()
+
+    assert second == first
+    assert scraper._team_cache[rival.slug]['updated'] == 0
+
+
+def test_unchanged_page_skips_parsing(page_html):
+    scraper = MatchesScraper(fetch_mode='http')
+
+    with patch.object(scraper, '_http_get', return_value=(page_html, {})):
+        first = scraper.get_furia_matches()
+        scraper._team_cache['330-FURIA']['updated'] = 0
+        with patch.object(scraper, '_matches_from_entries') as parse:
+            second = scraper.get_furia_matches()
+
+    parse.assert_not_called()
+    assert second is first
+    assert scraper.last_changed is False
+    assert scraper.last_stats['teams']['330-FURIA']['fingerprint'] == 'unchanged'
+
+
+def test_http_validators_are_sent_and_304_reuses_matches(page_html):
+    scraper = MatchesScraper(fetch_mode='http')
+    validators = {'etag': '"abc"', 'last_modified': None}
+
+    with patch.object(scraper, '_http_get', return_value=(page_html, validators)):
+        first = scraper.get_furia_matches()
+    scraper._team_cache['330-FURIA']['updated'] = 0
+    with patch.object(scraper, '_http_get', return_value=(None, validators)) as http_get:
+        second = scraper.get_furia_matches()
+
+    assert http_get.call_args.args == (scraper.teams[0].url, validators)
+    assert second == first
+    assert scraper.last_stats['teams']['330-FURIA']['fingerprint'] == 'not_modified'
+
+
+def test_day_change_invalidates_fingerprint(page_html):
+    scraper = MatchesScraper(fetch_mode='http')
+
+    with patch.object(scraper, '_http_get', return_value=(page_html, {'etag': '"abc"'})) as http_get:
+        scraper.get_furia_matches()
+        entry = scraper._team_cache['330-FURIA']
+        entry.update(updated=0, day='2000-01-01', fingerprint='outro dia')
+        scraper.get_furia_matches()
+
+    # Sem validadores na requisição e com novo parsing
+    assert http_get.call_args.args[1] is None
+    assert scraper.last_changed is True
+
+
+def test_opponent_is_found_by_team_id_in_embedded_state(page_html):
+    # O slug não bate com o nome exibido pelo site, mas o id sim
+    scraper = MatchesScraper(fetch_mode='http', teams=[TeamPage('330-Furia-Esports')])
+
+    with patch.object(scraper, '_http_get', return_value=(_strip_listing(page_html), {})):
+        matches = scraper.get_furia_matches()
+
+    assert matches and all(m.opponent != 'FURIA' for m in matches)
+    assert {m.team for m in matches} == {'FURIA'}
+
+
+def test_site_name_is_learned_for_rendered_listing(page_html):
+    # Sem ids na listagem renderizada, vale o nome exibido pelo site
+    scraper = MatchesScraper(fetch_mode='http', teams=[TeamPage('330-Fúria-Gaming')])
+
+    with patch.object(scraper, '_http_get', return_value=(page_html, {})):
+        matches = scraper.get_furia_matches()
+
+    assert scraper.last_source == 'http'
+    assert matches[0].opponent == 'The MongolZ'
+    assert {m.team for m in matches} == {'FURIA'}
+
+
+def test_configured_name_matches_without_accents_or_case():
+    team = TeamPage('11896-Academy', display_name='FURIA Academy')
+    scraper = MatchesScraper(fetch_mode='http', teams=[team])
+
+    matches = scraper._matches_from_entries(_listing('Furia academy', (1, 'MIBR', '10:00')), team)
+
+    assert [(m.team, m.opponent) for m in matches] == [('FURIA Academy', 'MIBR')]
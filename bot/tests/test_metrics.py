@@ -0,0 +1,88 @@
+import pytest
+
+from bot.services.metrics import MetricsRegistry
+from bot.services.scraper_worker import (
+    SCRAPE_PAGES, SCRAPE_PHASE_SECONDS, SCRAPER_REQUESTS, ScraperWorker, skip_ratio
+)
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("scrape_seconds", "Duração", labels=("phase",), buckets=(0.1, 1))
+
+    histogram.observe(0.05, phase="http")
+    histogram.observe(0.1, phase="http")
+    histogram.observe(5, phase="http")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE scrape_seconds histogram" in lines
+    assert 'scrape_seconds_bucket{phase="http",le="0.1"} 2' in lines
+    assert 'scrape_seconds_bucket{phase="http",le="1"} 2' in lines
+    assert 'scrape_seconds_bucket{phase="http",le="+Inf"} 3' in lines
+    assert 'scrape_seconds_count{phase="http"} 3' in lines
+    assert 'scrape_seconds_sum{phase="http"} 5.15' in lines
+
+
+def test_counter_and_gauge_function():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Pedidos", labels=("cache",))
+    gauge = registry.gauge("subscribers", "Inscritos")
+    counter.inc(cache="hit")
+    counter.inc(2, cache="hit")
+    gauge.set_function(lambda: 7)
+
+    lines = registry.render().splitlines()
+    assert 'requests_total{cache="hit"} 3' in lines
+    assert "subscribers 7" in lines
+
+
+def test_gauge_function_errors_are_not_exposed():
+    registry = MetricsRegistry()
+    registry.gauge("broken", "Falha").set_function(lambda: 1 / 0)
+
+    assert registry.render().splitlines() == ["# HELP broken Falha", "# TYPE broken gauge"]
+
+
+@pytest.mark.asyncio
+async def test_timed_decorator_observes_async_calls():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("handler_seconds", "Handlers", labels=("command",))
+
+    @histogram.timed(command="matches")
+    async def handler():
+        return "ok"
+
+    assert await handler() == "ok"
+    assert histogram.count(command="matches") == 1
+
+
+def test_worker_records_phases_only_for_fresh_snapshots():
+    worker = ScraperWorker()
+    stats = {'http_seconds': 0.4, 'parse_seconds': 0.01, 'ready_state': 'listing'}
+    misses = SCRAPER_REQUESTS.value(cache="miss")
+    hits = SCRAPER_REQUESTS.value(cache="hit")
+    parses = SCRAPE_PHASE_SECONDS.count(phase="parse", source="http")
+
+    worker._record_metrics({'source': 'http', 'stats': stats, 'updated_at': 100, 'fresh': True})
+    worker._record_metrics({'source': 'http', 'stats': stats, 'updated_at': 100, 'fresh': False})
+
+    assert SCRAPER_REQUESTS.value(cache="miss") == misses + 1
+    assert SCRAPER_REQUESTS.value(cache="hit") == hits + 1
+    assert SCRAPE_PHASE_SECONDS.count(phase="parse", source="http") == parses + 1
+    assert worker.snapshot_age() > 0
+
+
+def test_worker_counts_skipped_pages():
+    worker = ScraperWorker()
+    teams = {
+        '330-FURIA': {'source': 'http', 'fingerprint': 'unchanged', 'http_seconds': 0.3},
+        '8297-MIBR': {'source': 'http', 'fingerprint': 'changed', 'parse_seconds': 0.02},
+    }
+    skipped = SCRAPE_PAGES.value(result="unchanged")
+    changed = SCRAPE_PAGES.value(result="changed")
+
+    worker._record_metrics({'source': 'http', 'stats': {'teams': teams}, 'updated_at': 100, 'fresh': True})
+
+    assert SCRAPE_PAGES.value(result="unchanged") == skipped + 1
+    assert SCRAPE_PAGES.value(result="changed") == changed + 1
+    assert 0 < skip_ratio() < 1
@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from bot.services.notifications import SubscriptionSync
+
+
+def _backend(responses=None):
+    """Backend falso: registra as requisições e responde na ordem de ``responses``"""
+    calls = []
+    responses = list(responses or [])
+
+    def handler(request):
+        calls.append((request.url.path, json.loads(request.content)['telegram_id']))
+        status = responses.pop(0) if responses else 200
+        return httpx.Response(status, json={'ok': status == 200})
+
+    return calls, httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_only_last_toggle_per_user_is_sent_in_one_batch():
+    calls, transport = _backend()
+    sync = SubscriptionSync(flush_interval=0.05, transport=transport)
+
+    sync.enqueue(1, "on")
+    sync.enqueue(2, "on")
+    sync.enqueue(1, "off")
+    sync.enqueue(1, "on")
+    assert calls == []  # nada é enviado antes da janela
+
+    await asyncio.sleep(0.2)
+    await sync.close()
+
+    assert sorted(calls) == [('/notifications/subscribe', '1'), ('/notifications/subscribe', '2')]
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_with_pooled_client():
+    calls, transport = _backend([503, 502])
+    sync = SubscriptionSync(backoff=0, transport=transport)
+
+    assert await sync.request(5, "off") == {'ok': True}
+    assert calls == [('/notifications/unsubscribe', '5')] * 3
+    await sync.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_changes_go_back_to_the_queue():
+    calls, transport = _backend([500, 500])
+    sync = SubscriptionSync(max_retries=1, backoff=0, transport=transport)
+    sync._pending = {9: "on"}
+
+    await sync.flush()
+    assert sync._pending == {9: "on"}
+
+    await sync.close()
+    assert len(calls) == 3 and sync._pending == {}
@@ -0,0 +1,106 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bot.services.refresher import SnapshotRefresher
+
+NOW = 1_750_000_000
+
+
+def _matches(*hours_ahead):
+    return [{'id': str(i), 'start_ts': NOW + h * 3600} for i, h in enumerate(hours_ahead)]
+
+
+@pytest.mark.parametrize('hours_ahead, expected', [
+    ((1,), 300),
+    ((30, 6), 900),
+    ((30,), 3600),
+    ((100,), 21600),
+    ((), 21600),
+])
+def test_interval_follows_next_match(hours_ahead, expected):
+    refresher = SnapshotRefresher(AsyncMock(), min_interval=300, max_interval=21600)
+
+    assert refresher.interval_for(_matches(*hours_ahead), now=NOW) == expected
+
+
+def test_started_and_tba_matches_are_ignored():
+    refresher = SnapshotRefresher(AsyncMock(), min_interval=300, max_interval=21600)
+    matches = _matches(-1) + [{'id': 'tba', 'start_ts': None}]
+
+    assert refresher.interval_for(matches, now=NOW) == 21600
+
+
+@pytest.mark.asyncio
+async def test_refresh_reschedules_with_adaptive_interval():
+    refresh = AsyncMock(return_value={'matches': []})
+    refresher = SnapshotRefresher(refresh, min_interval=300, max_interval=21600)
+    job_queue = MagicMock()
+
+    await refresher.refresh_now(job_queue)
+
+    refresh.assert_awaited_once_with(job_queue, False, None)
+    assert job_queue.run_once.call_args.kwargs['when'] == 21600
+    assert not refresher.is_stale
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_retries_at_min_interval():
+    refresher = SnapshotRefresher(
+        AsyncMock(side_effect=RuntimeError("offline")), min_interval=300, max_interval=21600
+    )
+    job_queue = MagicMock()
+
+    with pytest.raises(RuntimeError):
+        await refresher.refresh_now(job_queue)
+
+    assert job_queue.run_once.call_args.kwargs['when'] == 300
+    assert refresher.is_stale
+
+
+@pytest.mark.asyncio
+async def test_revalidate_runs_once_in_background():
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_refresh(job_queue, force_update, max_age):
+        started.set()
+        await release.wait()
+        return {'matches': []}
+
+    refresher = SnapshotRefresher(slow_refresh, min_interval=300, max_interval=21600)
+    refresher.revalidate(MagicMock())
+    refresher.revalidate(MagicMock())
+    await started.wait()
+
+    assert refresher.in_progress
+    release.set()
+    await refresher.refresh_now(MagicMock())
+    assert not refresher.in_progress and not refresher.is_stale
+
+
+@pytest.mark.asyncio
+async def test_scheduled_refresh_passes_interval_as_max_age():
+    refresh = AsyncMock(return_value={'matches': []})
+    refresher = SnapshotRefresher(refresh, min_interval=300, max_interval=21600)
+    refresher.interval = 900
+    context = MagicMock()
+
+    await refresher._run(context)
+    refresher.last_refresh = None
+    refresher.revalidate(context.job_queue)
+    await refresher._task
+
+    # Sem forçar: o scraper só atualiza os times com cache mais velho que o intervalo
+    assert [c.args[1:] for c in refresh.await_args_list] == [(False, 900), (False, 21600)]
+
+
+@pytest.mark.asyncio
+async def test_follower_skips_scheduled_refresh():
+    refresh = AsyncMock()
+    refresher = SnapshotRefresher(refresh, coordinator=MagicMock(is_leader=False))
+
+    await refresher._run(MagicMock())
+
+    refresh.assert_not_awaited()
@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+
+from bot.services.render_cache import RenderCache
+from bot.services.scraper_worker import ScraperWorker
+
+
+def test_entries_are_reused_until_version_changes():
+    cache = RenderCache()
+    build = MagicMock(side_effect=['v1', 'v2'])
+
+    assert cache.get('matches_list', build, version=1) == 'v1'
+    assert cache.get('matches_list', build, version=1) == 'v1'
+    assert cache.get('matches_list', build, version=2) == 'v2'
+
+    assert build.call_count == 2
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_unversioned_lookup_uses_current_version():
+    cache = RenderCache()
+    cache.get('matches_list', lambda: 'lista', version=3)
+
+    assert cache.get(('notification', 'a'), lambda: 'alerta') == 'alerta'
+    assert cache.get(('notification', 'a'), lambda: 'outro') == 'alerta'
+    assert cache.version == 3
+
+
+def test_snapshot_version_changes_only_with_content():
+    worker = ScraperWorker()
+    matches = [{'id': 'a', 'time': '08:00'}]
+
+    first = worker._assign_version(matches)
+    assert worker._assign_version([dict(m) for m in matches]) == first
+    assert worker._assign_version([{'id': 'a', 'time': '09:00'}]) == first + 1
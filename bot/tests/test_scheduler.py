@@ -0,0 +1,158 @@
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bot.services.broadcaster import BroadcastReport
+from bot.services.scheduler import NotificationScheduler, lead_label, time_left_label
+
+
+def _job_queue():
+    job_queue = MagicMock()
+    job_queue.run_once.side_effect = lambda callback, when, data, name: MagicMock(
+        data=data, when=when, name=name
+    )
+    return job_queue
+
+
+def _match(match_id, start_ts, notified=False):
+    return {'id': match_id, 'start_ts': start_ts, 'notified': notified}
+
+
+def test_sync_schedules_one_job_per_match_and_lead():
+    scheduler = NotificationScheduler(AsyncMock(), AsyncMock(), lead_minutes=(60, 15))
+    job_queue = _job_queue()
+    start = time.time() + 3 * 3600
+
+    scheduler.sync(job_queue, [
+        _match('a', start), _match('b', start), _match('tba', None),
+        _match('done', start, notified=True)
+    ], sent={('b', 60)})
+
+    whens = sorted(call.kwargs['when'] for call in job_queue.run_once.call_args_list)
+    assert len(whens) == 3
+    assert whens[0] == pytest.approx(2 * 3600, abs=5)
+    assert whens[1:] == [pytest.approx(3 * 3600 - 15 * 60, abs=5)] * 2
+
+
+def test_sync_follows_subscriber_lead_times():
+    scheduler = NotificationScheduler(AsyncMock(), AsyncMock())
+    job_queue = _job_queue()
+    start = time.time() + 3 * 86400
+    scheduler.sync(job_queue, [_match('a', start)])
+
+    scheduler.sync(job_queue, [_match('a', start)], lead_minutes=(5, 1440))
+
+    assert sorted(scheduler._jobs) == [('a', 5), ('a', 1440)]
+    assert lead_label(1440) == "1 dia" and lead_label(5) == "5 minutos"
+
+
+def test_sync_reschedules_changed_and_cancels_removed_matches():
+    scheduler = NotificationScheduler(AsyncMock(), AsyncMock())
+    job_queue = _job_queue()
+    start = time.time() + 3 * 3600
+    scheduler.sync(job_queue, [_match('a', start), _match('b', start)])
+    job_a, job_b = (scheduler._jobs[(m, 60)] for m in ('a', 'b'))
+
+    scheduler.sync(job_queue, [_match('a', start + 1800)])
+
+    job_a.schedule_removal.assert_called_once()
+    job_b.schedule_removal.assert_called_once()
+    assert list(scheduler._jobs) == [('a', 60)]
+    assert scheduler._jobs[('a', 60)].data['start_ts'] == start + 1800
+
+
+@pytest.mark.asyncio
+async def test_job_notifies_each_user_once():
+    start = int(time.time()) + 1800
+    storage = AsyncMock()
+    storage.get_match.return_value = _match('a', start)
+    storage.get_subscribers.return_value = [1, 2, 3]
+    # Na segunda execução (ex.: novo líder após falha), só o usuário 3 faltava
+    storage.claim_deliveries.side_effect = [[1, 2], [3]]
+    notify = AsyncMock(return_value=BroadcastReport(total=2))
+    scheduler = NotificationScheduler(storage, notify)
+    context = MagicMock()
+    context.job.data = {'match_id': 'a', 'lead': 60, 'start_ts': start}
+
+    await scheduler._run(context)
+    await scheduler._run(context)
+
+    storage.get_subscribers.assert_awaited_with(60)
+    assert [c.args[3] for c in notify.await_args_list] == [[1, 2], [3]]
+    storage.claim_notification.assert_awaited_with('a', 60)
+
+
+@pytest.mark.asyncio
+async def test_failed_deliveries_are_released_for_retry():
+    start = int(time.time()) + 1800
+    storage = AsyncMock()
+    storage.get_match.return_value = _match('a', start)
+    storage.get_subscribers.return_value = [1, 2, 3]
+    storage.claim_deliveries.return_value = [1, 2, 3]
+    notify = AsyncMock(return_value=BroadcastReport(total=3, delivered=1, failed=[2], unreachable=[3]))
+    scheduler = NotificationScheduler(storage, notify)
+    context = MagicMock()
+    context.job.data = {'match_id': 'a', 'lead': 60, 'start_ts': start}
+
+    await scheduler._run(context)
+
+    storage.confirm_deliveries.assert_awaited_once_with('a', [1, 3])
+    storage.release_deliveries.assert_awaited_once_with('a', [2])
+    # O par não é dado como avisado: o próximo resync agenda a nova tentativa
+    storage.claim_notification.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_nothing_sent_releases_every_claim():
+    start = int(time.time()) + 1800
+    storage = AsyncMock()
+    storage.get_match.return_value = _match('a', start)
+    storage.get_subscribers.return_value = [1, 2]
+    storage.claim_deliveries.return_value = [1, 2]
+    scheduler = NotificationScheduler(storage, AsyncMock(return_value=None))
+    context = MagicMock()
+    context.job.data = {'match_id': 'a', 'lead': 60, 'start_ts': start}
+
+    await scheduler._run(context)
+
+    storage.confirm_deliveries.assert_not_awaited()
+    storage.release_deliveries.assert_awaited_once()
+    assert sorted(storage.release_deliveries.await_args.args[1]) == [1, 2]
+    storage.claim_notification.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_follower_does_not_run_jobs():
+    storage = AsyncMock()
+    notify = AsyncMock()
+    scheduler = NotificationScheduler(storage, notify, coordinator=MagicMock(is_leader=False))
+    context = MagicMock()
+    context.job.data = {'match_id': 'a', 'lead': 60, 'start_ts': int(time.time()) + 1800}
+
+    await scheduler._run(context)
+
+    storage.get_match.assert_not_awaited()
+    notify.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stale_job_is_ignored_after_reschedule():
+    start = int(time.time()) + 1800
+    storage = AsyncMock()
+    storage.get_match.return_value = _match('a', start + 600)
+    notify = AsyncMock()
+    scheduler = NotificationScheduler(storage, notify)
+    context = MagicMock()
+    context.job.data = {'match_id': 'a', 'lead': 60, 'start_ts': start}
+
+    await scheduler._run(context)
+
+    notify.assert_not_awaited()
+
+
+def test_time_left_label_rounds_to_minutes():
+    assert time_left_label(20) == "1 minuto"
+    assert time_left_label(42 * 60) == "42 minutos"
+    assert time_left_label(3 * 3600) == "3 horas"
+    assert time_left_label(2 * 3600 + 55 * 60 + 10) == "2 horas e 55 minutos"
@@ -0,0 +1,32 @@
+from benchmarks.scraper_bench import (
+    check_thresholds, compare_baseline, run_benchmark, synthetic_page
+)
+from bot.services.draft5_parser import extract_listing, extract_next_data
+
+
+def test_synthetic_page_matches_both_parsers():
+    page_html = synthetic_page(300)
+
+    listing = [e for e in extract_listing(page_html) if e['kind'] == 'match']
+    next_data = extract_next_data(page_html)
+
+    assert len(listing) == len(next_data) == 300
+    assert [e['href'] for e in listing] == [e['href'] for e in next_data]
+    assert [e['time'] for e in listing] == [e['time'] for e in next_data]
+
+
+def test_benchmark_reports_stages_and_regressions():
+    results = run_benchmark({'synthetic_10': synthetic_page(10)}, repeat=1)
+    stages = results['synthetic_10']
+
+    assert set(stages) == {
+        'extract_listing', 'extract_next_data', 'parse_br_date', 'build_matches', 'fetch_http',
+        'fingerprint',
+    }
+    assert all(m['median_ms'] > 0 and m['peak_kib'] >= 0 for m in stages.values())
+
+    assert check_thresholds(results, {'*': {'fetch_http': {'max_ms': 0}}}) == [
+        f"synthetic_10/fetch_http: max_ms {stages['fetch_http']['median_ms']} > 0"
+    ]
+    baseline = {'synthetic_10': {'build_matches': {'median_ms': stages['build_matches']['median_ms'] / 10}}}
+    assert len(compare_baseline(results, baseline, max_regression=2)) == 1
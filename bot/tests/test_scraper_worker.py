@@ -0,0 +1,100 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from bot.services.match import Match
+from bot.services.scraper_worker import ScraperWorker
+
+
+class FakeScraper:
+    """Scraper sem rede: ``force_update`` simula um Chrome travado"""
+
+    def __init__(self):
+        self.last_source = 'http'
+        self.last_update = 0
+        self.last_stats = {}
+        self.last_changed = True
+        self.calls = 0
+
+    def get_furia_matches(self, force_update=False, max_age=None):
+        self.calls += 1
+        self.max_age = max_age
+        if force_update:
+            time.sleep(30)
+        time.sleep(0.2)
+        self.last_update = time.time()
+        # O evento carrega o pid do processo e o número da chamada
+        return [Match.create(
+            'FURIA', 'MIBR', '2025-05-16', '08:00', event=f"{os.getpid()}:{self.calls}", format=str(max_age)
+        )]
+
+    def close(self):
+        pass
+
+
+def _pid(match):
+    return int(match.event.split(":")[0])
+
+
+@pytest.fixture
+def worker():
+    worker = ScraperWorker(scraper_factory=FakeScraper, request_timeout=5)
+    yield worker
+    worker.stop()
+
+
+@pytest.mark.asyncio
+async def test_worker_returns_snapshot_from_other_process(worker):
+    snapshot = await worker.get_snapshot()
+
+    assert snapshot['source'] == 'http'
+    assert snapshot['matches'][0].opponent == 'MIBR'
+    assert _pid(snapshot['matches'][0]) != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_while_scraping(worker):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    await worker.get_furia_matches()
+    task.cancel()
+
+    assert ticks > 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_scrape(worker):
+    results = await asyncio.gather(*(worker.get_furia_matches() for _ in range(5)))
+
+    assert {r[0].event.split(":")[1] for r in results} == {'1'}
+    assert not worker._inflight
+
+
+@pytest.mark.asyncio
+async def test_max_age_reaches_the_scraper_process(worker):
+    default, recent = await asyncio.gather(worker.get_snapshot(), worker.get_snapshot(max_age=300))
+
+    # Idades diferentes não são agrupadas: cada pedido chega ao scraper com a sua
+    assert default['matches'][0].format == 'None'
+    assert recent['matches'][0].format == '300'
+
+
+@pytest.mark.asyncio
+async def test_hung_scrape_restarts_worker(worker):
+    worker.request_timeout = 1
+    first_pid = _pid((await worker.get_furia_matches())[0])
+
+    with pytest.raises(asyncio.TimeoutError):
+        await worker.get_furia_matches(force_update=True)
+
+    matches = await worker.get_furia_matches()
+    assert _pid(matches[0]) != first_pid
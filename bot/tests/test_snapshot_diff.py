@@ -0,0 +1,54 @@
+from bot.services.snapshot_diff import diff_snapshots, match_id
+
+
+def _match(match_id, **extra):
+    return {
+        'id': match_id, 'team': 'FURIA', 'opponent': 'MIBR', 'event': 'PGL Astana 2025',
+        'date': '2025-05-16', 'time': '08:00', 'format': 'MD3',
+        'link': f'https://draft5.gg/partida/{match_id}-MIBR-vs-FURIA', 'start_ts': 1747393200,
+        **extra
+    }
+
+
+def test_match_id_comes_from_draft5_link():
+    match = _match('36905', date='2025-05-17')
+
+    assert match_id(match) == '36905'
+    assert match_id({**match, 'link': ''}) != match_id({**match, 'link': '', 'date': '2025-05-18'})
+
+
+def test_diff_classifies_changes_and_keeps_notified():
+    previous = [
+        _match('1', notified=True), _match('2', notified=True),
+        _match('3', notified=False), _match('4', notified=True),
+    ]
+    current = [
+        _match('1'),
+        _match('2', time='10:00', start_ts=1747400400),
+        _match('3', format='MD5'),
+        _match('5'),
+    ]
+
+    diff = diff_snapshots(previous, current)
+
+    assert [m['id'] for m in diff.added] == ['5']
+    assert [(m['id'], m['notified']) for m in diff.rescheduled] == [('2', True)]
+    assert [(m['id'], m['format']) for m in diff.updated] == [('3', 'MD5')]
+    assert diff.removed == ['4']
+    assert [m['id'] for m in diff.changed] == ['5', '2', '3']
+
+
+def test_unchanged_snapshot_produces_empty_diff():
+    previous = [_match('1', notified=True)]
+
+    assert not diff_snapshots(previous, [_match('1')])
+
+
+def test_legacy_hash_id_is_replaced_without_losing_notified():
+    legacy = _match('1', notified=True)
+    legacy['id'] = 'a1b2c3'
+
+    diff = diff_snapshots([legacy], [_match('1')])
+
+    assert [(m['id'], m['notified']) for m in diff.added] == [('1', True)]
+    assert diff.removed == ['a1b2c3']
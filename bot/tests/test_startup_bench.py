@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+
+from benchmarks.startup_bench import PHASES, ROOT, run_once
+
+
+def test_cold_start_handles_first_update_without_heavy_imports():
+    phases = run_once()
+
+    assert list(phases) == [*PHASES, 'time_to_first_update']
+    # Fases medidas em sequência, a partir do início do processo
+    assert [phases[p] for p in PHASES] == sorted(phases[p] for p in PHASES)
+    assert phases['time_to_first_update'] >= phases['first_update']
+
+
+def test_importing_main_does_not_load_scraper_dependencies(tmp_path):
+    # Interpretador novo: nos testes os outros módulos já importaram tudo
+    code = (
+        "import sys, main; "
+        "print(sorted(m for m in ('selenium', 'flask', 'requests') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=tmp_path, capture_output=True, text=True, check=True,
+        env={**os.environ, 'PYTHONPATH': str(ROOT), 'DATABASE_PATH': str(tmp_path / 'bot.db')},
+    )
+
+    # Selenium fica no processo de scraping; Flask, só no modo polling
+    assert result.stdout.strip() == "[]"
+    # O banco só é aberto na primeira operação do storage
+    assert not (tmp_path / 'bot.db').exists()
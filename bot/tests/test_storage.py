@@ -0,0 +1,208 @@
+import asyncio
+import gc
+import json
+import threading
+import time
+
+import pytest
+
+from bot.services.snapshot_diff import diff_snapshots
+from bot.services.storage import AsyncStorage, SQLiteStorage
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / 'bot.db'), json_path=None)
+    yield storage
+    storage.db.close()
+
+
+def _match(match_id, **extra):
+    return {
+        'id': match_id, 'team': 'FURIA', 'opponent': 'MIBR', 'event': 'PGL Astana 2025',
+        'date': '2025-05-16', 'time': '08:00', 'format': 'MD3',
+        'link': f'https://draft5.gg/partida/{match_id}', 'notified': False, **extra
+    }
+
+
+def test_sqlite_migrates_legacy_json_once(tmp_path):
+    json_path = tmp_path / 'storage.json'
+    json_path.write_text(json.dumps({
+        'matches': [_match('a'), {'id': 'old', 'opponent': 'NAVI', 'time': '2025-5-10 05:00'}],
+        'subscriptions': [1, 2],
+    }))
+    db_path = str(tmp_path / 'bot.db')
+
+    storage = SQLiteStorage(db_path, json_path=str(json_path))
+    storage.remove_subscription(1)
+    storage.db.close()
+
+    reopened = SQLiteStorage(db_path, json_path=str(json_path))
+    assert reopened.get_subscriptions() == [2]
+    assert [m['id'] for m in reopened.get_matches()] == ['a']
+    reopened.db.close()
+
+
+def test_sqlite_replaces_matches_in_one_transaction(sqlite_storage):
+    sqlite_storage.add_matches([_match('a'), _match('b')])
+    sqlite_storage.update_match_status('b', True)
+    sqlite_storage.add_matches([_match('b', notified=True), _match('c', time='TBA')])
+
+    matches = sqlite_storage.get_matches()
+    assert [m['id'] for m in matches] == ['b', 'c']
+    assert matches[0]['notified'] is True
+    assert sqlite_storage.db.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_sqlite_applies_diff_without_touching_unchanged_rows(sqlite_storage):
+    sqlite_storage.add_matches([_match('a'), _match('b'), _match('c')])
+    sqlite_storage.update_match_status('b', True)
+    sqlite_storage.db.conn.execute("UPDATE matches SET event = 'intocado' WHERE id = 'a'")
+    sqlite_storage.db.conn.commit()
+    new = [_match('a'), _match('b', time='10:00'), _match('d', date='2025-05-15')]
+
+    diff = diff_snapshots(
+        [{**m, 'event': 'PGL Astana 2025'} for m in sqlite_storage.get_matches()], new
+    )
+    sqlite_storage.apply_diff(diff)
+
+    matches = sqlite_storage.get_matches()
+    assert [m['id'] for m in matches] == ['d', 'a', 'b']
+    assert matches[1]['event'] == 'intocado'
+    assert matches[2]['time'] == '10:00' and matches[2]['notified'] is True
+
+
+def test_sqlite_groups_subscribers_by_lead_time(sqlite_storage):
+    sqlite_storage.add_subscription(1)
+    sqlite_storage.add_subscription(2, 15)
+    sqlite_storage.add_subscription(3, 1440)
+    sqlite_storage.add_subscription(1, 15)
+    sqlite_storage.add_subscription(2)
+
+    assert sqlite_storage.get_subscriptions() == [1, 2, 3]
+    assert sqlite_storage.get_subscribers(15) == [1, 2]
+    assert sqlite_storage.get_lead_times() == [15, 1440]
+
+
+def test_sqlite_notification_claims_are_per_lead(sqlite_storage):
+    sqlite_storage.add_matches([_match('a')])
+
+    assert sqlite_storage.claim_notification('a', 60) is True
+    assert sqlite_storage.claim_notification('a', 60) is False
+    assert sqlite_storage.claim_notification('a', 5) is True
+    assert sqlite_storage.get_sent_notifications() == {('a', 60), ('a', 5)}
+
+
+def test_sqlite_keeps_notifications_of_matches_that_drop_out(sqlite_storage):
+    sqlite_storage.add_matches([_match('a', start_ts=2000), _match('b', start_ts=2000)])
+    sqlite_storage.claim_notification('a', 60)
+    sqlite_storage.claim_deliveries('a', 60, [1])
+
+    sqlite_storage.apply_diff(diff_snapshots(sqlite_storage.get_matches(), [_match('b', start_ts=2000)]))
+    sqlite_storage.clear_matches()
+    # A partida volta à listagem: quem já foi avisado não é avisado de novo
+    sqlite_storage.add_matches([_match('a', start_ts=2000)])
+
+    assert sqlite_storage.get_sent_notifications() == {('a', 60)}
+    assert sqlite_storage.claim_deliveries('a', 60, [1, 2]) == [2]
+
+
+def test_sqlite_prunes_notifications_by_age(sqlite_storage):
+    now = time.time()
+    sqlite_storage.add_matches([_match('started', start_ts=now - 60), _match('next', start_ts=now + 7 * 86400)])
+    for match_id in ('started', 'next', 'gone'):
+        sqlite_storage.claim_notification(match_id, 60)
+        sqlite_storage.claim_deliveries(match_id, 60, [1])
+
+    # Recém-gravados: só os da partida que já começou saem
+    assert sqlite_storage.prune_notifications(now) == 2
+    assert sqlite_storage.get_sent_notifications() == {('next', 60), ('gone', 60)}
+
+    # Passado o tempo de retenção, saem também os da partida que sumiu da listagem
+    assert sqlite_storage.prune_notifications(now + 3 * 86400) == 2
+    assert sqlite_storage.get_sent_notifications() == {('next', 60)}
+
+
+def test_sqlite_keeps_snapshot_time_and_version(sqlite_storage):
+    assert sqlite_storage.get_snapshot_state() is None
+
+    sqlite_storage.set_snapshot_time(1747393200.5)
+    state = sqlite_storage.set_snapshot_time(1747393800.0, changed=False)
+
+    assert state == {'updated_at': 1747393800.0, 'version': 1747393200.5}
+    assert sqlite_storage.get_snapshot_state() == state
+
+
+@pytest.mark.asyncio
+async def test_async_storage_runs_off_the_event_loop(sqlite_storage):
+    storage = AsyncStorage(sqlite_storage)
+
+    await storage.add_subscription(42)
+
+    assert await storage.get_subscriptions() == [42]
+    assert storage.sync is sqlite_storage
+
+
+@pytest.mark.asyncio
+async def test_async_storage_opens_database_on_first_use(tmp_path):
+    db_path = tmp_path / 'bot.db'
+    storage = AsyncStorage(factory=lambda: SQLiteStorage(str(db_path), json_path=None))
+
+    assert not db_path.exists()
+
+    await storage.add_subscription(42)
+
+    assert db_path.exists()
+    assert await storage.get_subscriptions() == [42]
+    storage.sync.db.close()
+
+
+def test_connections_of_finished_threads_are_closed(sqlite_storage):
+    def touch():
+        sqlite_storage.get_subscriptions()
+
+    for _ in range(20):
+        thread = threading.Thread(target=touch)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    assert len(sqlite_storage.db._connections) <= 1
+
+
+@pytest.mark.asyncio
+async def test_async_storage_uses_a_bounded_set_of_threads(sqlite_storage):
+    storage = AsyncStorage(sqlite_storage, max_workers=2)
+    threads = set()
+
+    def record():
+        threads.add(threading.get_ident())
+        time.sleep(0.01)
+
+    sqlite_storage.record = record
+    await asyncio.gather(*(storage.record() for _ in range(20)))
+
+    assert len(threads) <= 2
+
+
+def test_sqlite_claims_from_older_versions_count_as_delivered(tmp_path):
+    import sqlite3
+
+    db_path = str(tmp_path / 'bot.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute('''
+        CREATE TABLE notification_claims (
+            match_id TEXT NOT NULL, user_id INTEGER NOT NULL, lead_minutes INTEGER NOT NULL,
+            claimed_by TEXT, claimed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (match_id, user_id)
+        )
+    ''')
+    conn.execute("INSERT INTO notification_claims (match_id, user_id, lead_minutes) VALUES ('a', 1, 60)")
+    conn.commit()
+    conn.close()
+
+    storage = SQLiteStorage(db_path, json_path=None)
+    try:
+        assert storage.claim_deliveries('a', 60, [1, 2], now=time.time() + 86400) == [2]
+    finally:
+        storage.db.close()
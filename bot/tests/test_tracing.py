@@ -0,0 +1,167 @@
+import asyncio
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from bot.services.match import Match
+from bot.services.matches_scraper import MatchesScraper, TeamPage
+from bot.services.scraper_worker import ScraperWorker
+from bot.services.tracing import FileExporter, InMemoryExporter, Tracer, tracer
+
+
+@pytest.fixture
+def exporter():
+    """Liga o tracer global com exportação em memória durante o teste"""
+    exporter = InMemoryExporter()
+    previous = tracer.exporter, tracer.sample_rate
+    tracer.configure(exporter, sample_rate=1.0)
+    yield exporter
+    tracer.configure(*previous)
+
+
+def _by_name(spans):
+    return {span.name: span for span in spans}
+
+
+def test_nested_spans_share_trace_and_link_parents():
+    exporter = InMemoryExporter()
+    local = Tracer(exporter)
+
+    with local.span("root", user=1):
+        with local.span("child") as child:
+            child.set(rows=3)
+
+    spans = _by_name(exporter.spans)
+    assert exporter.names() == ["child", "root"]
+    assert spans["child"].trace_id == spans["root"].trace_id
+    assert spans["child"].parent_id == spans["root"].span_id
+    assert spans["root"].parent_id is None
+    assert spans["root"].attributes == {'user': 1}
+    assert spans["child"].attributes == {'rows': 3}
+    assert spans["root"].duration >= spans["child"].duration
+
+
+def test_sampling_is_decided_at_the_root():
+    exporter = InMemoryExporter()
+    local = Tracer(exporter, sample_rate=0.0)
+
+    with local.span("root"):
+        with local.span("child"):
+            pass
+
+    assert exporter.spans == []
+
+
+def test_errors_are_recorded_and_reraised():
+    exporter = InMemoryExporter()
+    local = Tracer(exporter)
+
+    with pytest.raises(ValueError):
+        with local.span("failing"):
+            raise ValueError("boom")
+
+    assert exporter.spans[0].error == "ValueError: boom"
+
+
+def test_exporter_failure_does_not_break_the_traced_code():
+    class BrokenExporter:
+        def export(self, span):
+            raise OSError("disco cheio")
+
+    local = Tracer(BrokenExporter())
+
+    with local.span("root"):
+        result = 42
+
+    assert result == 42
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    exporter = FileExporter(tmp_path / "traces.jsonl")
+    local = Tracer(exporter)
+
+    with local.span("root"):
+        with local.span("child"):
+            pass
+    exporter.close()
+
+    lines = [json.loads(line) for line in (tmp_path / "traces.jsonl").read_text().splitlines()]
+    assert [line['name'] for line in lines] == ["child", "root"]
+    assert lines[0]['parent_id'] == lines[1]['span_id']
+
+
+@pytest.mark.asyncio
+async def test_context_propagates_across_tasks_and_threads(exporter):
+    @tracer.traced("async_step")
+    async def async_step():
+        await asyncio.sleep(0.01)
+
+    @tracer.traced("thread_step")
+    def thread_step():
+        time.sleep(0.01)
+
+    with tracer.span("handler"):
+        await asyncio.gather(async_step(), async_step(), asyncio.to_thread(thread_step))
+
+    spans = exporter.spans
+    root = _by_name(spans)["handler"]
+    assert sorted(span.name for span in spans) == ["async_step", "async_step", "handler", "thread_step"]
+    assert all(span.parent_id == root.span_id for span in spans if span is not root)
+
+
+def test_parallel_team_scraping_stays_in_the_caller_trace(exporter):
+    main, academy = TeamPage('330-FURIA'), TeamPage('11896-FURIA-Academy')
+    scraper = MatchesScraper(fetch_mode='http', teams=[main, academy], max_parallel=2)
+
+    def fake_fetch(team):
+        return [Match.create(team.name, 'MIBR', '2025-05-16', '08:00', link=team.url)]
+
+    with patch.object(scraper, '_fetch_via_http', side_effect=fake_fetch):
+        scraper.get_furia_matches()
+
+    spans = exporter.spans
+    root = _by_name(spans)["scraper.get_furia_matches"]
+    teams = [span for span in spans if span.name == "scraper.team"]
+    assert {span.attributes['team'] for span in teams} == {main.slug, academy.slug}
+    assert all(span.trace_id == root.trace_id for span in spans)
+    # Os times ficam sob a fase "total", que fica sob get_furia_matches
+    total = _by_name(spans)["scraper.total"]
+    assert total.parent_id == root.span_id
+    assert all(span.parent_id == total.span_id for span in teams)
+
+
+class TracedFakeScraper:
+    """Scraper sem rede que abre um span, como o real, no processo de scraping"""
+
+    last_source = 'http'
+    last_stats = {}
+    last_changed = True
+
+    def __init__(self):
+        self.last_update = 0
+
+    def get_furia_matches(self, force_update=False, max_age=None):
+        with tracer.span("scraper.get_furia_matches"):
+            self.last_update = time.time()
+            return [Match.create('FURIA', 'MIBR', '2025-05-16', '08:00')]
+
+    def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_worker_spans_join_the_requesting_trace(exporter):
+    worker = ScraperWorker(scraper_factory=TracedFakeScraper, request_timeout=10)
+    try:
+        with tracer.span("matches_handler"):
+            snapshot = await worker.get_snapshot()
+    finally:
+        worker.stop()
+
+    assert 'spans' not in snapshot
+    spans = _by_name(exporter.spans)
+    assert set(spans) == {"matches_handler", "scraper_worker.get_snapshot", "scraper.get_furia_matches"}
+    assert spans["scraper.get_furia_matches"].parent_id == spans["scraper_worker.get_snapshot"].span_id
+    assert spans["scraper.get_furia_matches"].trace_id == spans["matches_handler"].trace_id
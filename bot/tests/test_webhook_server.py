@@ -0,0 +1,86 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from bot.services.webhook_server import SECRET_HEADER, WebhookServer
+
+RECORDED_UPDATE = (Path(__file__).parent / 'data' / 'update_matches.json').read_text()
+
+
+def _application():
+    application = MagicMock()
+    application.bot.defaults = None
+    application.process_update = AsyncMock()
+    return application
+
+
+async def _post(server, body, secret="segredo"):
+    headers = {SECRET_HEADER: secret} if secret else {}
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+        return await client.post(server.path, content=body, headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_recorded_update_is_processed():
+    application = _application()
+    server = WebhookServer(application, secret_token="segredo")
+    await server.start("127.0.0.1", 0)
+    try:
+        response = await _post(server, RECORDED_UPDATE)
+        await asyncio.wait_for(server.queue.join(), 1)
+    finally:
+        await server.stop()
+
+    assert response.status_code == 200
+    update = application.process_update.await_args.args[0]
+    assert update.update_id == 100000001
+    assert update.message.text == "/matches"
+
+
+@pytest.mark.asyncio
+async def test_invalid_secret_and_body_are_rejected():
+    application = _application()
+    server = WebhookServer(application, secret_token="segredo")
+    await server.start("127.0.0.1", 0)
+    try:
+        assert (await _post(server, RECORDED_UPDATE, secret="errado")).status_code == 403
+        assert (await _post(server, RECORDED_UPDATE, secret=None)).status_code == 403
+        assert (await _post(server, "não é json")).status_code == 400
+    finally:
+        await server.stop()
+
+    application.process_update.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_returns_503():
+    server = WebhookServer(_application(), secret_token="segredo", queue_size=1, workers=0)
+    await server.start("127.0.0.1", 0)
+    try:
+        first = await _post(server, RECORDED_UPDATE)
+        second = await _post(server, RECORDED_UPDATE)
+    finally:
+        await server.stop()
+
+    assert (first.status_code, second.status_code) == (200, 503)
+    assert server.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_health_routes_share_the_server():
+    server = WebhookServer(_application())
+    await server.start("127.0.0.1", 0)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{server.port}") as client:
+            health = await client.get("/health")
+            metrics = await client.get("/metrics")
+            home = await client.get("/")
+    finally:
+        await server.stop()
+
+    assert health.json() == {"status": "ok"}
+    assert "# TYPE furia_snapshot_age_seconds gauge" in metrics.text
+    assert "FURIA" in home.text
@@ -67,12 +67,12 @@ def run_test():
             # Imprimir detalhes das partidas
             for i, match in enumerate(matches, 1):
                 print(f"\nPartida {i}:")
-                for key, value in match.items():
+                for key, value in match.to_dict().items():
                     print(f"  {key}: {value}")
             
             # Salvar resultados em JSON para referência
             with open("matches_results.json", "w", encoding="utf-8") as f:
-                json.dump(matches, f, indent=2, ensure_ascii=False)
+                json.dump([m.to_dict() for m in matches], f, indent=2, ensure_ascii=False)
             print("\nResultados salvos em matches_results.json")
     
     except Exception as e:
@@ -1,10 +1,16 @@
+import asyncio
 import logging
 import os
+import secrets
 from telegram.ext import ApplicationBuilder, CommandHandler, CallbackQueryHandler, MessageHandler, filters
-from apscheduler.schedulers.background import BackgroundScheduler
 from bot.handlers import matches, players, social, start
+from bot.handlers.catalog import catalog
+from bot.services.broadcaster import PriorityRateLimiter, TracedRequest
+from bot.services.coordinator import coordinator
+from bot.services.metrics import CONTENT_TYPE, registry
+from bot.services.notifications import subscription_sync
+from bot.services.scraper_worker import scraper_worker
 from dotenv import load_dotenv
-from flask import Flask
 from threading import Thread
 
 load_dotenv()
@@ -19,52 +25,140 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-flask_app = Flask(__name__)
-@flask_app.route('/health')
-def health():
-    return {"status": "ok"}
+HANDLER_SECONDS = registry.histogram(
+    "furia_handler_duration_seconds", "Duração dos handlers por comando", labels=("command",)
+)
+
+def create_flask_app():
+    # Flask só é importado no modo polling; o webhook tem o próprio servidor
+    from flask import Flask
+
+    flask_app = Flask(__name__)
+
+    @flask_app.route('/health')
+    def health():
+        return {"status": "ok"}
 
-@flask_app.route('/')
-def home():
-    return "🟡⚫ FURIA Bot está online! ⚫🟡", 200
+    @flask_app.route('/metrics')
+    def metrics():
+        return registry.render(), 200, {"Content-Type": CONTENT_TYPE}
+
+    @flask_app.route('/')
+    def home():
+        return "🟡⚫ FURIA Bot está online! ⚫🟡", 200
+
+    return flask_app
 
 def run_flask():
-    flask_app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))
+    create_flask_app().run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))
+
+
+async def post_init(application):
+    async def on_elected():
+        # Só o líder faz scraping e dispara as notificações. O processo de
+        # scraping sobe numa thread enquanto as notificações são reagendadas
+        await asyncio.gather(
+            asyncio.to_thread(scraper_worker.start),
+            matches.notification_scheduler.load(application.job_queue),
+        )
+        # Primeira atualização já agora; as seguintes seguem a agenda adaptativa
+        matches.snapshot_refresher.start(application.job_queue)
+
+    coordinator.on_elected(on_elected)
+    # O gauge de inscritos é atualizado aqui, fora da coleta do /metrics
+    application.job_queue.run_repeating(
+        matches.update_subscriber_count, interval=60, first=0, name="metrics:subscribers"
+    )
+    # A abertura do banco (na primeira operação do storage) e a eleição correm
+    # junto com a montagem do catálogo
+    await asyncio.gather(
+        asyncio.to_thread(catalog.warm),
+        coordinator.start(application.job_queue),
+    )
+
+
+async def post_shutdown(application):
+    matches.snapshot_refresher.stop()
+    await coordinator.stop()
+    await subscription_sync.close()
+    scraper_worker.stop()
+
+
+def timed(command, callback):
+    """Envolve o handler para medir sua duração em ``HANDLER_SECONDS``"""
+    return HANDLER_SECONDS.timed(command=command)(callback)
+
+
+def start_webhook(app):
+    from bot.services.webhook_server import WebhookServer, run_webhook
+
+    server = WebhookServer(
+        app,
+        path=os.getenv("WEBHOOK_PATH", "/telegram"),
+        # Sem segredo configurado, gera um novo a cada inicialização
+        secret_token=os.getenv("WEBHOOK_SECRET") or secrets.token_urlsafe(32),
+        queue_size=int(os.getenv("WEBHOOK_QUEUE_SIZE", 100)),
+    )
+    asyncio.run(run_webhook(app, server, os.getenv("WEBHOOK_URL"), port=int(os.environ.get('PORT', 8080))))
+
+
+def build_application(token, request=None):
+    """Monta a aplicação com os handlers; ``request`` substitui o transporte do bot"""
+    app = (
+        ApplicationBuilder()
+        .token(token)
+        .rate_limiter(PriorityRateLimiter())
+        # Mesmo pool padrão do PTB, com um span por chamada à API
+        .request(request or TracedRequest(connection_pool_size=256))
+        # Um /matches aguardando o scraping não deve segurar os updates dos demais usuários
+        .concurrent_updates(True)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
+
+    # Adiciona handlers
+    app.add_handler(CommandHandler("start", timed("start", start.start_handler)))
+    app.add_handler(CommandHandler("team", timed("team", players.team_handler)))
+    app.add_handler(CommandHandler("matches", timed("matches", matches.matches_handler)))
+    app.add_handler(CommandHandler("socials", timed("socials", social.social_handler)))
+
+    # Callback handlers com padrões específicos
+    app.add_handler(CallbackQueryHandler(
+        timed("notif_callback", matches.handle_notification_callback), pattern="^notif_"
+    ))
+    app.add_handler(CallbackQueryHandler(
+        timed("player_callback", players.button_handler), pattern="^player_"
+    ))
+
+    # Handler para mensagens desconhecidas
+    app.add_handler(
+        MessageHandler(
+            filters.ALL & ~filters.COMMAND,
+            timed("message", start.start_handler)  # Reutiliza o handler de start
+        ),
+        group=1
+    )
+    return app
 
 
 def main():
     try:
         logger.info("Iniciando o bot...")
-        Thread(target=run_flask, daemon=True).start()
-        
-        app = ApplicationBuilder().token(os.getenv("BOT_TOKEN")).build()
-        
-        # Adiciona handlers
-        app.add_handler(CommandHandler("start", start.start_handler))
-        app.add_handler(CommandHandler("team", players.team_handler))
-        app.add_handler(CommandHandler("matches", matches.matches_handler))
-        app.add_handler(CommandHandler("socials", social.social_handler))
-       
-
-         # Callback handlers com padrões específicos
-        app.add_handler(CallbackQueryHandler(matches.handle_notification_callback, pattern="^notif_"))  
-        app.add_handler(CallbackQueryHandler(players.button_handler, pattern="^player_"))
-
-        # Handler para mensagens desconhecidas
-        app.add_handler(
-            MessageHandler(
-                filters.ALL & ~filters.COMMAND,
-                start.start_handler  # Reutiliza o handler de start
-            ),
-            group=1
-        )
+        mode = os.getenv("BOT_MODE", "polling").lower()
+        if mode not in ("polling", "webhook"):
+            raise ValueError(f"BOT_MODE inválido: {mode}")
+        if mode == "polling":
+            # No modo webhook o próprio servidor do webhook responde /health
+            Thread(target=run_flask, daemon=True).start()
+
+        app = build_application(os.getenv("BOT_TOKEN"))
  
-        # Agendador de notificações
-        job_queue = app.job_queue
-        job_queue.run_repeating(matches.check_and_notify, interval=300, first=10)
-        
-        logger.info("Bot iniciado com sucesso")
-        app.run_polling()
+        logger.info(f"Bot iniciado com sucesso (modo {mode})")
+        if mode == "webhook":
+            start_webhook(app)
+        else:
+            app.run_polling()
         
     except Exception as e:
         logger.critical(f"Falha ao iniciar o bot: {str(e)}", exc_info=True)